@@ -0,0 +1,35 @@
+# Generated by Django 4.2.14 on 2026-10-18 12:00
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+    dependencies = [
+        ("movies", "0001_initial"),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name="CatalogOutbox",
+            fields=[
+                ("id", models.BigAutoField(primary_key=True, serialize=False)),
+                (
+                    "entity",
+                    models.CharField(
+                        choices=[
+                            ("filmwork", "Filmwork"),
+                            ("person", "Person"),
+                            ("genre", "Genre"),
+                        ],
+                        max_length=20,
+                    ),
+                ),
+                ("entity_id", models.UUIDField()),
+                ("created", models.DateTimeField(auto_now_add=True)),
+            ],
+            options={
+                "db_table": "content_outbox",
+                "ordering": ["id"],
+            },
+        ),
+    ]
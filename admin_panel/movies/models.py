@@ -1,9 +1,26 @@
 import uuid
 
-from django.db import models
+from django.db import models, transaction
 
 
-class TimeStampedModel(models.Model):
+class AtomicSaveModel(models.Model):
+    """
+    save() целиком в транзакции.
+
+    Django шлёт post_save уже после выхода из транзакции save_base, и в
+    autocommit событие CatalogOutbox из сигнала фиксировалось бы отдельно
+    от правки. Внутри atomic() строка и событие коммитятся вместе.
+    """
+
+    class Meta:
+        abstract = True
+
+    def save(self, *args, **kwargs):
+        with transaction.atomic(using=kwargs.get("using")):
+            super().save(*args, **kwargs)
+
+
+class TimeStampedModel(AtomicSaveModel):
     created = models.DateTimeField(auto_now_add=True)
     modified = models.DateTimeField(auto_now=True)
 
@@ -60,7 +77,7 @@ class Filmwork(TimeStampedModel):
         return self.title
 
 
-class GenreFilmwork(models.Model):
+class GenreFilmwork(AtomicSaveModel):
     id = models.UUIDField(primary_key=True, default=uuid.uuid4, editable=False)
     filmwork = models.ForeignKey(Filmwork, on_delete=models.CASCADE)
     genre = models.ForeignKey(Genre, on_delete=models.CASCADE)
@@ -77,7 +94,7 @@ class PersonRole(models.TextChoices):
     WRITER = "writer", "Writer"
 
 
-class PersonFilmwork(models.Model):
+class PersonFilmwork(AtomicSaveModel):
     id = models.UUIDField(primary_key=True, default=uuid.uuid4, editable=False)
     filmwork = models.ForeignKey(Filmwork, on_delete=models.CASCADE)
     person = models.ForeignKey(Person, on_delete=models.CASCADE)
@@ -87,3 +104,32 @@ class PersonFilmwork(models.Model):
     class Meta:
         db_table = "content_person_filmwork"
         unique_together = ("filmwork", "person", "role")
+
+
+class OutboxEntity(models.TextChoices):
+    FILMWORK = "filmwork", "Filmwork"
+    PERSON = "person", "Person"
+    GENRE = "genre", "Genre"
+
+
+class CatalogOutbox(models.Model):
+    """
+    Transactional outbox изменений каталога для content_service.
+
+    Строки пишутся сигналами в той же транзакции, что и правка в админке,
+    и удаляются потребителем (content_service/etl/outbox_consumer.py)
+    после переиндексации. Событие — только ссылка на сущность:
+    актуальное состояние потребитель читает из БД.
+    """
+
+    id = models.BigAutoField(primary_key=True)
+    entity = models.CharField(max_length=20, choices=OutboxEntity.choices)
+    entity_id = models.UUIDField()
+    created = models.DateTimeField(auto_now_add=True)
+
+    class Meta:
+        db_table = "content_outbox"
+        ordering = ["id"]
+
+    def __str__(self):
+        return f"{self.entity}:{self.entity_id}"
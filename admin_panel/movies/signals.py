@@ -0,0 +1,60 @@
+"""
+Запись изменений каталога в CatalogOutbox.
+
+Событие фиксируется тогда и только тогда, когда фиксируется сама правка:
+- post_save в Django шлётся после транзакции save_base, поэтому модели
+  каталога наследуют AtomicSaveModel — save() вместе с сигналом идёт
+  в одном atomic();
+- post_delete шлётся внутри транзакции удаления (Collector.delete),
+  в том числе для каскадно удалённых связей.
+
+Массовые QuerySet.update() и bulk_create() сигналов не шлют — их нужно
+выполнять в atomic() и дополнять записью в outbox вручную (enqueue).
+"""
+
+from django.db.models.signals import post_delete, post_save
+from django.dispatch import receiver
+from movies.models import (
+    CatalogOutbox,
+    Filmwork,
+    Genre,
+    GenreFilmwork,
+    OutboxEntity,
+    Person,
+    PersonFilmwork,
+)
+
+
+def enqueue(*events: tuple[str, object]):
+    CatalogOutbox.objects.bulk_create(
+        [CatalogOutbox(entity=entity, entity_id=entity_id) for entity, entity_id in events]
+    )
+
+
+@receiver([post_save, post_delete], sender=Filmwork)
+def filmwork_changed(sender, instance, **kwargs):
+    enqueue((OutboxEntity.FILMWORK, instance.id))
+
+
+@receiver([post_save, post_delete], sender=Person)
+def person_changed(sender, instance, **kwargs):
+    enqueue((OutboxEntity.PERSON, instance.id))
+
+
+@receiver([post_save, post_delete], sender=Genre)
+def genre_changed(sender, instance, **kwargs):
+    enqueue((OutboxEntity.GENRE, instance.id))
+
+
+@receiver([post_save, post_delete], sender=PersonFilmwork)
+def person_filmwork_changed(sender, instance, **kwargs):
+    # меняется состав фильма и фильмография персоны
+    enqueue(
+        (OutboxEntity.FILMWORK, instance.filmwork_id),
+        (OutboxEntity.PERSON, instance.person_id),
+    )
+
+
+@receiver([post_save, post_delete], sender=GenreFilmwork)
+def genre_filmwork_changed(sender, instance, **kwargs):
+    enqueue((OutboxEntity.FILMWORK, instance.filmwork_id))
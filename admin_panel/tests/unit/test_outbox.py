@@ -0,0 +1,50 @@
+import pytest
+from django.db import DatabaseError
+from movies.models import (CatalogOutbox,
+                           Filmwork,
+                           OutboxEntity,
+                           Person,
+                           PersonFilmwork,
+                           PersonRole)
+
+
+def _events():
+    return list(CatalogOutbox.objects.values_list("entity", "entity_id"))
+
+
+@pytest.mark.django_db
+def test_outbox_on_filmwork_save():
+    film = Filmwork.objects.create(title="Inception")
+    assert _events() == [(OutboxEntity.FILMWORK, film.id)]
+
+
+@pytest.mark.django_db
+def test_outbox_on_person_filmwork_and_delete():
+    film = Filmwork.objects.create(title="Avatar")
+    person = Person.objects.create(full_name="James Cameron")
+    CatalogOutbox.objects.all().delete()
+
+    PersonFilmwork.objects.create(filmwork=film, person=person, role=PersonRole.DIRECTOR)
+    assert _events() == [
+        (OutboxEntity.FILMWORK, film.id),
+        (OutboxEntity.PERSON, person.id),
+    ]
+
+    CatalogOutbox.objects.all().delete()
+    person.delete()
+    # каскад по связи тоже попадает в outbox
+    assert (OutboxEntity.PERSON, person.id) in _events()
+    assert (OutboxEntity.FILMWORK, film.id) in _events()
+
+
+@pytest.mark.django_db
+def test_failed_outbox_write_rolls_back_save(monkeypatch):
+    def broken(*args, **kwargs):
+        raise DatabaseError("outbox unavailable")
+
+    monkeypatch.setattr(CatalogOutbox.objects, "bulk_create", broken)
+
+    # правка без события не должна зафиксироваться
+    with pytest.raises(DatabaseError):
+        Filmwork.objects.create(title="Dune")
+    assert not Filmwork.objects.filter(title="Dune").exists()
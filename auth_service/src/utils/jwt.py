@@ -1,4 +1,7 @@
+import hashlib
+import time
 import uuid
+from collections import OrderedDict
 from datetime import UTC, datetime, timedelta
 from typing import Any, cast
 
@@ -56,22 +59,70 @@ async def is_token_blacklisted(redis: Redis | None, jti: str) -> bool:
     return cast(int, exists) > 0
 
 
+# ---------- Кэш проверенных токенов ----------
+class VerifiedTokenCache:
+    """Ограниченный LRU проверенных payload'ов: ключ — sha256 токена, живёт до exp."""
+
+    def __init__(self, max_entries: int = 10_000) -> None:
+        self.max_entries = max_entries
+        self._data: OrderedDict[str, tuple[float, dict[str, Any]]] = OrderedDict()
+
+    @staticmethod
+    def _key(token: str) -> str:
+        return hashlib.sha256(token.encode()).hexdigest()
+
+    def get(self, token: str) -> dict[str, Any] | None:
+        key = self._key(token)
+        item = self._data.get(key)
+        if item is None:
+            return None
+
+        expires_at, payload = item
+        if expires_at <= time.time():
+            del self._data[key]
+            return None
+
+        self._data.move_to_end(key)
+        return dict(payload)
+
+    def set(self, token: str, payload: dict[str, Any]) -> None:
+        exp = payload.get("exp")
+        if not exp or self.max_entries <= 0:
+            return
+
+        key = self._key(token)
+        self._data[key] = (float(exp), dict(payload))
+        self._data.move_to_end(key)
+        while len(self._data) > self.max_entries:
+            self._data.popitem(last=False)
+
+    def clear(self) -> None:
+        self._data.clear()
+
+
+verified_tokens = VerifiedTokenCache()
+
+
 # ---------- Декод + проверка ----------
 async def decode_token(token: str, redis: Redis | None = None) -> dict[str, Any]:
-    try:
-        payload = jwt.decode(
-            token,
-            settings.jwt_public_key,  # 🔑 публичный ключ
-            algorithms=[settings.jwt_algorithm],
-        )
-    except jwt.ExpiredSignatureError:
-        raise HTTPException(
-            status_code=status.HTTP_401_UNAUTHORIZED, detail="Token expired"
-        ) from None
-    except jwt.InvalidTokenError:
-        raise HTTPException(
-            status_code=status.HTTP_401_UNAUTHORIZED, detail="Invalid token"
-        ) from None
+    # подпись проверяем один раз на токен, blacklist — на каждый вызов
+    payload = verified_tokens.get(token)
+    if payload is None:
+        try:
+            payload = jwt.decode(
+                token,
+                settings.jwt_public_key,  # 🔑 публичный ключ
+                algorithms=[settings.jwt_algorithm],
+            )
+        except jwt.ExpiredSignatureError:
+            raise HTTPException(
+                status_code=status.HTTP_401_UNAUTHORIZED, detail="Token expired"
+            ) from None
+        except jwt.InvalidTokenError:
+            raise HTTPException(
+                status_code=status.HTTP_401_UNAUTHORIZED, detail="Invalid token"
+            ) from None
+        verified_tokens.set(token, payload)
 
     # Проверка blacklist
     jti = payload.get("jti")
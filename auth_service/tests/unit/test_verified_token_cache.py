@@ -0,0 +1,58 @@
+import time
+
+import pytest
+from utils.jwt import VerifiedTokenCache
+
+
+def _payload(ttl: float = 60, **extra) -> dict:
+    return {"sub": "user", "exp": time.time() + ttl, **extra}
+
+
+@pytest.mark.unit
+def test_returns_copy_of_cached_payload():
+    cache = VerifiedTokenCache()
+    cache.set("token", _payload(jti="1"))
+
+    payload = cache.get("token")
+    payload["sub"] = "changed"
+
+    assert cache.get("token")["sub"] == "user"
+
+
+@pytest.mark.unit
+def test_expired_entry_is_dropped():
+    cache = VerifiedTokenCache()
+    cache.set("token", _payload(ttl=-1))
+
+    assert cache.get("token") is None
+    assert len(cache._data) == 0
+
+
+@pytest.mark.unit
+def test_payload_without_exp_is_not_cached():
+    cache = VerifiedTokenCache()
+    cache.set("token", {"sub": "user"})
+
+    assert cache.get("token") is None
+
+
+@pytest.mark.unit
+def test_least_recently_used_is_evicted():
+    cache = VerifiedTokenCache(max_entries=2)
+    cache.set("a", _payload())
+    cache.set("b", _payload())
+    cache.get("a")  # "a" свежее "b"
+
+    cache.set("c", _payload())
+
+    assert cache.get("b") is None
+    assert cache.get("a") is not None
+    assert cache.get("c") is not None
+
+
+@pytest.mark.unit
+def test_zero_capacity_disables_cache():
+    cache = VerifiedTokenCache(max_entries=0)
+    cache.set("token", _payload())
+
+    assert cache.get("token") is None
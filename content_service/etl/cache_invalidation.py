@@ -0,0 +1,93 @@
+"""
+cache_invalidation.py
+
+Сброс кэшей Content API по изменённым сущностям каталога.
+
+Content API помечает каждую запись кэша тегами — uuid фильмов, персон
+и жанров внутри значения (ztag:<uuid> → ZSET ключей по сроку их жизни, формат
+services/cache/invalidation.py). По id изменённых сущностей удаляются:
+- карточки и ответы детальных эндпоинтов (в том числе закэшированные 404);
+- все записи с этими uuid: страницы списков, поиск, карточки фильмов
+  с переименованным жанром или персоной.
+
+Затем в поток CACHE_CHANGES_STREAM публикуется событие с id сущностей
+и удалёнными ключами — воркеры API убирают те же ключи из своего L1.
+Новая сущность в ещё не содержащих её списках появится по их TTL.
+
+Функции:
+- cache_keys: точные ключи карточек и детальных ответов.
+- invalidate: удаляет ключи и публикует событие.
+"""
+
+import json
+import os
+import time
+from collections.abc import Iterable
+
+import redis
+
+UNLINK_BATCH = 500
+TAG_PREFIX = "ztag"
+CHANGES_STREAM = os.getenv("CACHE_CHANGES_STREAM", "catalog:changes")
+STREAM_MAXLEN = 10_000  # событий в потоке (приблизительно)
+
+redis_client = redis.Redis(
+    host=os.getenv("REDIS_HOST", "redis_shared"), port=int(os.getenv("REDIS_PORT", "6379"))
+)
+
+
+def cache_keys(films: Iterable[str], persons: Iterable[str], genres: Iterable[str]) -> list[str]:
+    """Ключи в формате make_cache_key и make_response_key сервиса."""
+    keys = []
+    for film_id in films:
+        keys += [f"film:uuid={film_id}", f"response:/api/v1/films/{film_id}?"]
+    for person_id in persons:
+        keys += [f"id_persons:person_id={person_id}", f"response:/api/v1/persons/{person_id}?"]
+    for genre_id in genres:
+        keys += [f"genre:genre_id={genre_id}", f"response:/api/v1/genres/{genre_id}?"]
+    return keys
+
+
+def tagged_keys(ids: list[str], client: redis.Redis) -> tuple[list[str], list[str]]:
+    """Ещё живые ключи, помеченные uuid из ids, и сами теги (ZSET по сроку жизни ключа)."""
+    tags = [f"{TAG_PREFIX}:{entity_id}" for entity_id in ids]
+    now = time.time()
+    pipe = client.pipeline(transaction=False)
+    for tag in tags:
+        pipe.zrangebyscore(tag, now, "+inf")
+    members = {key.decode() for keys in pipe.execute() for key in keys}
+    return sorted(members), tags
+
+
+def invalidate(
+    films: Iterable[str],
+    persons: Iterable[str],
+    genres: Iterable[str],
+    client: redis.Redis | None = None,
+) -> int:
+    """Удаляет ключи затронутых сущностей и публикует событие; UNLINK освобождает память в фоне."""
+    client = client or redis_client
+    films, persons, genres = sorted(films), sorted(persons), sorted(genres)
+    if not (films or persons or genres):
+        return 0
+
+    tagged, tags = tagged_keys(films + persons + genres, client)
+    keys = list(dict.fromkeys(cache_keys(films, persons, genres) + tagged))
+
+    deleted = 0
+    to_unlink = keys + tags
+    for i in range(0, len(to_unlink), UNLINK_BATCH):
+        deleted += client.unlink(*to_unlink[i : i + UNLINK_BATCH])
+
+    client.xadd(
+        CHANGES_STREAM,
+        {
+            "films": json.dumps(films),
+            "persons": json.dumps(persons),
+            "genres": json.dumps(genres),
+            "keys": json.dumps(keys),
+        },
+        maxlen=STREAM_MAXLEN,
+        approximate=True,
+    )
+    return deleted
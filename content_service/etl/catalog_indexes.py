@@ -0,0 +1,138 @@
+"""
+catalog_indexes.py
+
+Денормализованные индексы персон и жанров, собираемые из фильмов.
+
+Content API отдаёт персон и жанры прямыми get/search по этим индексам,
+вместо агрегаций по всему индексу movies на каждый промах кэша.
+
+Функции:
+- build_persons: персоны со списком фильмов и ролей в каждом.
+- build_genres: уникальные жанры.
+- CatalogAggregates: то же самое, но по одному фильму за раз — для
+  потоковой загрузки, где весь список фильмов в памяти не держится.
+"""
+
+from collections.abc import Iterable
+
+PERSONS_INDEX = "persons"
+GENRES_INDEX = "genres"
+
+# Порядок важен: первая роль персоны в фильме — основная
+ROLES = (("actors", "actor"), ("directors", "director"), ("writers", "writer"))
+
+ANALYSIS = {
+    "filter": {
+        "ru_stop": {"type": "stop", "stopwords": "_russian_"},
+        "ru_stemmer": {"type": "stemmer", "language": "russian"},
+        "en_stemmer": {"type": "stemmer", "language": "english"},
+    },
+    "analyzer": {
+        "ru_en": {
+            "tokenizer": "standard",
+            "filter": ["lowercase", "ru_stop", "ru_stemmer", "en_stemmer"],
+        }
+    },
+}
+
+PERSONS_MAPPING = {
+    "settings": {"analysis": ANALYSIS},
+    "mappings": {
+        "dynamic": "strict",
+        "properties": {
+            "uuid": {"type": "keyword"},
+            "full_name": {
+                "type": "text",
+                "analyzer": "ru_en",
+                "fields": {"raw": {"type": "keyword"}},
+            },
+            "films": {
+                "type": "nested",
+                "dynamic": "strict",
+                "properties": {
+                    "uuid": {"type": "keyword"},
+                    "title": {"type": "text", "analyzer": "ru_en"},
+                    "imdb_rating": {"type": "float"},
+                    "roles": {"type": "keyword"},
+                },
+            },
+        },
+    },
+}
+
+GENRES_MAPPING = {
+    "settings": {"analysis": ANALYSIS},
+    "mappings": {
+        "dynamic": "strict",
+        "properties": {
+            "uuid": {"type": "keyword"},
+            "name": {
+                "type": "text",
+                "analyzer": "ru_en",
+                "fields": {"raw": {"type": "keyword"}},
+            },
+        },
+    },
+}
+
+
+class CatalogAggregates:
+    """
+    Персоны и жанры, накапливаемые по мере прохода по фильмам.
+
+    Хранится только то, что попадёт в индексы persons и genres
+    (у персоны — uuid, название, рейтинг и роли её фильмов), а не сами
+    фильмы: память растёт с размером этих индексов, а не каталога.
+    """
+
+    def __init__(self):
+        self._persons: dict[str, dict] = {}
+        self._person_films: dict[str, dict[str, dict]] = {}
+        self._genres: dict[str, dict] = {}
+
+    def add(self, movie: dict):
+        for field, role in ROLES:
+            for p in movie.get(field) or []:
+                if p["uuid"] not in self._persons:
+                    self._persons[p["uuid"]] = {"uuid": p["uuid"], "full_name": p["full_name"]}
+                    self._person_films[p["uuid"]] = {}
+
+                films = self._person_films[p["uuid"]]
+                if movie["uuid"] not in films:
+                    films[movie["uuid"]] = {
+                        "uuid": movie["uuid"],
+                        "title": movie.get("title"),
+                        "imdb_rating": movie.get("imdb_rating"),
+                        "roles": [],
+                    }
+                if role not in films[movie["uuid"]]["roles"]:
+                    films[movie["uuid"]]["roles"].append(role)
+
+        for g in movie.get("genres") or []:
+            self._genres.setdefault(g["uuid"], {"uuid": g["uuid"], "name": g["name"]})
+
+    def persons(self) -> list[dict]:
+        return [
+            {**person, "films": list(self._person_films[uuid].values())}
+            for uuid, person in self._persons.items()
+        ]
+
+    def genres(self) -> list[dict]:
+        return list(self._genres.values())
+
+
+def _aggregate(movies: Iterable[dict]) -> CatalogAggregates:
+    aggregates = CatalogAggregates()
+    for movie in movies:
+        aggregates.add(movie)
+    return aggregates
+
+
+def build_persons(movies: Iterable[dict]) -> list[dict]:
+    """Собирает документы персон: имя и фильмы с ролями персоны в каждом."""
+    return _aggregate(movies).persons()
+
+
+def build_genres(movies: Iterable[dict]) -> list[dict]:
+    """Собирает уникальные жанры фильмов."""
+    return _aggregate(movies).genres()
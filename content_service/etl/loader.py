@@ -1,19 +1,42 @@
 """
 loader.py
 
-Скрипт для создания индекса Elasticsearch и загрузки данных из bulk-файла.
+Скрипт для создания индексов Elasticsearch и загрузки данных из bulk-файлов.
+
+Индексы перестраиваются по схеме blue/green: данные грузятся в новый
+версионный индекс (movies_v3), а алиас movies атомарно переключается
+на него после загрузки. Content API всё это время читает старый индекс.
 
 Функции:
 - wait_for_es: проверяет доступность Elasticsearch с повторными попытками.
 - create_index: создаёт индекс с заданным mapping.
-- load_bulk: загружает документы из bulk-файла в Elasticsearch.
+- load_bulk: потоково загружает документы из bulk-файла в Elasticsearch;
+  после каждой подтверждённой пачки сохраняет смещение в файле и после
+  падения продолжает с него, а не с начала.
+- load_docs: загружает документы из памяти (персоны и жанры в run_etl.py)
+  теми же пачками, с теми же повторами и dead-letter, но без чекпоинта.
+- rebuild_index: новая версия индекса → загрузка → прогрев → переключение алиаса.
+- rollback_alias: вернуть алиас на предыдущую версию индекса.
+
+Документы, которые ES так и не принял (ошибка маппинга, 429 после всех
+повторов), пишутся в dead-letter файл ETL_DEAD_LETTER_FILE (NDJSON)
+и не прерывают загрузку.
+
+Запуск: python etl/loader.py [--rollback]
 """
 
 import json
 import os
+import sys
+import threading
 import time
+from collections.abc import Callable, Iterable, Iterator
+from concurrent.futures import ThreadPoolExecutor
+from contextlib import contextmanager
+from functools import partial
 
-from elasticsearch import Elasticsearch, helpers
+from catalog_indexes import GENRES_INDEX, GENRES_MAPPING, PERSONS_INDEX, PERSONS_MAPPING
+from elasticsearch import ApiError, Elasticsearch, TransportError, helpers
 
 # --- Конфигурация ---
 ES_HOST = (
@@ -22,9 +45,24 @@ ES_HOST = (
 )  # Хост Elasticsearch
 INDEX_NAME = "movies"  # Имя индекса
 BULK_FILE = "data/movies_data_v2.json"  # Путь к bulk-файлу
+PERSONS_BULK_FILE = "data/persons_data.json"
+GENRES_BULK_FILE = "data/genres_data.json"
+
+# --- Параметры bulk-загрузки ---
+BULK_THREADS = int(os.getenv("ETL_BULK_THREADS", "4"))  # параллельных потоков
+BULK_CHUNK_SIZE = int(os.getenv("ETL_BULK_CHUNK_SIZE", "500"))  # документов в запросе
+BULK_CHUNK_BYTES = int(os.getenv("ETL_BULK_CHUNK_BYTES", str(10 * 1024 * 1024)))
+BULK_MAX_RETRIES = int(os.getenv("ETL_BULK_MAX_RETRIES", "5"))  # повторы на 429
+# сколько версий индекса хранить (текущая + предыдущие для отката)
+KEEP_INDEX_VERSIONS = int(os.getenv("ETL_KEEP_INDEX_VERSIONS", "2"))
+# смещения незавершённых загрузок и документы, отклонённые ES
+CHECKPOINT_FILE = os.getenv("ETL_CHECKPOINT_FILE", "data/load_checkpoints.json")
+DEAD_LETTER_FILE = os.getenv("ETL_DEAD_LETTER_FILE", "data/dead_letter.ndjson")
+FORCEMERGE_TIMEOUT = float(os.getenv("ETL_FORCEMERGE_TIMEOUT", "3600"))  # секунд ждать слияния
 
 # --- Подключение к Elasticsearch ---
-es = Elasticsearch(ES_HOST)
+# http_compress: тела bulk-запросов уходят в gzip
+es = Elasticsearch(ES_HOST, http_compress=True, request_timeout=60)
 
 
 def wait_for_es(es: Elasticsearch, retries: int = 10, delay: int = 5):
@@ -48,57 +86,527 @@ def wait_for_es(es: Elasticsearch, retries: int = 10, delay: int = 5):
     raise RuntimeError("Elasticsearch is not available after waiting")
 
 
-def create_index():
+def load_movies_mapping() -> dict:
+    with open("data/movies_mapping_v2.json", encoding="utf-8") as f:
+        return json.load(f)
+
+
+def create_index(index_name: str = INDEX_NAME, mapping: dict | None = None):
     """
-    Создаёт индекс в Elasticsearch с маппингом из файла movies_mapping_v2.json.
+    Создаёт индекс в Elasticsearch. Без mapping берётся маппинг фильмов
+    из файла movies_mapping_v2.json.
     Если индекс уже существует, создаётся ничего не происходит.
     """
     wait_for_es(es)
 
     # Загружаем mapping
-    with open("data/movies_mapping_v2.json", encoding="utf-8") as f:
-        mapping = json.load(f)
+    if mapping is None:
+        mapping = load_movies_mapping()
 
-    if es.indices.exists(index=INDEX_NAME):
-        print(f"Index '{INDEX_NAME}' already exists")
+    if es.indices.exists(index=index_name):
+        print(f"Index '{index_name}' already exists")
         return
 
-    resp = es.indices.create(index=INDEX_NAME, body=mapping)
-    print(f"Index '{INDEX_NAME}' created: {resp}")
+    resp = es.indices.create(index=index_name, body=mapping)
+    print(f"Index '{index_name}' created: {resp}")
+
+
+def read_actions(
+    file_path: str, index_name: str, start: int = 0
+) -> Iterator[tuple[dict, int, int]]:
+    """
+    Потоково читает bulk-файл (строка действия + строка документа) с байта start.
+
+    Отдаёт (действие, смещение после пары строк, размер пары в байтах).
+    В памяти одновременно только текущая пара строк — размер файла
+    на потребление памяти не влияет.
+    """
+    offset = start
+    with open(file_path, "rb") as f:
+        f.seek(start)
+        for action_line in f:
+            offset += len(action_line)
+            if not action_line.strip():
+                continue
+            doc_line = next(f)
+            offset += len(doc_line)
+            action = json.loads(action_line)
+            yield (
+                {
+                    "_op_type": "index",
+                    "_index": index_name,
+                    "_id": action["index"]["_id"],
+                    "_source": json.loads(doc_line),
+                },
+                offset,
+                len(action_line) + len(doc_line),
+            )
+
+
+def chunk_actions(items: Iterator[tuple[dict, int, int]]) -> Iterator[tuple[list[dict], int]]:
+    """Пачки по BULK_CHUNK_SIZE документов / BULK_CHUNK_BYTES байт + смещение конца пачки."""
+    chunk, size = [], 0
+    for action, end, nbytes in items:
+        chunk.append(action)
+        size += nbytes
+        if len(chunk) >= BULK_CHUNK_SIZE or size >= BULK_CHUNK_BYTES:
+            yield chunk, end
+            chunk, size = [], 0
+    if chunk:
+        yield chunk, end
+
+
+def doc_actions(docs: Iterable[dict], index_name: str) -> Iterator[dict]:
+    """Действия bulk для документов в памяти, _id = uuid."""
+    for doc in docs:
+        yield {"_op_type": "index", "_index": index_name, "_id": doc["uuid"], "_source": doc}
+
+
+class _SharedIterator:
+    """Потокобезопасная обёртка: несколько потоков забирают действия из одного генератора."""
+
+    def __init__(self, it: Iterator[dict]):
+        self._it = it
+        self._lock = threading.Lock()
+
+    def __iter__(self):
+        return self
+
+    def __next__(self) -> dict:
+        with self._lock:
+            return next(self._it)
+
+
+@contextmanager
+def bulk_indexing_settings(index_name: str):
+    """
+    На время загрузки отключает refresh и реплики индекса, затем
+    возвращает прежние значения и делает один refresh.
+    """
+    current = es.indices.get_settings(index=index_name)[index_name]["settings"]["index"]
+    # None в put_settings сбрасывает параметр к значению по умолчанию;
+    # "-1" остаётся после убитой загрузки — его при продолжении не восстанавливаем
+    refresh = current.get("refresh_interval")
+    restore = {
+        "refresh_interval": None if refresh == "-1" else refresh,
+        "number_of_replicas": current.get("number_of_replicas"),
+    }
+    es.indices.put_settings(
+        index=index_name, settings={"refresh_interval": "-1", "number_of_replicas": 0}
+    )
+    try:
+        yield
+    finally:
+        es.indices.put_settings(index=index_name, settings=restore)
+        es.indices.refresh(index=index_name)
+
+
+class LoadCheckpoint:
+    """
+    Чекпоинт загрузки bulk-файла в CHECKPOINT_FILE: индекс, смещение
+    подтверждённого префикса и число загруженных в нём документов.
+
+    Чекпоинт действителен, пока файл не менялся (размер и mtime).
+    """
+
+    def __init__(self, file_path: str, path: str = CHECKPOINT_FILE):
+        self.file_path = file_path
+        self.path = path
+
+    def _read_all(self) -> dict:
+        try:
+            with open(self.path, encoding="utf-8") as f:
+                return json.load(f)
+        except FileNotFoundError:
+            return {}
+
+    def _write_all(self, data: dict):
+        # запись через временный файл: при падении посередине чекпоинт не бьётся
+        tmp = f"{self.path}.tmp"
+        with open(tmp, "w", encoding="utf-8") as f:
+            json.dump(data, f)
+        os.replace(tmp, self.path)
+
+    def _fingerprint(self) -> dict:
+        stat = os.stat(self.file_path)
+        return {"size": stat.st_size, "mtime": stat.st_mtime_ns}
+
+    def get(self) -> dict | None:
+        state = self._read_all().get(self.file_path)
+        if state is None or {k: state.get(k) for k in ("size", "mtime")} != self._fingerprint():
+            return None
+        return state
+
+    def save(self, index_name: str, offset: int, loaded: int):
+        data = self._read_all()
+        data[self.file_path] = {
+            "index": index_name,
+            "offset": offset,
+            "loaded": loaded,
+            **self._fingerprint(),
+        }
+        self._write_all(data)
+
+    def clear(self):
+        data = self._read_all()
+        if data.pop(self.file_path, None) is not None:
+            self._write_all(data)
+
+
+class DeadLetter:
+    """
+    NDJSON с документами, которые ES отклонил после всех повторов:
+    _id, статус, ошибка и исходный _source — файл можно переотправить.
+    """
 
+    def __init__(self, path: str = DEAD_LETTER_FILE):
+        self.path = path
+        self.count = 0
+        self._lock = threading.Lock()
 
-def load_bulk(file_path: str):
+    def write(self, index_name: str, errors: list[dict], actions: list[dict]):
+        if not errors:
+            return
+        # с raise_on_error=False ES-клиент не кладёт документ в элемент ошибки —
+        # берём _source из отправленной пачки по _id
+        sources = {action["_id"]: action.get("_source") for action in actions}
+        with self._lock, open(self.path, "a", encoding="utf-8") as f:
+            for error in errors:
+                item = next(iter(error.values()))
+                record = {
+                    "index": index_name,
+                    "_id": item.get("_id"),
+                    "status": item.get("status"),
+                    "error": item.get("error") or item.get("exception"),
+                    "doc": sources.get(item.get("_id")),
+                }
+                f.write(json.dumps(record, ensure_ascii=False, default=str) + "\n")
+            self.count += len(errors)
+
+
+class _Progress:
+    """
+    Двигает чекпоинт по подтверждённым пачкам.
+
+    Потоки завершают пачки не по порядку, поэтому сохраняется только
+    непрерывный префикс: пачка N+1 без N смещение не двигает. Отклонённые
+    документы пачки пишутся в dead-letter вместе с продвижением префикса,
+    перед сохранением чекпоинта: пачки за префиксом при продолжении
+    отправляются заново и не должны попасть в файл дважды.
+    checkpoint=None — загрузка из памяти, продолжать её нечем.
+    """
+
+    def __init__(
+        self,
+        checkpoint: LoadCheckpoint | None,
+        index_name: str,
+        offset: int,
+        loaded: int,
+        dead_letter: DeadLetter,
+    ):
+        self.checkpoint = checkpoint
+        self.index_name = index_name
+        self.offset = offset
+        self.loaded = loaded
+        self.dead_letter = dead_letter
+        self._next = 0
+        self._done: dict[int, tuple[int, int, list, list]] = {}
+        self._lock = threading.Lock()
+
+    def complete(self, seq: int, end: int, ok: int, errors: list, actions: list[dict]):
+        with self._lock:
+            # исходные действия держим только для пачек с ошибками
+            self._done[seq] = (end, ok, errors, actions if errors else [])
+            if self._next not in self._done:
+                return
+            while self._next in self._done:
+                end, ok, errors, actions = self._done.pop(self._next)
+                self.dead_letter.write(self.index_name, errors, actions)
+                self.offset = end
+                self.loaded += ok
+                self._next += 1
+            if self.checkpoint is not None:
+                self.checkpoint.save(self.index_name, self.offset, self.loaded)
+
+
+def _bulk_chunk(actions: list[dict]) -> tuple[int, list]:
+    """
+    Одна пачка целиком: (число созданных документов, ошибки).
+
+    429 по документам повторяет streaming_bulk, сбой всего запроса (сеть,
+    таймаут, 5xx) — повторяем здесь с паузой. Считаем только result=created:
+    повтор _id или повторная отправка пачки после сбоя даёт updated, и
+    счётчик остаётся числом разных документов в индексе (см. warm_index).
+    """
+    for attempt in range(BULK_MAX_RETRIES + 1):
+        try:
+            return _send_chunk(actions)
+        except (TransportError, ApiError) as e:
+            if attempt == BULK_MAX_RETRIES:
+                raise
+            delay = min(2**attempt, 30)
+            print(f"⏳ Bulk request failed ({e}), retry in {delay}s...")
+            time.sleep(delay)
+
+
+def _send_chunk(actions: list[dict]) -> tuple[int, list]:
+    created, errors = 0, []
+    for ok, item in helpers.streaming_bulk(
+        es,
+        actions,
+        chunk_size=len(actions),
+        max_chunk_bytes=BULK_CHUNK_BYTES,
+        max_retries=BULK_MAX_RETRIES,
+        initial_backoff=1,
+        max_backoff=30,
+        raise_on_error=False,
+    ):
+        if not ok:
+            errors.append(item)
+        elif next(iter(item.values())).get("result") == "created":
+            created += 1
+    return created, errors
+
+
+def _load_chunks(chunks: _SharedIterator, progress: _Progress, failed: threading.Event):
+    for seq, (actions, end) in chunks:
+        if failed.is_set():
+            return
+        try:
+            ok, errors = _bulk_chunk(actions)
+        except Exception:
+            failed.set()
+            raise
+        progress.complete(seq, end, ok, errors, actions)
+
+
+def _load_parallel(
+    chunks: Iterator[tuple[list[dict], int]], progress: _Progress, index_name: str, threads: int
+):
+    """Отправляет пачки в threads потоков; первая неустранимая ошибка прерывает загрузку."""
+    failed = threading.Event()
+    # enumerate под замком _SharedIterator: номера пачек идут в порядке источника
+    shared = _SharedIterator(enumerate(chunks))
+
+    with bulk_indexing_settings(index_name), ThreadPoolExecutor(max_workers=threads) as pool:
+        futures = [pool.submit(_load_chunks, shared, progress, failed) for _ in range(threads)]
+        for future in futures:
+            future.result()
+
+
+def _report(index_name: str, progress: _Progress, started: float):
+    dead_letter = progress.dead_letter
+    if dead_letter.count:
+        print(f"☠️ '{index_name}': {dead_letter.count} docs written to {dead_letter.path}")
+    print(
+        f"📤 '{index_name}': loaded {progress.loaded} docs, {dead_letter.count} errors, "
+        f"{time.monotonic() - started:.1f}s"
+    )
+
+
+def load_bulk(file_path: str, index_name: str = INDEX_NAME, threads: int = BULK_THREADS):
     """
     Загружает документы в Elasticsearch из bulk-файла.
 
+    Файл читается потоково, пачки (не больше BULK_CHUNK_SIZE документов и
+    BULK_CHUNK_BYTES байт) отправляют threads потоков параллельно.
+    Если для файла есть чекпоинт в этот же индекс, чтение начинается
+    с сохранённого смещения. Чекпоинт удаляется после полной загрузки.
+
     Args:
         file_path: путь к файлу с bulk-данными
+        index_name: индекс, в который пишем документы
+        threads: число параллельных потоков загрузки
+
+    Returns:
+        число документов в индексе из этого файла, включая загруженные до рестарта
+    """
+    started = time.monotonic()
+    checkpoint = LoadCheckpoint(file_path)
+    state = checkpoint.get()
+    if state is not None and state["index"] == index_name:
+        offset, loaded = state["offset"], state["loaded"]
+        print(f"⏯️ '{index_name}': resuming {file_path} from byte {offset} ({loaded} docs)")
+    else:
+        offset, loaded = 0, 0
+
+    progress = _Progress(checkpoint, index_name, offset, loaded, DeadLetter())
+    chunks = chunk_actions(read_actions(file_path, index_name, offset))
+    _load_parallel(chunks, progress, index_name, threads)
+
+    checkpoint.clear()
+    _report(index_name, progress, started)
+    return progress.loaded
+
+
+def resumable_index(file_path: str) -> str | None:
+    """Индекс незавершённой загрузки файла, если он ещё существует."""
+    state = LoadCheckpoint(file_path).get()
+    if state is None or not es.indices.exists(index=state["index"]):
+        return None
+    return state["index"]
+
+
+def load_docs(docs: Iterable[dict], index_name: str, threads: int = BULK_THREADS):
+    """Загружает документы из памяти так же, как load_bulk — из файла."""
+    return load_actions(doc_actions(docs, index_name), index_name, threads)
+
+
+def load_actions(actions: Iterator[dict], index_name: str, threads: int = BULK_THREADS):
+    """
+    Загружает действия bulk из памяти через тот же _bulk_chunk, что и load_bulk:
+    повторы сбоев запроса, 429 по документам, отклонённые — в dead-letter.
     """
-    actions = []
-    with open(file_path, encoding="utf-8") as f:
-        lines = f.readlines()
-        for i in range(0, len(lines), 2):
-            action_line = json.loads(lines[i].strip())
-            doc_line = json.loads(lines[i + 1].strip())
-            action = {
-                "_op_type": "index",
-                "_index": INDEX_NAME,
-                "_id": action_line["index"]["_id"],
-                "_source": doc_line,
-            }
-            actions.append(action)
-
-            # Отправляем пачками по 500 объектов
-            if len(actions) >= 500:
-                helpers.bulk(es, actions)
-                actions = []
-
-    if actions:
-        helpers.bulk(es, actions)
+    started = time.monotonic()
+    progress = _Progress(None, index_name, 0, 0, DeadLetter())
+    # размер в байтах не считаем: streaming_bulk сам режет пачку по BULK_CHUNK_BYTES
+    chunks = chunk_actions((action, 0, 0) for action in actions)
+    _load_parallel(chunks, progress, index_name, threads)
+
+    _report(index_name, progress, started)
+    return progress.loaded
+
+
+def index_versions(alias: str) -> list[str]:
+    """Версии индекса alias_vN, от старой к новой."""
+    names = es.indices.get(index=f"{alias}_v*", expand_wildcards="open").keys()
+    versions = [n for n in names if n.removeprefix(f"{alias}_v").isdigit()]
+    return sorted(versions, key=lambda n: int(n.removeprefix(f"{alias}_v")))
+
+
+def alias_targets(alias: str) -> list[str]:
+    if not es.indices.exists_alias(name=alias):
+        return []
+    return list(es.indices.get_alias(name=alias).keys())
+
+
+def forcemerge(index_name: str, timeout: float = FORCEMERGE_TIMEOUT, poll: float = 10) -> bool:
+    """
+    Сливает сегменты index_name в один фоновой задачей ES.
+
+    Синхронный _forcemerge большого индекса идёт дольше request_timeout
+    клиента, поэтому запускаем задачу и опрашиваем её через _tasks.
+    Слияние — только оптимизация: при ошибке или таймауте загруженный
+    индекс остаётся годным, возвращается False.
+    """
+    try:
+        resp = es.indices.forcemerge(
+            index=index_name, max_num_segments=1, wait_for_completion=False
+        )
+        deadline = time.monotonic() + timeout
+        while not (task := es.tasks.get(task_id=resp["task"])).get("completed"):
+            if time.monotonic() >= deadline:
+                print(f"⚠️ Forcemerge '{index_name}' still running after {timeout:.0f}s")
+                return False
+            time.sleep(poll)
+    except Exception as e:
+        print(f"⚠️ Forcemerge '{index_name}' failed: {e}")
+        return False
+
+    if task.get("error"):
+        print(f"⚠️ Forcemerge '{index_name}' failed: {task['error']}")
+        return False
+    return True
+
+
+def warm_index(index_name: str, expected_docs: int):
+    """
+    Прогрев и проверка новой версии перед переключением.
+
+    Сливаем сегменты (индекс больше не пишется до следующей перестройки)
+    и прогоняем запрос, чтобы поднять структуры в кэш; пустой или
+    неполный индекс на алиас не ставим, неудачное слияние — ставим.
+    """
+    forcemerge(index_name)
+    es.indices.refresh(index=index_name)
+    es.search(index=index_name, size=1, query={"match_all": {}})
+
+    # expected_docs — созданные документы (повторы _id не в счёт, см. _bulk_chunk)
+    count = es.count(index=index_name)["count"]
+    if count == 0 or count < expected_docs:
+        raise RuntimeError(f"Index '{index_name}' has {count} docs, expected {expected_docs}")
+
+
+def swap_alias(alias: str, new_index: str):
+    """Атомарно переключает алиас на new_index одним _aliases-запросом."""
+    actions: list[dict] = [{"add": {"index": new_index, "alias": alias}}]
+    actions += [{"remove": {"index": old, "alias": alias}} for old in alias_targets(alias)]
+
+    if es.indices.exists(index=alias) and not es.indices.exists_alias(name=alias):
+        # старая схема: под именем алиаса лежит обычный индекс — заменяем его
+        print(f"⚠️ Replacing concrete index '{alias}' with alias")
+        actions.append({"remove_index": {"index": alias}})
+
+    es.indices.update_aliases(actions=actions)
+    print(f"🔀 Alias '{alias}' -> '{new_index}'")
+
+
+def cleanup_versions(alias: str, keep: int = KEEP_INDEX_VERSIONS):
+    """Удаляет старые версии, оставляя keep последних (для быстрого отката)."""
+    live = set(alias_targets(alias))
+    for index_name in index_versions(alias)[:-keep]:
+        if index_name not in live:
+            es.indices.delete(index=index_name)
+            print(f"🗑️ Deleted old index '{index_name}'")
+
+
+def rebuild_index(
+    alias: str, mapping: dict, load: Callable[[str], int], resume_from: str | None = None
+) -> str:
+    """
+    Blue/green перестройка: alias_v(N+1) с нуля, загрузка с настройками
+    для индексации, прогрев, атомарное переключение алиаса.
+
+    load(index_name) заливает документы в новую версию и возвращает их число
+    (например, partial(load_bulk, BULK_FILE)). resume_from — bulk-файл:
+    если его загрузка прервалась, продолжаем в ту же версию, а при новом
+    падении версию с чекпоинтом не удаляем. Возвращает имя новой версии.
+    """
+    new_index = resumable_index(resume_from) if resume_from else None
+    if new_index is None:
+        versions = index_versions(alias)
+        last = int(versions[-1].removeprefix(f"{alias}_v")) if versions else 0
+        new_index = f"{alias}_v{last + 1}"
+        create_index(new_index, mapping)
+
+    try:
+        loaded = load(new_index)
+        warm_index(new_index, loaded)
+    except Exception:
+        # алиас не трогали — API продолжает читать прежнюю версию
+        if resume_from and resumable_index(resume_from) == new_index:
+            print(f"⏸️ '{new_index}' kept, next run resumes from checkpoint")
+        else:
+            es.indices.delete(index=new_index, ignore_unavailable=True)
+        raise
+
+    swap_alias(alias, new_index)
+    cleanup_versions(alias)
+    return new_index
+
+
+def rollback_alias(alias: str):
+    """Возвращает алиас на версию, предшествующую текущей."""
+    live = alias_targets(alias)
+    versions = index_versions(alias)
+    if not live or live[0] not in versions or versions.index(live[0]) == 0:
+        raise RuntimeError(f"No previous version of '{alias}' to roll back to")
+    swap_alias(alias, versions[versions.index(live[0]) - 1])
 
 
 if __name__ == "__main__":
-    create_index()
-    print("Index created")
-    load_bulk(BULK_FILE)
-    print("Bulk load finished!")
+    wait_for_es(es)
+    aliases = (INDEX_NAME, PERSONS_INDEX, GENRES_INDEX)
+
+    if "--rollback" in sys.argv:
+        for alias in aliases:
+            rollback_alias(alias)
+        print("Rollback finished!")
+    else:
+        for alias, mapping, bulk_file in (
+            (INDEX_NAME, load_movies_mapping(), BULK_FILE),
+            (PERSONS_INDEX, PERSONS_MAPPING, PERSONS_BULK_FILE),
+            (GENRES_INDEX, GENRES_MAPPING, GENRES_BULK_FILE),
+        ):
+            rebuild_index(alias, mapping, partial(load_bulk, bulk_file), resume_from=bulk_file)
+        print("Bulk load finished!")
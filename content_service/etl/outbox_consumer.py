@@ -0,0 +1,117 @@
+"""
+outbox_consumer.py
+
+Потребитель transactional outbox админки (таблица content_outbox).
+
+Админка пишет событие (сущность + id) в той же транзакции, что и правку.
+Потребитель раз в OUTBOX_POLL_INTERVAL секунд забирает до OUTBOX_BATCH_SIZE
+событий, раскрывает их в затронутые фильмы, персоны и жанры, пишет их
+актуальное состояние в ES и сбрасывает кэши Content API.
+
+События удаляются в той же транзакции, в которой были выбраны: если ES
+или Redis упали, транзакция откатывается и пачка вернётся в следующем
+цикле. FOR UPDATE SKIP LOCKED позволяет запускать несколько потребителей.
+
+Документ, который ES отклоняет сам по себе (ошибка маппинга), повтором
+не исправить: он уходит в dead-letter (ETL_DEAD_LETTER_FILE), а пачка
+фиксируется — иначе он откатывал бы её вечно и блокировал все события
+после себя.
+
+Запуск: python etl/outbox_consumer.py
+"""
+
+import os
+import time
+from collections import defaultdict
+
+import psycopg2
+from cache_invalidation import invalidate
+from loader import DeadLetter
+from postgres_to_es import PG_DSN, SOURCES, affected_ids, reindex
+from psycopg2.extras import RealDictCursor
+
+POLL_INTERVAL = float(os.getenv("OUTBOX_POLL_INTERVAL", "1"))  # секунд между пустыми опросами
+BATCH_SIZE = int(os.getenv("OUTBOX_BATCH_SIZE", "500"))  # событий за транзакцию
+
+DRAIN_SQL = """
+    DELETE FROM content_outbox
+    WHERE id IN (
+        SELECT id FROM content_outbox
+        ORDER BY id
+        LIMIT %s
+        FOR UPDATE SKIP LOCKED
+    )
+    RETURNING entity, entity_id
+"""
+
+dead_letter = DeadLetter()
+
+# сущность события → источник, который раскрывает её в затронутые документы
+ENTITY_SOURCES = {
+    "filmwork": next(s for s in SOURCES if s.table == "content_filmwork"),
+    "person": next(s for s in SOURCES if s.table == "content_person"),
+    "genre": next(s for s in SOURCES if s.table == "content_genre"),
+}
+
+
+def drain(conn) -> int:
+    """Обрабатывает одну пачку событий. Возвращает число событий в ней."""
+    with conn, conn.cursor(cursor_factory=RealDictCursor) as cur:
+        cur.execute(DRAIN_SQL, (BATCH_SIZE,))
+        events = cur.fetchall()
+        if not events:
+            return 0
+
+        # повторы одной сущности в пачке схлопываются
+        by_entity: dict[str, set[str]] = defaultdict(set)
+        for event in events:
+            by_entity[event["entity"]].add(str(event["entity_id"]))
+
+        # сами сущности — даже удалённые: их документы уберёт reindex
+        films = set(by_entity["filmwork"])
+        persons = set(by_entity["person"])
+        genres = set(by_entity["genre"])
+        for entity, ids in by_entity.items():
+            more_films, more_persons, more_genres = affected_ids(
+                cur, ENTITY_SOURCES[entity], sorted(ids)
+            )
+            films |= more_films
+            persons |= more_persons
+            genres |= more_genres
+
+        rejected = dead_letter.count
+        reindex(cur, films, persons, genres, dead_letter)
+        invalidate(films, persons, genres)
+
+    print(
+        f"📬 Outbox: {len(events)} events → "
+        f"{len(films)} films, {len(persons)} persons, {len(genres)} genres"
+    )
+    if dead_letter.count > rejected:
+        print(f"☠️ Outbox: {dead_letter.count - rejected} docs written to {dead_letter.path}")
+    return len(events)
+
+
+def main():
+    conn = None
+    while True:
+        try:
+            if conn is None or conn.closed:
+                conn = psycopg2.connect(**PG_DSN)
+                print("✅ Connected to Postgres")
+
+            # полная пачка — сразу следующая, без паузы
+            if drain(conn) == BATCH_SIZE:
+                continue
+        except psycopg2.OperationalError as e:
+            print(f"❌ Postgres is unavailable: {e}")
+            conn = None
+        except Exception as e:
+            # ES или Redis недоступны — события остались в outbox, повторим
+            print(f"❌ Outbox batch failed: {e}")
+
+        time.sleep(POLL_INTERVAL)
+
+
+if __name__ == "__main__":
+    main()
@@ -1,26 +1,283 @@
 """
 run_etl.py
 
-Скрипт для запуска ETL-процесса:
-1. Трансформация старых данных в новый формат.
-2. Загрузка преобразованных данных в Elasticsearch.
+Скрипт для запуска ETL-процесса одним потоковым конвейером, без
+промежуточного файла movies_data_v2.json:
+
+    read → transform → batch → bulk-index
+
+Стадии работают в потоках и связаны очередями ограниченного размера
+(ETL_PIPELINE_QUEUE_SIZE). Быстрая стадия упирается в заполненную очередь
+и ждёт медленную, поэтому фильмы в памяти не копятся, а трансформация
+и индексация идут одновременно: общее время ≈ время самой медленной стадии.
+По каждой стадии в конце печатается пропускная способность и время
+простоя в ожидании входа — по нему видно узкое место.
+
+Фильмы грузятся в новую версию индекса movies (blue/green из loader.py).
+Персоны и жанры накапливаются по ходу (CatalogAggregates) и грузятся
+следом — в памяти остаются только они, размером с индексы persons и genres.
+
+Отклонённые ES фильмы пишутся в dead-letter (ETL_DEAD_LETTER_FILE); если
+их больше ETL_MAX_REJECTED_RATIO от всех, перестройка считается неудачной
+и алиас не переключается.
 """
 
-import subprocess
+import json
+import os
+import queue
+import threading
+import time
+from collections import deque
+from collections.abc import Callable, Iterator
+from functools import partial
+from multiprocessing import Pool
 
+import loader
+from catalog_indexes import (
+    GENRES_INDEX,
+    GENRES_MAPPING,
+    PERSONS_INDEX,
+    PERSONS_MAPPING,
+    CatalogAggregates,
+)
+from transform_old_to_new_data import SOURCE_FILE, TRANSFORM_WORKERS, transform_lines
 
-def main():
-    """Запускает ETL-процесс последовательно."""
+QUEUE_SIZE = int(os.getenv("ETL_PIPELINE_QUEUE_SIZE", "16"))  # пачек в каждой очереди
+READ_CHUNK_LINES = 500  # строк исходного файла в одной пачке на трансформацию
+MAX_REJECTED_RATIO = float(os.getenv("ETL_MAX_REJECTED_RATIO", "0.01"))  # доля отклонённых
+
+_DONE = object()
+
+
+class PipelineAborted(Exception):
+    """Одна из стадий упала — остальные сворачиваются."""
+
+
+class StageStats:
+    """Счётчики стадии: обработано элементов, время работы и простоя."""
+
+    def __init__(self, name: str):
+        self.name = name
+        self.items = 0
+        self.idle = 0.0
+        self.started = 0.0
+        self.finished = 0.0
+        self._lock = threading.Lock()
+
+    def add(self, items: int = 0, idle: float = 0.0):
+        with self._lock:
+            self.items += items
+            self.idle += idle
+
+    def report(self) -> str:
+        elapsed = max(self.finished - self.started, 1e-9)
+        return (
+            f"📊 {self.name:<10} {self.items:>9} items {elapsed:7.1f}s "
+            f"{self.items / elapsed:9.0f}/s  idle {self.idle:6.1f}s"
+        )
+
+
+class Pipeline:
+    """
+    Набор стадий-потоков над ограниченными очередями.
+
+    Ошибка в любой стадии взводит abort: остальные перестают ждать
+    очереди и выходят, а run() пробрасывает исходное исключение.
+    """
+
+    def __init__(self, queue_size: int = QUEUE_SIZE):
+        self.queue_size = queue_size
+        self.abort = threading.Event()
+        self.stats: list[StageStats] = []
+        self._errors: list[BaseException] = []
+        self._threads: list[threading.Thread] = []
+
+    def new_queue(self) -> queue.Queue:
+        return queue.Queue(maxsize=self.queue_size)
+
+    def put(self, q: queue.Queue, item):
+        while not self.abort.is_set():
+            try:
+                q.put(item, timeout=0.5)
+                return
+            except queue.Full:
+                continue
+        raise PipelineAborted
 
-    # --- Трансформация данных ---
-    print("🔄 Start transformation...")
-    subprocess.run(["python", "etl/transform_old_to_new_data.py"], check=True)
-    print("✅ Transformation finished.")
+    def consume(self, q: queue.Queue, stats: StageStats) -> Iterator:
+        """Элементы очереди до _DONE; время ожидания идёт в простой стадии."""
+        while True:
+            waited = time.monotonic()
+            while True:
+                if self.abort.is_set():
+                    raise PipelineAborted
+                try:
+                    item = q.get(timeout=0.5)
+                    break
+                except queue.Empty:
+                    continue
+            stats.add(idle=time.monotonic() - waited)
+            if item is _DONE:
+                return
+            yield item
+
+    def stage(self, name: str, fn: Callable[[StageStats], None], workers: int = 1):
+        stats = StageStats(name)
+        self.stats.append(stats)
+        running = [workers]
+        lock = threading.Lock()
+
+        def run():
+            try:
+                fn(stats)
+            except PipelineAborted:
+                pass
+            except BaseException as e:
+                self._errors.append(e)
+                self.abort.set()
+            finally:
+                with lock:
+                    running[0] -= 1
+                    if not running[0]:
+                        stats.finished = time.monotonic()
+
+        for i in range(workers):
+            self._threads.append(threading.Thread(target=run, name=f"{name}-{i}", daemon=True))
+
+    def run(self):
+        started = time.monotonic()
+        for stats in self.stats:
+            stats.started = started
+        for thread in self._threads:
+            thread.start()
+        for thread in self._threads:
+            thread.join()
+
+        for stats in self.stats:
+            print(stats.report())
+        if self._errors:
+            raise self._errors[0]
+
+
+def run_pipeline(
+    index_name: str, aggregates: CatalogAggregates, source_file: str = SOURCE_FILE
+) -> int:
+    """
+    Загружает фильмы из исходного файла в index_name за один проход.
+
+    Каждый фильм добавляется в aggregates — из них потом грузятся персоны
+    и жанры. Возвращает число созданных в индексе документов; при доле
+    отклонённых больше MAX_REJECTED_RATIO бросает RuntimeError.
+    """
+    workers = loader.BULK_THREADS
+    pipeline = Pipeline()
+    raw_q, docs_q, batches_q = pipeline.new_queue(), pipeline.new_queue(), pipeline.new_queue()
+    loaded = [0]
+    dead_letter = loader.DeadLetter()
+    lock = threading.Lock()
+    # процессы создаём до запуска потоков: fork из многопоточного процесса небезопасен
+    pool = Pool(TRANSFORM_WORKERS) if TRANSFORM_WORKERS > 1 else None
+
+    def read(stats: StageStats):
+        with open(source_file, "rb") as f:
+            chunk = []
+            for line in f:
+                chunk.append(line)
+                if len(chunk) == READ_CHUNK_LINES:
+                    pipeline.put(raw_q, chunk)
+                    stats.add(len(chunk))
+                    chunk = []
+            if chunk:
+                pipeline.put(raw_q, chunk)
+                stats.add(len(chunk))
+        pipeline.put(raw_q, _DONE)
+
+    def transform(stats: StageStats):
+        # в полёте не больше двух пачек на процесс — порядок сохраняется
+        inflight: deque = deque()
+        for chunk in pipeline.consume(raw_q, stats):
+            if pool is None:
+                inflight.append(transform_lines(chunk))
+            else:
+                inflight.append(pool.apply_async(transform_lines, (chunk,)))
+            while inflight and (pool is None or len(inflight) >= TRANSFORM_WORKERS * 2):
+                send_docs(stats, inflight.popleft())
+        while inflight:
+            send_docs(stats, inflight.popleft())
+        pipeline.put(docs_q, _DONE)
+
+    def send_docs(stats: StageStats, result):
+        docs = result if pool is None else result.get()
+        pipeline.put(docs_q, docs)
+        stats.add(len(docs))
+
+    def batch(stats: StageStats):
+        actions, size = [], 0
+        for docs in pipeline.consume(docs_q, stats):
+            for doc in docs:
+                actions.append(
+                    {"_op_type": "index", "_index": index_name, "_id": doc["uuid"], "_source": doc}
+                )
+                size += len(json.dumps(doc, ensure_ascii=False).encode())
+                aggregates.add(doc)
+                if len(actions) >= loader.BULK_CHUNK_SIZE or size >= loader.BULK_CHUNK_BYTES:
+                    pipeline.put(batches_q, actions)
+                    stats.add(len(actions))
+                    actions, size = [], 0
+        if actions:
+            pipeline.put(batches_q, actions)
+            stats.add(len(actions))
+        for _ in range(workers):
+            pipeline.put(batches_q, _DONE)
+
+    def index(stats: StageStats):
+        for actions in pipeline.consume(batches_q, stats):
+            # те же повторы и подсчёт созданных документов, что и в loader
+            ok, failed = loader._bulk_chunk(actions)
+            stats.add(ok)
+            dead_letter.write(index_name, failed, actions)
+            with lock:
+                loaded[0] += ok
+
+    pipeline.stage("read", read)
+    pipeline.stage("transform", transform)
+    pipeline.stage("batch", batch)
+    pipeline.stage("bulk-index", index, workers=workers)
+
+    try:
+        with loader.bulk_indexing_settings(index_name):
+            pipeline.run()
+    finally:
+        if pool is not None:
+            pool.terminate()
+
+    rejected = dead_letter.count
+    print(f"📤 '{index_name}': loaded {loaded[0]} docs, {rejected} errors")
+    if rejected:
+        print(f"☠️ '{index_name}': {rejected} docs written to {dead_letter.path}")
+    if rejected > MAX_REJECTED_RATIO * (loaded[0] + rejected):
+        raise RuntimeError(f"'{index_name}': {rejected} of {loaded[0] + rejected} docs rejected")
+    return loaded[0]
+
+
+def main():
+    """Запускает ETL-процесс: фильмы конвейером, затем персоны и жанры."""
+    loader.wait_for_es(loader.es)
 
-    # --- Загрузка данных в Elasticsearch ---
-    print("📤 Start loading to Elasticsearch...")
-    subprocess.run(["python", "etl/loader.py"], check=True)
-    print("✅ Loading finished.")
+    print("🔄 Start streaming ETL...")
+    aggregates = CatalogAggregates()
+    loader.rebuild_index(
+        loader.INDEX_NAME,
+        loader.load_movies_mapping(),
+        partial(run_pipeline, aggregates=aggregates),
+    )
+    loader.rebuild_index(
+        PERSONS_INDEX, PERSONS_MAPPING, partial(loader.load_docs, aggregates.persons())
+    )
+    loader.rebuild_index(
+        GENRES_INDEX, GENRES_MAPPING, partial(loader.load_docs, aggregates.genres())
+    )
+    print("✅ ETL finished.")
 
 
 if __name__ == "__main__":
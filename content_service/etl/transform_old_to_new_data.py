@@ -5,32 +5,50 @@ transform_old_to_new_data.py
 который будет использоваться для загрузки в Elasticsearch.
 
 Функции:
-- Генерация уникальных UUID для жанров и персон.
+- Детерминированные UUIDv5 для фильмов, жанров и персон из естественных
+  ключей: повторный запуск даёт те же id, кэши и индексы остаются валидными.
 - Трансформация списков актеров, режиссеров и сценаристов.
+- Параллельная трансформация: входной файл режется на диапазоны байт
+  по границам строк, каждый диапазон обрабатывает свой процесс; готовые
+  части отдаются потоком, каталог целиком в памяти не собирается.
 - Сохранение преобразованных фильмов в новый JSON Lines файл
   (каждая пара строк: действие `index` + документ).
+- Сборка денормализованных документов персон и жанров в отдельные bulk-файлы.
 """
 
 import json
+import math
+import os
 import uuid
+from collections.abc import Iterable, Iterator
+from itertools import pairwise
+from multiprocessing import Pool
 
-# Вспомогательные словари для хранения уникальных UUID
-genre_uuid_map = {}
-person_uuid_map = {}
+from catalog_indexes import CatalogAggregates
+
+SOURCE_FILE = "data/movies_data.json"
+# процессов трансформации (по умолчанию — по числу ядер)
+TRANSFORM_WORKERS = int(os.getenv("ETL_TRANSFORM_WORKERS", str(os.cpu_count() or 1)))
+# байт исходного файла на одну часть: столько за раз держит в памяти процесс
+TRANSFORM_PART_BYTES = int(os.getenv("ETL_TRANSFORM_PART_BYTES", str(16 * 1024 * 1024)))
+
+# Пространство имён UUIDv5 каталога: менять нельзя — поменяются все id
+CATALOG_NAMESPACE = uuid.UUID("5b0f4a4e-7f57-4c43-9d0e-6f1a2c8e9b31")
+
+
+def stable_uuid(kind: str, key: str) -> str:
+    """UUIDv5 из типа сущности и естественного ключа."""
+    return str(uuid.uuid5(CATALOG_NAMESPACE, f"{kind}:{key}"))
 
 
 def get_genre_uuid(name: str) -> str:
-    """Возвращает UUID для жанра, создавая новый, если нужно."""
-    if name not in genre_uuid_map:
-        genre_uuid_map[name] = str(uuid.uuid4())
-    return genre_uuid_map[name]
+    """Возвращает UUID для жанра по его названию."""
+    return stable_uuid("genre", name)
 
 
 def get_person_uuid(name: str) -> str:
-    """Возвращает UUID для персоны, создавая новый, если нужно."""
-    if name not in person_uuid_map:
-        person_uuid_map[name] = str(uuid.uuid4())
-    return person_uuid_map[name]
+    """Возвращает UUID для персоны по её имени."""
+    return stable_uuid("person", name)
 
 
 def transform_person_list(person_list: list) -> list[dict]:
@@ -41,11 +59,15 @@ def transform_person_list(person_list: list) -> list[dict]:
     return [{"uuid": get_person_uuid(p), "full_name": p} for p in person_list]
 
 
-def transform_movie(old_movie: dict) -> dict:
+def transform_movie(old_movie: dict, old_id: str | None = None) -> dict:
     """Преобразует старую структуру фильма
-    в новую с UUID для фильма, жанров и персон."""
+    в новую с UUID для фильма, жанров и персон.
+
+    UUID фильма строится из его id в старом индексе,
+    а если его нет — из названия."""
+    film_key = old_movie.get("id") or old_id or old_movie.get("title")
     return {
-        "uuid": str(uuid.uuid4()),
+        "uuid": stable_uuid("film", film_key),
         "title": old_movie.get("title"),
         "imdb_rating": old_movie.get("imdb_rating"),
         "description": old_movie.get("description"),
@@ -56,24 +78,86 @@ def transform_movie(old_movie: dict) -> dict:
     }
 
 
+def split_file(path: str, parts: int) -> list[tuple[int, int]]:
+    """Делит файл на parts диапазонов байт [start, end), выровненных по концам строк."""
+    size = os.path.getsize(path)
+    bounds = [0]
+    with open(path, "rb") as f:
+        for i in range(1, parts):
+            f.seek(max(size * i // parts, bounds[-1]))
+            f.readline()  # дочитываем строку, на которую попала граница
+            bounds.append(min(f.tell(), size))
+    bounds.append(size)
+    return [(start, end) for start, end in pairwise(bounds) if start < end]
+
+
+def transform_lines(lines: list[bytes]) -> list[dict]:
+    """Трансформирует пачку строк старого файла, пустые строки пропускаются."""
+    movies = []
+    for line in lines:
+        if not line.strip():
+            continue
+        raw = json.loads(line)
+        movies.append(transform_movie(raw["_source"], raw.get("_id")))
+    return movies
+
+
+def transform_range(args: tuple[str, int, int]) -> list[dict]:
+    """Трансформирует фильмы из диапазона байт файла (выполняется в дочернем процессе)."""
+    path, start, end = args
+    movies = []
+    with open(path, "rb") as f:
+        f.seek(start)
+        while f.tell() < end:
+            movies += transform_lines([f.readline()])
+    return movies
+
+
+def transform_file(
+    path: str, workers: int = TRANSFORM_WORKERS, part_bytes: int = TRANSFORM_PART_BYTES
+) -> Iterator[dict]:
+    """
+    Трансформирует файл в workers процессах и отдаёт фильмы по мере готовности.
+
+    Файл режется на части не больше part_bytes; imap отдаёт их в исходном
+    порядке строк, поэтому в памяти только части в работе, а не весь
+    каталог. id не зависят от порядка обработки — частям не нужны общие словари.
+    """
+    parts = max(workers, math.ceil(os.path.getsize(path) / part_bytes), 1)
+    ranges = [(path, start, end) for start, end in split_file(path, parts)]
+    if workers <= 1 or len(ranges) <= 1:
+        for r in ranges:
+            yield from transform_range(r)
+        return
+
+    with Pool(min(workers, len(ranges))) as pool:
+        for part in pool.imap(transform_range, ranges):
+            yield from part
+
+
+def write_bulk(path: str, docs: Iterable[dict]):
+    """Записывает документы в bulk-файл: действие `index` + документ, _id = uuid."""
+    with open(path, "w", encoding="utf-8") as f_out:
+        for doc in docs:
+            f_out.write(json.dumps({"index": {"_id": doc["uuid"]}}) + "\n")
+            f_out.write(json.dumps(doc) + "\n")
+
+
 def main():
     """Чтение старого файла
     и запись нового с подготовкой
      для bulk загрузки в Elasticsearch."""
-    with (
-        open("data/movies_data.json", encoding="utf-8") as f_in,
-        open("data/movies_data_v2.json", "w", encoding="utf-8") as f_out,
-    ):
-        for line in f_in:
-            if not line.strip():
-                continue
-            old_movie = json.loads(line)["_source"]
-            new_movie = transform_movie(old_movie)
-
-            # Строка с действием для bulk API
-            action = {"index": {"_id": new_movie["uuid"]}}
-            f_out.write(json.dumps(action) + "\n")
-            f_out.write(json.dumps(new_movie) + "\n")
+    aggregates = CatalogAggregates()
+
+    def movies() -> Iterator[dict]:
+        # персоны и жанры собираются попутно, фильмы сразу уходят в файл
+        for movie in transform_file(SOURCE_FILE):
+            aggregates.add(movie)
+            yield movie
+
+    write_bulk("data/movies_data_v2.json", movies())
+    write_bulk("data/persons_data.json", aggregates.persons())
+    write_bulk("data/genres_data.json", aggregates.genres())
 
 
 if __name__ == "__main__":
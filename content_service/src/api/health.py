@@ -0,0 +1,38 @@
+from http import HTTPStatus
+
+from fastapi import APIRouter, Request
+from fastapi.responses import ORJSONResponse
+from services.cache_builder import ping_backends
+
+router = APIRouter()
+
+
+@router.get("/live")
+async def live():
+    """
+    Liveness-проба: процесс жив и обрабатывает запросы.
+
+    Зависимости не проверяются, чтобы недоступность Redis или
+    Elasticsearch не приводила к перезапуску пода.
+    """
+    return {"status": "ok"}
+
+
+@router.get("/ready")
+async def ready(request: Request):
+    """
+    Readiness-проба: сервис готов принимать трафик.
+
+    Возвращает 503, пока Redis и Elasticsearch не ответили на пинг.
+
+    Returns:
+        dict: общий статус и доступность каждой зависимости.
+    """
+    state = request.app.state
+    backends = await ping_backends(state.es_storage, state.redis_storage)
+
+    ok = all(backends.values())
+    return ORJSONResponse(
+        {"status": "ok" if ok else "unavailable", **backends},
+        status_code=HTTPStatus.OK if ok else HTTPStatus.SERVICE_UNAVAILABLE,
+    )
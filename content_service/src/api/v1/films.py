@@ -1,9 +1,13 @@
 from uuid import UUID
 
-from dependencies import get_film_service
-from fastapi import APIRouter, Depends, HTTPException, Query
+from api.v1.pagination import CursorQuery, page_headers, parse_cursor
+from core.config import settings
+from dependencies import get_film_service, get_response_cache
+from fastapi import APIRouter, Depends, HTTPException, Query, Request
 from models.film import Film
+from models.film_batch import FilmsBatch
 from models.film_short import FilmShort
+from services.cache.response_cache import ResponseCache
 from services.films.films_service import FilmService
 
 router = APIRouter()
@@ -11,9 +15,12 @@ router = APIRouter()
 
 @router.get("/", response_model=list[FilmShort])
 async def list_films(
+    request: Request,
     page: int = Query(1, ge=1, description="Номер страницы"),
     size: int = Query(10, ge=1, description="Количество фильмов на странице"),
+    cursor: str | None = CursorQuery,
     film_service: FilmService = Depends(get_film_service),
+    response_cache: ResponseCache = Depends(get_response_cache),
 ):
     """
     Получение списка фильмов с пагинацией.
@@ -21,28 +28,41 @@ async def list_films(
     Args:
         page (int, optional): номер страницы.
         size (int, optional): количество фильмов на странице. По умолчанию 10.
+        cursor (str, optional): курсор следующей страницы; если передан,
+        page игнорируется и глубина листания не влияет на скорость.
         film_service (FilmService): сервис для работы с фильмами
         (инжектируется через Depends).
 
     Returns:
         List[FilmShort]: список фильмов с минимальными данными
-        (UUID, название, рейтинг IMDb).
+        (UUID, название, рейтинг IMDb). Курсор следующей страницы —
+        в заголовке X-Next-Cursor (нет заголовка — страница последняя).
 
     Примечание:
-        Данные кэшируются в Redis для ускорения повторных запросов.
+        Данные кэшируются в Redis для ускорения повторных запросов,
+        повторный запрос отдаёт готовые байты ответа.
     """
-    films = await film_service.list_films(size=size, page=page)
-    return films
+    films_cursor = parse_cursor(cursor)
+    return await response_cache.render(
+        request,
+        list[FilmShort],
+        lambda: film_service.list_films_page(page=page, size=size, cursor=films_cursor),
+        content=lambda films_page: films_page.items,
+        headers=page_headers,
+    )
 
 
 @router.get("/search", response_model=list[FilmShort])
 async def search_films(
+    request: Request,
     query: str = Query(
         ..., min_length=1, description="Строка для полнотекстового поиска по названию фильма"
     ),
     page: int = Query(1, ge=1, description="Номер страницы поиска"),
     size: int = Query(10, ge=1, description="Количество результатов поиска"),
+    cursor: str | None = CursorQuery,
     film_service: FilmService = Depends(get_film_service),
+    response_cache: ResponseCache = Depends(get_response_cache),
 ):
     """
     Поиск фильмов по названию или описанию.
@@ -51,21 +71,81 @@ async def search_films(
         query (str): поисковый запрос.
         size (int, optional): максимальное количество возвращаемых фильмов.
         По умолчанию 10.
+        cursor (str, optional): курсор следующей страницы результатов.
         film_service (FilmService): сервис для работы с фильмами.
 
     Returns:
         List[FilmShort]: список фильмов, соответствующих запросу.
+        Курсор следующей страницы — в заголовке X-Next-Cursor.
 
     Примечание:
         Результаты поиска кэшируются в Redis для ускорения повторных запросов.
     """
-    return await film_service.search_films(query_str=query, page=page, size=size)
+    films_cursor = parse_cursor(cursor)
+    return await response_cache.render(
+        request,
+        list[FilmShort],
+        lambda: film_service.search_films_page(
+            query_str=query, page=page, size=size, cursor=films_cursor
+        ),
+        content=lambda films_page: films_page.items,
+        headers=page_headers,
+    )
+
+
+def _parse_film_ids(ids: str) -> list[UUID]:
+    try:
+        film_ids = [UUID(film_id.strip()) for film_id in ids.split(",") if film_id.strip()]
+    except ValueError:
+        raise HTTPException(status_code=422, detail="ids must be comma-separated UUIDs") from None
+
+    if not film_ids:
+        raise HTTPException(status_code=422, detail="ids must not be empty")
+    if len(film_ids) > settings.films_batch_max_ids:
+        raise HTTPException(
+            status_code=422, detail=f"Too many ids, max {settings.films_batch_max_ids}"
+        )
+    return film_ids
+
+
+@router.get("/batch", response_model=FilmsBatch)
+async def get_films_batch(
+    request: Request,
+    ids: str = Query(..., min_length=1, description="UUID фильмов через запятую"),
+    film_service: FilmService = Depends(get_film_service),
+    response_cache: ResponseCache = Depends(get_response_cache),
+):
+    """
+    Получение нескольких фильмов одним запросом.
+
+    Args:
+        ids (str): UUID фильмов через запятую.
+        film_service (FilmService): сервис для работы с фильмами.
+
+    Returns:
+        FilmsBatch: фильмы в порядке запрошенных UUID (null на месте
+        ненайденного) и список ненайденных UUID.
+
+    Примечание:
+        Закэшированные фильмы читаются одним MGET из Redis, остальные —
+        одним _mget из Elasticsearch, и пишутся в кэш одним pipeline.
+    """
+    film_ids = _parse_film_ids(ids)
+
+    async def produce() -> FilmsBatch:
+        films = await film_service.get_films_by_ids(film_ids)
+        missing = [film_id for film_id, film in zip(film_ids, films, strict=True) if film is None]
+        return FilmsBatch(films=films, missing=missing)
+
+    return await response_cache.render(request, FilmsBatch, produce)
 
 
 @router.get("/{film_id}", response_model=Film)
 async def get_film_details(
     film_id: UUID,
+    request: Request,
     film_service: FilmService = Depends(get_film_service),
+    response_cache: ResponseCache = Depends(get_response_cache),
 ):
     """
     Получение полной информации о фильме по его UUID.
@@ -84,7 +164,9 @@ async def get_film_details(
     Примечание:
         Данные фильма кэшируются в Redis для ускорения повторных запросов.
     """
-    film = await film_service.get_film_by_id(film_id)
-    if not film:
+    response = await response_cache.render(
+        request, Film, lambda: film_service.get_film_by_id(film_id)
+    )
+    if response is None:
         raise HTTPException(status_code=404, detail="Film not found")
-    return film
+    return response
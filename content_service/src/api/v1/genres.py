@@ -1,9 +1,11 @@
 from http import HTTPStatus
 from uuid import UUID
 
-from dependencies import get_genre_service
-from fastapi import APIRouter, Depends, HTTPException, Query
+from api.v1.pagination import CursorQuery, page_headers, parse_cursor
+from dependencies import get_genre_service, get_response_cache
+from fastapi import APIRouter, Depends, HTTPException, Query, Request
 from models.genre import Genre
+from services.cache.response_cache import ResponseCache
 from services.genres.genres_service import GenreService
 
 router = APIRouter()
@@ -11,9 +13,12 @@ router = APIRouter()
 
 @router.get("/", response_model=list[Genre])
 async def genres_list(
+    request: Request,
     page: int = Query(1, ge=1, description="Номер страницы"),
     size: int = Query(10, ge=1, description="Количество жанров на странице"),
+    cursor: str | None = CursorQuery,
     genre_service: GenreService = Depends(get_genre_service),
+    response_cache: ResponseCache = Depends(get_response_cache),
 ):
     """
     Получение списка жанров с пагинацией.
@@ -21,22 +26,34 @@ async def genres_list(
     Args:
         page (int, optional): номер страницы, начиная с 1. По умолчанию 1.
         size (int, optional): количество жанров на странице. По умолчанию 50.
+        cursor (str, optional): курсор следующей страницы; если передан,
+            page игнорируется.
         genre_service (GenreService): сервис для работы с жанрами
             (инжектируется через Depends).
 
     Returns:
-        List[Genre]: список жанров на текущей странице.
+        List[Genre]: список жанров на текущей странице. Курсор следующей
+        страницы — в заголовке X-Next-Cursor.
 
     Примечание:
         Данные кэшируются в Redis для ускорения повторных запросов.
     """
-    return await genre_service.list_genres(size=size, page=page)
+    genres_cursor = parse_cursor(cursor)
+    return await response_cache.render(
+        request,
+        list[Genre],
+        lambda: genre_service.list_genres(size=size, page=page, cursor=genres_cursor),
+        content=lambda genres_page: genres_page.items,
+        headers=page_headers,
+    )
 
 
 @router.get("/search", response_model=list[Genre])
 async def search_genres(
+    request: Request,
     query: str = Query(..., min_length=1, description="Поисковый запрос для жанров"),
     genre_service: GenreService = Depends(get_genre_service),
+    response_cache: ResponseCache = Depends(get_response_cache),
 ):
     """
     Поиск жанров по названию.
@@ -51,12 +68,18 @@ async def search_genres(
     Примечание:
         Результаты поиска кэшируются в Redis для ускорения повторных запросов.
     """
-    genres = await genre_service.search_genres(query_str=query)
-    return genres
+    return await response_cache.render(
+        request, list[Genre], lambda: genre_service.search_genres(query_str=query)
+    )
 
 
 @router.get("/{genre_id}", response_model=Genre)
-async def genre_details(genre_id: UUID, genre_service: GenreService = Depends(get_genre_service)):
+async def genre_details(
+    genre_id: UUID,
+    request: Request,
+    genre_service: GenreService = Depends(get_genre_service),
+    response_cache: ResponseCache = Depends(get_response_cache),
+):
     """
     Получение информации о жанре по его UUID.
 
@@ -73,7 +96,9 @@ async def genre_details(genre_id: UUID, genre_service: GenreService = Depends(ge
     Примечание:
         Данные жанра кэшируются в Redis для ускорения повторных запросов.
     """
-    genre = await genre_service.get_genre_by_id(genre_id)
-    if not genre:
+    response = await response_cache.render(
+        request, Genre, lambda: genre_service.get_genre_by_id(genre_id)
+    )
+    if response is None:
         raise HTTPException(status_code=HTTPStatus.NOT_FOUND, detail="genre not found")
-    return genre
+    return response
@@ -0,0 +1,31 @@
+from http import HTTPStatus
+
+from fastapi import HTTPException, Query
+from services.utils.cursor import Cursor, InvalidCursorError
+
+NEXT_CURSOR_HEADER = "X-Next-Cursor"
+
+CursorQuery = Query(None, description="Курсор из заголовка X-Next-Cursor предыдущей страницы")
+
+
+def parse_cursor(cursor: str | None, keys: int = 2) -> Cursor | None:
+    """
+    Разобрать курсор из query-параметра.
+
+    keys — число ключей сортировки страницы; курсор с другим числом
+    значений ES не примет, поэтому отвечаем 400 сразу.
+    """
+    if cursor is None:
+        return None
+    try:
+        parsed = Cursor.decode(cursor)
+    except InvalidCursorError:
+        parsed = None
+    if parsed is None or len(parsed.search_after) != keys:
+        raise HTTPException(status_code=HTTPStatus.BAD_REQUEST, detail="Invalid cursor")
+    return parsed
+
+
+def page_headers(page) -> dict[str, str | None]:
+    """Заголовки ответа со страницей: курсор следующей, если она есть."""
+    return {NEXT_CURSOR_HEADER: page.next_cursor}
@@ -1,9 +1,11 @@
 from http import HTTPStatus
 from uuid import UUID
 
-from dependencies import get_person_service
-from fastapi import APIRouter, Depends, HTTPException, Query
+from api.v1.pagination import CursorQuery, page_headers, parse_cursor
+from dependencies import get_person_service, get_response_cache
+from fastapi import APIRouter, Depends, HTTPException, Query, Request
 from models.person import Person
+from services.cache.response_cache import ResponseCache
 from services.persons.persons_service import PersonService
 
 router = APIRouter()
@@ -11,9 +13,12 @@ router = APIRouter()
 
 @router.get("/", response_model=list[Person])
 async def persons_list(
+    request: Request,
     page: int = Query(1, ge=1, description="Номер страницы"),
     size: int = Query(10, ge=1, le=100, description="Количество персон на странице"),
+    cursor: str | None = CursorQuery,
     person_service: PersonService = Depends(get_person_service),
+    response_cache: ResponseCache = Depends(get_response_cache),
 ):
     """
     Получение списка всех персон с пагинацией.
@@ -21,21 +26,33 @@ async def persons_list(
     Args:
         page (int): номер страницы (начало с 1).
         size (int): количество персон на странице (макс. 100).
+        cursor (str, optional): курсор следующей страницы; если передан,
+        page игнорируется.
         person_service (PersonService): сервис для работы с персоной.
 
     Returns:
-        List[Person]: список персон с UUID, полным именем и ролью.
+        List[Person]: список персон с UUID и полным именем. Курсор
+        следующей страницы — в заголовке X-Next-Cursor.
 
     Примечание:
         Данные кэшируются в Redis для ускорения повторных запросов.
     """
-    return await person_service.list_persons(size=size, page=page)
+    persons_cursor = parse_cursor(cursor)
+    return await response_cache.render(
+        request,
+        list[Person],
+        lambda: person_service.list_persons(size=size, page=page, cursor=persons_cursor),
+        content=lambda persons_page: persons_page.items,
+        headers=page_headers,
+    )
 
 
 @router.get("/search", response_model=list[Person])
 async def search_persons(
+    request: Request,
     query: str = Query(..., min_length=1, description="Поисковая строка для поиска персон"),
     person_service: PersonService = Depends(get_person_service),
+    response_cache: ResponseCache = Depends(get_response_cache),
 ):
     """
     Поиск персон (актёров, режиссёров, сценаристов) по полному имени.
@@ -50,12 +67,17 @@ async def search_persons(
     Примечание:
         Результаты поиска кэшируются в Redis.
     """
-    return await person_service.search_persons(query_str=query)
+    return await response_cache.render(
+        request, list[Person], lambda: person_service.search_persons(query_str=query)
+    )
 
 
 @router.get("/{person_id}", response_model=Person)
 async def person_details(
-    person_id: UUID, person_service: PersonService = Depends(get_person_service)
+    person_id: UUID,
+    request: Request,
+    person_service: PersonService = Depends(get_person_service),
+    response_cache: ResponseCache = Depends(get_response_cache),
 ):
     """
     Получение информации о конкретной персоне по UUID.
@@ -73,7 +95,9 @@ async def person_details(
     Примечание:
         Данные кэшируются в Redis для ускорения повторных запросов.
     """
-    person = await person_service.get_person_by_id(str(person_id))
-    if not person:
+    response = await response_cache.render(
+        request, Person, lambda: person_service.get_person_by_id(str(person_id))
+    )
+    if response is None:
         raise HTTPException(status_code=HTTPStatus.NOT_FOUND, detail="person not found")
-    return person
+    return response
@@ -1,8 +1,7 @@
-from typing import Any
-
-from dependencies import get_search_service
-from fastapi import APIRouter, Depends, Query
+from dependencies import get_response_cache, get_search_service
+from fastapi import APIRouter, Depends, Query, Request, Response
 from models.search import SearchResults
+from services.cache.response_cache import ResponseCache
 from services.global_search.search_service import SearchService
 
 router = APIRouter()
@@ -12,9 +11,16 @@ router = APIRouter()
     "/", summary="Глобальный поиск по фильмам, персонам и жанрам", response_model=SearchResults
 )
 async def search_all(
+    request: Request,
     query: str = Query(..., min_length=1, description="Поисковая строка"),
     page: int = Query(1, ge=1),
     size: int = Query(10, ge=1, le=100),
     search_service: SearchService = Depends(get_search_service),
-) -> dict[str, Any]:
-    return await search_service.search_all(query=query, page=page, size=size)
+    response_cache: ResponseCache = Depends(get_response_cache),
+) -> Response:
+    return await response_cache.render(
+        request,
+        SearchResults,
+        lambda: search_service.search_all(query=query, page=page, size=size),
+        cacheable=lambda data: not data["partial"],
+    )
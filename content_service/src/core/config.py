@@ -18,6 +18,45 @@ class Settings(BaseSettings):
     elastic_host: str = Field(default="127.0.0.1", env="ELASTIC_HOST")
     elastic_port: int = Field(default=9200, env="ELASTIC_PORT")
 
+    # keep_alive point-in-time для курсорной пагинации фильмов ("1m"); пусто — без PIT
+    elastic_pit_keep_alive: str = Field(default="", env="ELASTIC_PIT_KEEP_ALIVE")
+
+    # In-process L1 кэш (на воркер); 0 записей — отключён
+    cache_l1_max_entries: int = Field(default=10_000, env="CACHE_L1_MAX_ENTRIES")
+    cache_l1_ttl: float = Field(default=5.0, env="CACHE_L1_TTL")
+
+    # TTL закэшированных промахов (404 по фильму/жанру/персоне)
+    cache_negative_ttl: int = Field(default=5, env="CACHE_NEGATIVE_TTL")
+
+    # Распределённый лок на перестроение ключа кэша (один воркер на флот)
+    cache_lock_enabled: bool = Field(default=False, env="CACHE_LOCK_ENABLED")
+    cache_lock_ttl: int = Field(default=5, env="CACHE_LOCK_TTL")
+    cache_lock_wait: float = Field(default=1.0, env="CACHE_LOCK_WAIT")
+
+    # Формат значений кэша: json | orjson | msgpack; сжатие: none | zstd | lz4
+    cache_codec: str = Field(default="orjson", env="CACHE_CODEC")
+    cache_compression: str = Field(default="zstd", env="CACHE_COMPRESSION")
+    cache_compression_threshold: int = Field(default=1024, env="CACHE_COMPRESSION_THRESHOLD")
+
+    # Кэш готовых JSON-ответов API (films / genres / persons / search)
+    response_cache_enabled: bool = Field(default=True, env="RESPONSE_CACHE_ENABLED")
+    response_cache_ttl: int = Field(default=10, env="RESPONSE_CACHE_TTL")
+
+    # Инвалидация по событиям каталога: теги uuid → ключи и поток изменений от ETL
+    cache_invalidation_enabled: bool = Field(default=True, env="CACHE_INVALIDATION_ENABLED")
+    cache_changes_stream: str = Field(default="catalog:changes", env="CACHE_CHANGES_STREAM")
+
+    # Максимум UUID в одном запросе /films/batch
+    films_batch_max_ids: int = Field(default=100, env="FILMS_BATCH_MAX_IDS")
+
+    # Склейка одиночных запросов фильма в один _mget (окно, мс / максимум ключей)
+    film_batch_loader_enabled: bool = Field(default=False, env="FILM_BATCH_LOADER_ENABLED")
+    film_batch_window_ms: float = Field(default=2.0, env="FILM_BATCH_WINDOW_MS")
+    film_batch_max_keys: int = Field(default=50, env="FILM_BATCH_MAX_KEYS")
+
+    # Дедлайн каждой секции глобального поиска (films / persons / genres), сек
+    search_section_timeout: float = Field(default=0.5, env="SEARCH_SECTION_TIMEOUT")
+
     # Auth
     auth_url: str = Field(default="http://auth_service:8000/api/v1/auth", env="AUTH_URL")
 
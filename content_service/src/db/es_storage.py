@@ -20,6 +20,9 @@ class ElasticsearchStorage(SearchStorageProtocol):
         except Exception:  # NotFoundError и прочее
             return None
 
+    async def mget(self, index: str, body: dict) -> dict:
+        return await self._es.mget(index=index, body=body)
+
     async def search(
         self,
         index: str,
@@ -15,6 +15,18 @@ class CacheStorageProtocol(Protocol):
         с возможным временем жизни (expire в секундах)."""
         ...
 
+    async def exists(self, *keys: str) -> int:
+        """Сколько из переданных ключей существует."""
+        ...
+
+    async def mget(self, keys: list[str]) -> list[Any | None]:
+        """Значения нескольких ключей за один запрос (None для отсутствующих)."""
+        ...
+
+    def pipeline(self, transaction: bool = True) -> Any:
+        """Пайплайн: команды копятся и уходят одним round trip в execute()."""
+        ...
+
 
 class SearchStorageProtocol(Protocol):
     """Протокол для поискового хранилища (Elasticsearch)."""
@@ -23,6 +35,10 @@ class SearchStorageProtocol(Protocol):
         """Получить документ по id."""
         ...
 
+    async def mget(self, index: str, body: dict) -> dict:
+        """Получить несколько документов одним запросом (_mget)."""
+        ...
+
     async def search(
         self,
         index: str,
@@ -34,3 +34,18 @@ class RedisStorage(CacheStorageProtocol):
         if not self._redis:
             raise RuntimeError("Redis is not connected")
         await self._redis.set(key, value, ex=expire)
+
+    async def exists(self, *keys: str) -> int:
+        if not self._redis:
+            raise RuntimeError("Redis is not connected")
+        return await self._redis.exists(*keys)
+
+    async def mget(self, keys: list[str]) -> list[Any | None]:
+        if not self._redis:
+            raise RuntimeError("Redis is not connected")
+        return await self._redis.mget(keys)
+
+    def pipeline(self, transaction: bool = True) -> Any:
+        if not self._redis:
+            raise RuntimeError("Redis is not connected")
+        return self._redis.pipeline(transaction=transaction)
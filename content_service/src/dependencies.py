@@ -1,8 +1,10 @@
 import logging
 
+from core.config import settings
 from db.protocols import CacheStorageProtocol, SearchStorageProtocol
 from fastapi import Depends, HTTPException, Request, status
 from fastapi.security import OAuth2PasswordBearer
+from services.cache.response_cache import ResponseCache
 from services.films.films_service import FilmService
 from services.genres.genres_service import GenreService
 from services.global_search.search_service import SearchService
@@ -63,6 +65,16 @@ def get_search_service(
     )
 
 
+def get_response_cache(
+    cache: CacheStorageProtocol = Depends(get_redis_storage),
+) -> ResponseCache:
+    return ResponseCache(
+        cache=cache,
+        ttl=settings.response_cache_ttl,
+        enabled=settings.response_cache_enabled,
+    )
+
+
 async def get_current_principal(
     token: str | None = Depends(oauth2_scheme_optional),
     cache: CacheStorageProtocol = Depends(get_redis_storage),
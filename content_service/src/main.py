@@ -1,8 +1,9 @@
 import asyncio
 import logging
-from contextlib import asynccontextmanager
+from contextlib import asynccontextmanager, suppress
 from logging.config import dictConfig
 
+from api import health
 from api.v1 import films, genres, persons, ping, search
 from core.config import settings
 from core.logger import LOGGING
@@ -13,10 +14,11 @@ from fastapi.responses import ORJSONResponse
 from middleware.rate_limit import RateLimitMiddleware
 from middleware.request_id import RequestIDMiddleware
 from redis.asyncio import Redis
-from services.cache_builder import wait_for_elastic
+from services.cache.invalidation import CacheInvalidationListener
+from services.cache_builder import wait_for_backends
 
 # 👇 добавляем импорт для JWKS
-from utils.jwt import get_jwks
+from utils.jwt import keyring
 
 # --- Логирование ---
 dictConfig(LOGGING)
@@ -24,12 +26,13 @@ logger = logging.getLogger("app")
 
 
 async def jwks_refresher(cache: Redis, interval: int = 600):
-    """Фоновая задача для периодического обновления JWKS из Auth."""
+    """Фоновая задача для периодического обновления ключей JWKS из Auth."""
     logger.info(f"🚀 JWKS refresher запущен, интервал = {interval} сек.")
     while True:
         try:
-            jwks = await get_jwks(cache)
-            kids = [k.get("kid") for k in jwks.get("keys", [])]
+            # в обход auth:jwks: кэш мог пережить ротацию ключа в Auth
+            await keyring.refresh(cache, force=True)
+            kids = keyring.kids
             logger.info(
                 "✅ JWKS обновлён, ключей: %s, kids=%s",
                 len(kids),
@@ -42,6 +45,16 @@ async def jwks_refresher(cache: Redis, interval: int = 600):
             await asyncio.sleep(interval)
 
 
+async def wait_until_ready(app: FastAPI, timeout: float = 300):
+    """Фоновая задача: ждёт Redis и Elasticsearch и пишет в лог, когда они доступны."""
+    try:
+        await wait_for_backends(app.state.es_storage, app.state.redis_storage, timeout=timeout)
+        logger.info("✅ Redis и Elasticsearch доступны, сервис готов")
+    except RuntimeError as e:
+        # /health/ready продолжит проверять зависимости сам
+        logger.error(f"❌ {e}")
+
+
 @asynccontextmanager
 async def lifespan(app: FastAPI):
     # --- startup ---
@@ -52,18 +65,35 @@ async def lifespan(app: FastAPI):
         hosts=[f"http://{settings.elastic_host}:{settings.elastic_port}"]
     )
 
-    # ждём Elastic при старте
-    await wait_for_elastic(app.state.es_storage, timeout=60)
+    # клиенты подключаются лениво; старт не блокируем — готовность
+    # зависимостей проверяем в фоне с экспоненциальной задержкой
+    readiness_task = asyncio.create_task(wait_until_ready(app))
 
     # Запускаем фоновый обновитель JWKS
     task = asyncio.create_task(jwks_refresher(app.state.redis_storage, interval=600))
     app.state.jwks_refresher_task = task
     logger.info("✅ JWKS refresher task started")
 
+    # события каталога от ETL сбрасывают L1 этого воркера
+    invalidation_task = None
+    if settings.cache_invalidation_enabled:
+        invalidation_task = asyncio.create_task(
+            CacheInvalidationListener(app.state.redis_storage).run()
+        )
+
     yield  # здесь приложение доступно
 
     # --- shutdown ---
     logger.info("🛑 Остановка Content Service (lifespan.shutdown)")
+    readiness_task.cancel()
+    with suppress(asyncio.CancelledError):
+        await readiness_task
+    if invalidation_task is not None:
+        invalidation_task.cancel()
+        try:
+            await invalidation_task
+        except asyncio.CancelledError:
+            logger.info("✅ Cache invalidation listener cancelled")
     task.cancel()
     try:
         await task
@@ -107,3 +137,4 @@ app.include_router(films.router, prefix="/api/v1/films", tags=["films"])
 app.include_router(genres.router, prefix="/api/v1/genres", tags=["genres"])
 app.include_router(persons.router, prefix="/api/v1/persons", tags=["persons"])
 app.include_router(ping.router, prefix="/api/v1/ping", tags=["ping"])
+app.include_router(health.router, prefix="/health", tags=["health"])
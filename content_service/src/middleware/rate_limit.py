@@ -1,6 +1,5 @@
 import logging
-import time
-import uuid
+import math
 
 from core.logger import request_id_ctx
 from fastapi import Request, status
@@ -9,53 +8,95 @@ from starlette.middleware.base import BaseHTTPMiddleware
 
 logger = logging.getLogger("app")
 
+# GCRA: в Redis храним одно число — теоретическое время прихода (TAT)
+# следующего запроса. Решение принимается атомарно за один round trip.
+# Время берём из часов Redis (TIME), а не воркера: у всех воркеров одни
+# часы, и рассинхрон их системного времени не сдвигает лимит.
+# Возвращает {allowed, remaining, retry_after_ms, reset_ms}.
+GCRA_SCRIPT = """
+local time = redis.call('TIME')
+local now = tonumber(time[1]) * 1000 + math.floor(tonumber(time[2]) / 1000)
+local period = tonumber(ARGV[1])
+local limit = tonumber(ARGV[2])
+local interval = period / limit
+
+local tat = tonumber(redis.call('GET', KEYS[1])) or now
+if tat < now then
+    tat = now
+end
+
+local new_tat = tat + interval
+local allow_at = new_tat - period
+if now < allow_at then
+    return {0, 0, math.ceil(allow_at - now), math.ceil(tat - now)}
+end
+
+redis.call('SET', KEYS[1], new_tat, 'PX', math.ceil(new_tat - now))
+local remaining = math.floor((now - allow_at) / interval)
+return {1, remaining, 0, math.ceil(new_tat - now)}
+"""
+
+
+EXEMPT_PATH_PREFIXES = ("/health/",)
+
 
 class RateLimitMiddleware(BaseHTTPMiddleware):
     def __init__(self, app, max_requests: int = 5, window_seconds: int = 10):
         super().__init__(app)
         self.max_requests = max_requests
         self.window_seconds = window_seconds
+        self._script = None
 
     async def dispatch(self, request: Request, call_next):
         # 🔓 bypass для тестов
         if request.headers.get("X-Test-Bypass-Ratelimit") == "1":
             return await call_next(request)
 
+        # пробы оркестратора не лимитируем
+        if request.url.path.startswith(EXEMPT_PATH_PREFIXES):
+            return await call_next(request)
+
         redis = request.app.state.redis_storage
+        if self._script is None:
+            self._script = redis.register_script(GCRA_SCRIPT)
+
         client_ip = request.client.host or "unknown"
-        key = f"rate_limit:{client_ip}"
-        now = int(time.time() * 1000)  # ⚡ миллисекунды
+        key = f"rate_limit:gcra:{client_ip}"
         window_ms = self.window_seconds * 1000
         request_id = request_id_ctx.get()
 
-        # 🧹 очищаем старые записи
-        await redis.zremrangebyscore(key, 0, now - window_ms)
-
-        # добавляем текущий запрос
-        member = f"{client_ip}:{uuid.uuid4()}"
-        await redis.zadd(key, {member: now})
-        await redis.expire(key, self.window_seconds)
+        allowed, remaining, retry_after_ms, reset_ms = await self._script(
+            keys=[key], args=[window_ms, self.max_requests]
+        )
 
-        # считаем сколько запросов в окне
-        req_count = await redis.zcard(key)
-        members = await redis.zrange(key, 0, -1, withscores=True)
+        headers = {
+            "X-RateLimit-Limit": str(self.max_requests),
+            "X-RateLimit-Remaining": str(remaining),
+            "X-RateLimit-Reset": str(math.ceil(reset_ms / 1000)),
+        }
 
-        logger.info(
-            f"📊 RateLimit: ip={client_ip},"
-            f" count={req_count}/{self.max_requests}, "
-            f"now={now}, members={members}, [id={request_id}]"
+        logger.debug(
+            "📊 RateLimit: ip=%s, allowed=%s, remaining=%s [id=%s]",
+            client_ip,
+            allowed,
+            remaining,
+            request_id,
         )
 
-        if req_count > self.max_requests:
+        if not allowed:
+            retry_after = max(1, math.ceil(retry_after_ms / 1000))
             logger.warning(
-                f"⛔ Rate limit exceeded for "
-                f"{client_ip}: "
-                f"{req_count}/{self.max_requests}"
-                f" [id={request_id}]"
+                "⛔ Rate limit exceeded for %s, retry after %ss [id=%s]",
+                client_ip,
+                retry_after,
+                request_id,
             )
             return JSONResponse(
                 {"detail": "Too Many Requests"},
                 status_code=status.HTTP_429_TOO_MANY_REQUESTS,
+                headers={**headers, "Retry-After": str(retry_after)},
             )
 
-        return await call_next(request)
+        response = await call_next(request)
+        response.headers.update(headers)
+        return response
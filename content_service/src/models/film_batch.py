@@ -0,0 +1,18 @@
+from uuid import UUID
+
+from models.film import Film
+from pydantic import BaseModel
+
+
+class FilmsBatch(BaseModel):
+    """
+    Ответ пакетного запроса фильмов.
+
+    Attributes:
+        films (list[Optional[Film]]): фильмы в порядке запрошенных UUID,
+            null на месте ненайденного фильма.
+        missing (list[UUID]): UUID, для которых фильм не найден.
+    """
+
+    films: list[Film | None] = []
+    missing: list[UUID] = []
@@ -0,0 +1,16 @@
+from models.film_short import FilmShort
+from pydantic import BaseModel
+
+
+class FilmsPage(BaseModel):
+    """
+    Страница списка фильмов при курсорной пагинации.
+
+    Attributes:
+        items (list[FilmShort]): фильмы страницы.
+        next_cursor (Optional[str]): курсор следующей страницы,
+            None — если страница последняя.
+    """
+
+    items: list[FilmShort] = []
+    next_cursor: str | None = None
@@ -0,0 +1,16 @@
+from models.genre import Genre
+from pydantic import BaseModel
+
+
+class GenresPage(BaseModel):
+    """
+    Страница справочника жанров при курсорной пагинации.
+
+    Attributes:
+        items (list[Genre]): жанры страницы.
+        next_cursor (Optional[str]): курсор следующей страницы,
+            None — если страница последняя.
+    """
+
+    items: list[Genre] = []
+    next_cursor: str | None = None
@@ -0,0 +1,16 @@
+from models.person import Person
+from pydantic import BaseModel
+
+
+class PersonsPage(BaseModel):
+    """
+    Страница справочника персон при курсорной пагинации.
+
+    Attributes:
+        items (list[Person]): персоны страницы.
+        next_cursor (Optional[str]): курсор следующей страницы,
+            None — если страница последняя.
+    """
+
+    items: list[Person] = []
+    next_cursor: str | None = None
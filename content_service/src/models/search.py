@@ -8,3 +8,5 @@ class SearchResults(BaseModel):
     films: list[FilmShort] = []
     persons: list[Person] = []
     genres: list[Genre] = []
+    # секции, не успевшие к дедлайну: их списки пустые, ответ не кэшируется
+    partial: list[str] = []
@@ -1,34 +1,156 @@
-import json
+import asyncio
+import logging
+import time
 from collections.abc import Awaitable, Callable
 from typing import Any, TypeVar
 
+from core.config import settings
 from db.es_storage import ElasticsearchStorage
 from db.redis_storage import RedisStorage
+from elasticsearch import NotFoundError
+from services.cache.codecs import CacheCodec, cache_codec
+from services.cache.entry import NOT_FOUND, CacheEntry
+from services.cache.invalidation import collect_ids, tag_entry
+from services.cache.local_cache import MISSING, LocalCache, local_cache
+from services.cache.rebuild_lock import RebuildLock
+from services.cache.single_flight import single_flight
 
 T = TypeVar("T")
 
+LOCK_POLL_INTERVAL = 0.05
+
+logger = logging.getLogger("app")
+
+# Ссылки на фоновые обновления, чтобы задачи не собрал GC
+_background_tasks: set[asyncio.Task] = set()
+
 
 class BaseService:
-    def __init__(self, cache: RedisStorage, search: ElasticsearchStorage, ttl: int = 3):
+    def __init__(
+        self,
+        cache: RedisStorage,
+        search: ElasticsearchStorage,
+        ttl: int = 3,
+        stale_ttl: int = 0,
+        early_refresh_beta: float = 0.0,
+        local: LocalCache | None = None,
+        codec: CacheCodec | None = None,
+    ):
         self.cache = cache
         self.search = search
         self.ttl = ttl
+        self.stale_ttl = stale_ttl
+        self.early_refresh_beta = early_refresh_beta
+        self.local = local if local is not None else local_cache
+        self.codec = codec if codec is not None else cache_codec
+        self.flights = single_flight
+        self.use_rebuild_lock = settings.cache_lock_enabled
+        self.negative_ttl = settings.cache_negative_ttl
+        self.tag_entries = settings.cache_invalidation_enabled
 
     async def get_cache(self, key: str) -> Any | None:
-        cached = await self.cache.get(key)
+        entry = await self.get_cache_entry(key)
+        if entry is None or entry.is_negative:
+            return None
+        return entry.value
+
+    async def get_cache_entry(self, key: str) -> CacheEntry | None:
+        return self._decode_entry(key, await self.cache.get(key))
+
+    async def set_cache(self, key: str, value: Any, delta: float = 0.0) -> None:
+        if hasattr(value, "model_dump"):
+            value = value.model_dump(mode="json")
+        to_store, ex = self._encode_entry(value, delta)
+        ids = self._entry_ids(value)
+        if not ids:
+            await self.cache.set(key, to_store, ex=ex)
+            return
+
+        pipe = self.cache.pipeline(transaction=False)
+        pipe.set(key, to_store, ex=ex)
+        tag_entry(pipe, key, ids, ex)
+        await pipe.execute()
+
+    def _entry_ids(self, value: Any) -> set[str]:
+        # по этим uuid событие каталога найдёт ключ (services/cache/invalidation.py)
+        return collect_ids(value) if self.tag_entries and value is not None else set()
+
+    def _decode_entry(self, key: str, cached: bytes | None) -> CacheEntry | None:
         if cached:
             try:
-                return json.loads(cached)  # словарь / список
-            except Exception:
-                return cached  # Pydantic raw или строка
+                raw = self.codec.decode(cached)
+            except Exception as e:
+                logger.warning("Не удалось декодировать кэш %s: %s", key, e)
+                return None
+            entry = CacheEntry.load(raw)
+            if entry.value is not None:
+                return entry
         return None
 
-    async def set_cache(self, key: str, value: Any) -> None:
-        if hasattr(value, "json"):
-            to_store = value.json()
-        else:
-            to_store = json.dumps(value, default=str)
-        await self.cache.set(key, to_store, ex=self.ttl)
+    def _encode_entry(self, value: Any, delta: float = 0.0) -> tuple[bytes, int]:
+        if value is None:
+            # «не найдено» кэшируем отдельным маркером и на свой, более короткий срок
+            entry = CacheEntry(value=NOT_FOUND, expires_at=time.time() + self.negative_ttl)
+            return self.codec.encode(entry.dump()), self.negative_ttl
+
+        if hasattr(value, "model_dump"):
+            value = value.model_dump(mode="json")
+        entry = CacheEntry(value=value, expires_at=time.time() + self.ttl, delta=delta)
+        # жёсткий TTL в Redis = мягкий TTL + окно, когда отдаём устаревшее
+        return self.codec.encode(entry.dump()), self.ttl + self.stale_ttl
+
+    async def get_many_or_set_cache(
+        self,
+        keys: list[str],
+        fetch_many_fn: Callable[[list[str]], Awaitable[list[T | None]]],
+        serializer: Callable[[T], Any] | None = None,
+        deserializer: Callable[[Any], T] | None = None,
+    ) -> list[T | None]:
+        """
+        Пакетный get_or_set_cache.
+
+        L1 → один MGET на все ключи → один fetch_many_fn на все промахи
+        (значения в порядке переданных ключей) → запись промахов одним
+        pipeline. Результат — в порядке keys.
+        """
+        found: dict[str, T | None] = {}
+        pending = []
+        # повторы в keys запрашиваем один раз
+        for key in dict.fromkeys(keys):
+            local = self.local.get(key)
+            if local is MISSING:
+                pending.append(key)
+            else:
+                found[key] = local
+
+        misses = []
+        if pending:
+            for key, cached in zip(pending, await self.cache.mget(pending), strict=True):
+                entry = self._decode_entry(key, cached)
+                if entry is None:
+                    misses.append(key)
+                    continue
+                found[key] = self._unwrap(entry, deserializer)
+                self.local.set(key, found[key], entry.ttl_left)
+
+        if misses:
+            started = time.monotonic()
+            fetched = await fetch_many_fn(misses)
+            delta = time.monotonic() - started
+
+            pipe = self.cache.pipeline(transaction=False)
+            for key, data in zip(misses, fetched, strict=True):
+                value = serializer(data) if serializer else data
+                if hasattr(value, "model_dump"):
+                    value = value.model_dump(mode="json")
+                to_store, ex = self._encode_entry(value, delta)
+                pipe.set(key, to_store, ex=ex)
+                tag_entry(pipe, key, self._entry_ids(value), ex)
+                found[key] = data
+                self.local.set(key, data, self.ttl if data is not None else self.negative_ttl)
+            await pipe.execute()
+
+        return [found[key] for key in keys]
 
     async def get_or_set_cache(
         self,
@@ -37,25 +159,124 @@ class BaseService:
         serializer: Callable[[T], Any] | None = None,
         deserializer: Callable[[Any], T] | None = None,
     ) -> T:
-        cached = await self.get_cache(key)
+        # L1: готовый объект из памяти воркера
+        local = self.local.get(key)
+        if local is not MISSING:
+            return local
 
-        if cached is not None:
-            if deserializer:
-                return deserializer(cached)
-            return cached
+        entry = await self.get_cache_entry(key)
 
-        data = await fetch_fn()
+        if entry is not None:
+            data = self._unwrap(entry, deserializer)
+            if entry.should_refresh(self.early_refresh_beta):
+                # отдаём то, что есть, а обновляем в фоне
+                self._refresh_in_background(key, fetch_fn, serializer, deserializer)
+            else:
+                self.local.set(key, data, entry.ttl_left)
+            return data
 
-        to_cache = serializer(data) if serializer else data
-        await self.set_cache(key, to_cache)
+        # Один запрос в ES на ключ внутри воркера, остальные ждут его
+        return await self.flights.do(
+            key, lambda: self._rebuild(key, fetch_fn, serializer, deserializer)
+        )
+
+    def _refresh_in_background(
+        self,
+        key: str,
+        fetch_fn: Callable[[], Awaitable[T]],
+        serializer: Callable[[T], Any] | None,
+        deserializer: Callable[[Any], T] | None,
+    ) -> None:
+        async def refresh() -> None:
+            try:
+                await self.flights.do(
+                    f"refresh:{key}",
+                    lambda: self._rebuild(key, fetch_fn, serializer, deserializer, wait=False),
+                )
+            except Exception as e:
+                logger.warning("Фоновое обновление кэша %s не удалось: %s", key, e)
+
+        task = asyncio.create_task(refresh())
+        _background_tasks.add(task)
+        task.add_done_callback(_background_tasks.discard)
+
+    async def _rebuild(
+        self,
+        key: str,
+        fetch_fn: Callable[[], Awaitable[T]],
+        serializer: Callable[[T], Any] | None,
+        deserializer: Callable[[Any], T] | None,
+        wait: bool = True,
+    ) -> T | None:
+        lock = RebuildLock(self.cache, key, settings.cache_lock_ttl)
+        if self.use_rebuild_lock and not await lock.acquire():
+            if not wait:
+                # фоновое обновление уже делает другой воркер
+                return None
+            # ключ уже перестраивает другой воркер — ждём его результат
+            entry = await self._wait_for_cache(key, settings.cache_lock_wait)
+            if entry is not None:
+                data = self._unwrap(entry, deserializer)
+                self.local.set(key, data, entry.ttl_left)
+                return data
+
+        try:
+            started = time.monotonic()
+            data = await fetch_fn()
+            delta = time.monotonic() - started
+
+            to_cache = serializer(data) if serializer else data
+            await self.set_cache(key, to_cache, delta=delta)
+        finally:
+            await lock.release()
+
+        self.local.set(key, data, self.ttl if data is not None else self.negative_ttl)
 
         return data
 
-    async def search_index(self, index: str, body: dict) -> dict:
-        return await self.search.search(index=index, body=body)
+    @staticmethod
+    def _unwrap(entry: CacheEntry, deserializer: Callable[[Any], T] | None) -> T | None:
+        if entry.is_negative:
+            return None
+        return deserializer(entry.value) if deserializer else entry.value
+
+    async def _wait_for_cache(self, key: str, timeout: float) -> CacheEntry | None:
+        deadline = time.monotonic() + timeout
+        while time.monotonic() < deadline:
+            await asyncio.sleep(LOCK_POLL_INTERVAL)
+            entry = await self.get_cache_entry(key)
+            if entry is not None:
+                return entry
+        return None
+
+    async def search_index(self, index: str, body: dict, filter_path: str | None = None) -> dict:
+        # filter_path отрезает лишнее из ответа ещё на стороне ES
+        params = {"filter_path": filter_path} if filter_path else {}
+        if "pit" in body:
+            # индекс уже зафиксирован в point-in-time, ES не принимает его повторно
+            return await self.search.search(body=body, **params)
+        return await self.search.search(index=index, body=body, **params)
+
+    async def open_pit(self, index: str, keep_alive: str) -> str:
+        resp = await self.search.open_point_in_time(index=index, keep_alive=keep_alive)
+        return resp["id"]
+
+    async def close_pit(self, pit_id: str) -> None:
+        try:
+            await self.search.close_point_in_time(body={"id": pit_id})
+        except NotFoundError:
+            pass  # уже истёк или закрыт другим клиентом
+
+    async def mget_by_ids(self, index: str, doc_ids: list[str]) -> list[dict]:
+        """Документы одним _mget, в порядке doc_ids; ненайденные — с found=False."""
+        resp = await self.search.mget(index=index, body={"ids": doc_ids})
+        return resp["docs"]
 
-    async def get_by_id(self, index: str, doc_id: str) -> dict:
-        return await self.search.get(index=index, id=doc_id)
+    async def get_by_id(self, index: str, doc_id: str) -> dict | None:
+        try:
+            return await self.search.get(index=index, id=doc_id)
+        except NotFoundError:
+            return None
 
     def make_cache_key(self, prefix: str, **kwargs) -> str:
         parts = [f"{k}={v}" for k, v in kwargs.items()]
@@ -0,0 +1,188 @@
+import json
+from typing import Any, Protocol
+
+import orjson
+from core.config import settings
+
+try:
+    import msgpack
+except ImportError:  # pragma: no cover
+    msgpack = None
+
+try:
+    import zstandard
+except ImportError:  # pragma: no cover
+    zstandard = None
+
+try:
+    import lz4.frame as lz4_frame
+except ImportError:  # pragma: no cover
+    lz4_frame = None
+
+# Первый байт значения в новом формате. JSON-текст (старый формат)
+# никогда с него не начинается, поэтому форматы различимы.
+MAGIC = 0x00
+HEADER_SIZE = 3  # MAGIC + id кодека + id сжатия
+
+
+class Codec(Protocol):
+    """Сериализация значения кэша в байты и обратно."""
+
+    id: int
+    name: str
+
+    def dumps(self, value: Any) -> bytes: ...
+
+    def loads(self, data: bytes) -> Any: ...
+
+
+class Compressor(Protocol):
+    """Сжатие сериализованного значения."""
+
+    id: int
+    name: str
+
+    def compress(self, data: bytes) -> bytes: ...
+
+    def decompress(self, data: bytes) -> bytes: ...
+
+
+class JsonCodec:
+    id = 0
+    name = "json"
+
+    def dumps(self, value: Any) -> bytes:
+        return json.dumps(value, default=str).encode()
+
+    def loads(self, data: bytes) -> Any:
+        return json.loads(data)
+
+
+class OrjsonCodec:
+    id = 1
+    name = "orjson"
+
+    def dumps(self, value: Any) -> bytes:
+        return orjson.dumps(value, default=str)
+
+    def loads(self, data: bytes) -> Any:
+        return orjson.loads(data)
+
+
+class MsgpackCodec:
+    id = 2
+    name = "msgpack"
+
+    def __init__(self):
+        if msgpack is None:
+            raise RuntimeError("Кодек msgpack недоступен: пакет msgpack не установлен")
+
+    def dumps(self, value: Any) -> bytes:
+        return msgpack.packb(value, default=str, use_bin_type=True)
+
+    def loads(self, data: bytes) -> Any:
+        return msgpack.unpackb(data, raw=False)
+
+
+class ZstdCompressor:
+    id = 1
+    name = "zstd"
+
+    def __init__(self, level: int = 3):
+        if zstandard is None:
+            raise RuntimeError("Сжатие zstd недоступно: пакет zstandard не установлен")
+        self._compressor = zstandard.ZstdCompressor(level=level)
+        self._decompressor = zstandard.ZstdDecompressor()
+
+    def compress(self, data: bytes) -> bytes:
+        return self._compressor.compress(data)
+
+    def decompress(self, data: bytes) -> bytes:
+        return self._decompressor.decompress(data)
+
+
+class Lz4Compressor:
+    id = 2
+    name = "lz4"
+
+    def __init__(self):
+        if lz4_frame is None:
+            raise RuntimeError("Сжатие lz4 недоступно: пакет lz4 не установлен")
+
+    def compress(self, data: bytes) -> bytes:
+        return lz4_frame.compress(data)
+
+    def decompress(self, data: bytes) -> bytes:
+        return lz4_frame.decompress(data)
+
+
+CODECS: dict[str, type[Codec]] = {c.name: c for c in (JsonCodec, OrjsonCodec, MsgpackCodec)}
+COMPRESSORS: dict[str, type[Compressor]] = {c.name: c for c in (ZstdCompressor, Lz4Compressor)}
+
+
+class CacheCodec:
+    """
+    Кодирование значений кэша с заголовком [MAGIC, codec_id, compression_id].
+
+    Пишем всегда настроенным кодеком, а читаем любым известным — по id
+    из заголовка, поэтому во время раскатки разные версии сосуществуют.
+    Значения без заголовка считаем старым JSON-форматом.
+    """
+
+    def __init__(self, codec: str = "orjson", compression: str = "none", threshold: int = 1024):
+        if codec not in CODECS:
+            raise ValueError(f"Неизвестный кодек кэша: {codec}")
+        if compression != "none" and compression not in COMPRESSORS:
+            raise ValueError(f"Неизвестный алгоритм сжатия кэша: {compression}")
+
+        self.codec = CODECS[codec]()
+        self.compressor = COMPRESSORS[compression]() if compression != "none" else None
+        self.threshold = threshold
+        self._codecs: dict[int, Codec] = {self.codec.id: self.codec}
+        self._compressors: dict[int, Compressor] = {}
+        if self.compressor is not None:
+            self._compressors[self.compressor.id] = self.compressor
+
+    def encode(self, value: Any) -> bytes:
+        payload = self.codec.dumps(value)
+        compression_id = 0
+        if self.compressor is not None and len(payload) >= self.threshold:
+            payload = self.compressor.compress(payload)
+            compression_id = self.compressor.id
+        return bytes((MAGIC, self.codec.id, compression_id)) + payload
+
+    def decode(self, data: bytes | str) -> Any:
+        if isinstance(data, str):
+            data = data.encode()
+
+        if not data or data[0] != MAGIC:
+            return json.loads(data)  # старый формат
+
+        codec_id, compression_id = data[1], data[2]
+        payload = data[HEADER_SIZE:]
+        if compression_id:
+            payload = self._get_compressor(compression_id).decompress(payload)
+        return self._get_codec(codec_id).loads(payload)
+
+    def _get_codec(self, codec_id: int) -> Codec:
+        if codec_id not in self._codecs:
+            cls = next((c for c in CODECS.values() if c.id == codec_id), None)
+            if cls is None:
+                raise ValueError(f"Неизвестный id кодека в кэше: {codec_id}")
+            self._codecs[codec_id] = cls()
+        return self._codecs[codec_id]
+
+    def _get_compressor(self, compression_id: int) -> Compressor:
+        if compression_id not in self._compressors:
+            cls = next((c for c in COMPRESSORS.values() if c.id == compression_id), None)
+            if cls is None:
+                raise ValueError(f"Неизвестный id сжатия в кэше: {compression_id}")
+            self._compressors[compression_id] = cls()
+        return self._compressors[compression_id]
+
+
+cache_codec = CacheCodec(
+    codec=settings.cache_codec,
+    compression=settings.cache_compression,
+    threshold=settings.cache_compression_threshold,
+)
@@ -0,0 +1,64 @@
+import math
+import random
+import time
+from dataclasses import dataclass
+from typing import Any
+
+ENVELOPE_KEYS = {"v", "exp", "delta"}
+
+# Маркер закэшированного промаха (фильм/жанр/персона не найдены)
+NOT_FOUND = "__not_found__"
+
+
+@dataclass(slots=True)
+class CacheEntry:
+    """
+    Значение кэша с мягким сроком жизни.
+
+    Attributes:
+        value: закэшированное значение (после serializer).
+        expires_at: мягкое истечение (unix time); после него значение
+            ещё отдаётся, но уже считается устаревшим.
+        delta: сколько секунд заняло построение значения (для XFetch).
+    """
+
+    value: Any
+    expires_at: float = math.inf
+    delta: float = 0.0
+
+    @property
+    def is_stale(self) -> bool:
+        return time.time() >= self.expires_at
+
+    @property
+    def is_negative(self) -> bool:
+        return self.value == NOT_FOUND
+
+    @property
+    def ttl_left(self) -> float:
+        return self.expires_at - time.time()
+
+    def should_refresh(self, beta: float = 0.0) -> bool:
+        """
+        Пора ли перестраивать значение.
+
+        При beta > 0 используется вероятностное раннее истечение (XFetch):
+        чем ближе мягкий срок и чем дороже пересчёт, тем выше шанс
+        обновить значение заранее, так что обновления размазываются
+        во времени, а не приходятся на момент истечения.
+        """
+        now = time.time()
+        if beta > 0 and self.delta > 0:
+            # log(1 - random()) <= 0, поэтому «сдвигаем» текущее время вперёд
+            now -= self.delta * beta * math.log(1.0 - random.random())
+        return now >= self.expires_at
+
+    def dump(self) -> dict:
+        return {"v": self.value, "exp": self.expires_at, "delta": self.delta}
+
+    @classmethod
+    def load(cls, raw: Any) -> "CacheEntry":
+        """Разобрать конверт; старые значения без конверта считаем свежими."""
+        if isinstance(raw, dict) and raw.keys() == ENVELOPE_KEYS:
+            return cls(value=raw["v"], expires_at=raw["exp"], delta=raw["delta"])
+        return cls(value=raw)
@@ -0,0 +1,123 @@
+import asyncio
+import json
+import logging
+import re
+import time
+from collections.abc import Iterable
+from typing import Any
+
+from core.config import settings
+from services.cache.local_cache import LocalCache, local_cache
+
+logger = logging.getLogger("app")
+
+# ZSET вместо прежних SET tag:<uuid>: другой префикс, чтобы не ловить WRONGTYPE на старых ключах
+TAG_PREFIX = "ztag"
+UUID_RE = re.compile(rb"[0-9a-f]{8}-[0-9a-f]{4}-[0-9a-f]{4}-[0-9a-f]{4}-[0-9a-f]{12}")
+
+
+def tag_key(entity_id: str) -> str:
+    """ZSET ключей кэша, в значениях которых встречается entity_id; score — срок жизни ключа."""
+    return f"{TAG_PREFIX}:{entity_id}"
+
+
+def collect_ids(value: Any) -> set[str]:
+    """
+    UUID фильмов, персон и жанров внутри значения кэша (все поля uuid).
+
+    UUID уникальны между сущностями, поэтому тип сущности тегу не нужен:
+    карточка фильма помечается и своими жанрами, и персонами.
+    """
+    ids: set[str] = set()
+    stack = [value]
+    while stack:
+        item = stack.pop()
+        if isinstance(item, dict):
+            if item.get("uuid") is not None:
+                ids.add(str(item["uuid"]))
+            stack.extend(item.values())
+        elif isinstance(item, list | tuple):
+            stack.extend(item)
+    return ids
+
+
+def body_ids(body: bytes) -> set[str]:
+    """UUID в готовом JSON-ответе — без его разбора."""
+    return {match.decode() for match in UUID_RE.findall(body)}
+
+
+def tag_entry(pipe, key: str, ids: Iterable[str], ex: int) -> None:
+    """
+    Добавляет в pipeline привязку key к тегам ids.
+
+    Score участника — момент, когда истечёт сам key: при каждой записи
+    из тега вычищаются уже истёкшие ключи, поэтому популярный тег, который
+    постоянно продлевается, не копит мёртвые ключи. Тег живёт не меньше
+    самой долгой своей записи: NX ставит срок новому множеству, GT только
+    продлевает существующий.
+    """
+    now = time.time()
+    for entity_id in ids:
+        tag = tag_key(entity_id)
+        pipe.zadd(tag, {key: now + ex})
+        pipe.zremrangebyscore(tag, "-inf", now)
+        pipe.expire(tag, ex, nx=True)
+        pipe.expire(tag, ex, gt=True)
+
+
+class CacheInvalidationListener:
+    """
+    Читает поток изменений каталога и сбрасывает L1 воркера.
+
+    Ключи в Redis удаляет публикатор (ETL / outbox-потребитель) один раз
+    на флот; в событии приходит их список, и каждый воркер убирает те же
+    ключи из своего in-process кэша. Поток читается с позиции старта
+    воркера: L1 в этот момент пуст, пропускать нечего.
+    """
+
+    def __init__(
+        self,
+        redis,
+        local: LocalCache | None = None,
+        stream: str | None = None,
+        block_ms: int = 5000,
+    ):
+        self.redis = redis
+        self.local = local if local is not None else local_cache
+        self.stream = stream or settings.cache_changes_stream
+        self.block_ms = block_ms
+        self.last_id: bytes | str | None = None
+
+    def apply(self, fields: dict) -> int:
+        keys = json.loads(fields.get(b"keys") or fields.get("keys") or "[]")
+        for key in keys:
+            self.local.delete(key)
+        return len(keys)
+
+    async def _tail_id(self) -> bytes | str:
+        # "$" в каждом XREAD терял бы события между вызовами — фиксируем позицию
+        last = await self.redis.xrevrange(self.stream, count=1)
+        return last[0][0] if last else "0-0"
+
+    async def read_once(self) -> int:
+        if self.last_id is None:
+            self.last_id = await self._tail_id()
+        resp = await self.redis.xread({self.stream: self.last_id}, block=self.block_ms, count=100)
+        evicted = 0
+        for _, entries in resp or []:
+            for entry_id, fields in entries:
+                self.last_id = entry_id
+                evicted += self.apply(fields)
+        return evicted
+
+    async def run(self) -> None:
+        while True:
+            try:
+                evicted = await self.read_once()
+                if evicted:
+                    logger.debug("🧹 Инвалидация: из L1 убрано %s ключей", evicted)
+            except asyncio.CancelledError:
+                raise
+            except Exception as e:
+                logger.warning("Поток инвалидации недоступен: %s", e)
+                await asyncio.sleep(1)
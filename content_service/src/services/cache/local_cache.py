@@ -0,0 +1,69 @@
+import time
+from collections import OrderedDict
+from typing import Any
+
+from core.config import settings
+
+# Маркер промаха: None — валидное закэшированное значение
+MISSING = object()
+
+
+class LocalCache:
+    """
+    Ограниченный LRU-кэш в памяти процесса (L1 перед Redis).
+
+    Хранит уже десериализованные объекты, поэтому попадание не требует
+    ни сетевого запроса, ни json.loads. Размер ограничен числом записей,
+    у каждой записи свой срок жизни.
+    """
+
+    def __init__(self, max_entries: int = 10_000, ttl: float = 5.0):
+        self.max_entries = max_entries
+        self.ttl = ttl
+        self._data: OrderedDict[str, tuple[float, Any]] = OrderedDict()
+
+    @property
+    def enabled(self) -> bool:
+        return self.max_entries > 0 and self.ttl > 0
+
+    def get(self, key: str) -> Any:
+        """Вернуть значение или MISSING, если записи нет или она протухла."""
+        item = self._data.get(key)
+        if item is None:
+            return MISSING
+
+        expires_at, value = item
+        if expires_at <= time.monotonic():
+            del self._data[key]
+            return MISSING
+
+        self._data.move_to_end(key)
+        return value
+
+    def set(self, key: str, value: Any, ttl: float | None = None) -> None:
+        """Сохранить значение; TTL не больше глобального L1 TTL."""
+        if not self.enabled:
+            return
+
+        ttl = self.ttl if ttl is None else min(ttl, self.ttl)
+        self._data[key] = (time.monotonic() + ttl, value)
+        self._data.move_to_end(key)
+
+        while len(self._data) > self.max_entries:
+            self._data.popitem(last=False)
+
+    def delete(self, key: str) -> None:
+        self._data.pop(key, None)
+
+    def clear(self) -> None:
+        self._data.clear()
+
+    def __len__(self) -> int:
+        return len(self._data)
+
+
+# Один L1-кэш на воркер: сервисы создаются на каждый запрос
+local_cache = LocalCache(
+    max_entries=settings.cache_l1_max_entries,
+    ttl=settings.cache_l1_ttl,
+)
@@ -0,0 +1,34 @@
+import uuid
+
+# Удаляем лок, только если он всё ещё наш (мог истечь и достаться другому)
+RELEASE_SCRIPT = """
+if redis.call('get', KEYS[1]) == ARGV[1] then
+    return redis.call('del', KEYS[1])
+end
+return 0
+"""
+
+
+class RebuildLock:
+    """
+    Распределённый лок в Redis на перестроение одного ключа кэша.
+
+    Гарантирует, что по всему флоту Elasticsearch-запрос за ключом
+    делает только один воркер; лок ограничен TTL на случай его падения.
+    """
+
+    def __init__(self, redis, key: str, ttl: int):
+        self.redis = redis
+        self.key = f"lock:{key}"
+        self.ttl = ttl
+        self.token = uuid.uuid4().hex
+        self.acquired = False
+
+    async def acquire(self) -> bool:
+        self.acquired = bool(await self.redis.set(self.key, self.token, nx=True, ex=self.ttl))
+        return self.acquired
+
+    async def release(self) -> None:
+        if self.acquired:
+            await self.redis.eval(RELEASE_SCRIPT, 1, self.key, self.token)
+            self.acquired = False
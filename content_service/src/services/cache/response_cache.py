@@ -0,0 +1,157 @@
+import json
+from collections.abc import Awaitable, Callable
+from functools import lru_cache
+from typing import Any
+
+from core.config import settings
+from fastapi import Request, Response
+from fastapi.dependencies.utils import get_flat_dependant
+from fastapi.routing import APIRoute
+from pydantic import TypeAdapter
+from services.cache.invalidation import body_ids, tag_entry
+from services.cache.local_cache import MISSING, LocalCache, local_cache
+
+RESPONSE_KEY_PREFIX = "response"
+MEDIA_TYPE = "application/json"
+# ответ с дополнительными заголовками: MAGIC + JSON заголовков + \n + тело
+HEADERS_MAGIC = b"\x00"
+DECLARED_PARAMS_ATTR = "_response_cache_params"
+
+
+@lru_cache(maxsize=64)
+def _adapter(response_model: Any) -> TypeAdapter:
+    return TypeAdapter(response_model)
+
+
+def _declared_params(route: APIRoute) -> frozenset[str]:
+    # query-параметры роута вместе с параметрами его зависимостей;
+    # считаем один раз и храним на самом роуте (APIRoute не хэшируется)
+    params = getattr(route, DECLARED_PARAMS_ATTR, None)
+    if params is None:
+        flat = get_flat_dependant(route.dependant)
+        params = frozenset(field.alias for field in flat.query_params)
+        setattr(route, DECLARED_PARAMS_ATTR, params)
+    return params
+
+
+def make_response_key(request: Request) -> str:
+    """
+    Ключ ответа: путь + отсортированные query-параметры.
+
+    В ключ попадают только параметры, объявленные у роута: лишние
+    (?x=<random>) на ответ не влияют и не должны обходить кэш.
+    """
+    params = request.query_params.multi_items()
+    route = request.scope.get("route")
+    if isinstance(route, APIRoute):
+        declared = _declared_params(route)
+        params = [(k, v) for k, v in params if k in declared]
+    query = "&".join(f"{k}={v}" for k, v in sorted(params))
+    return f"{RESPONSE_KEY_PREFIX}:{request.url.path}?{query}"
+
+
+class ResponseCache:
+    """
+    Кэш готовых JSON-ответов API.
+
+    Хранит итоговые байты ответа в Redis (и в L1), поэтому при попадании
+    не выполняется ни json.loads, ни построение Pydantic-моделей, ни
+    повторная сериализация — байты сразу уходят клиенту.
+    """
+
+    def __init__(
+        self,
+        cache,
+        ttl: int = 10,
+        enabled: bool = True,
+        local: LocalCache | None = None,
+    ):
+        self.cache = cache
+        self.ttl = ttl
+        self.enabled = enabled
+        self.local = local if local is not None else local_cache
+
+    async def get(self, key: str) -> tuple[bytes, dict[str, str]] | None:
+        raw = self.local.get(key)
+        if raw is MISSING:
+            raw = await self.cache.get(key)
+            if raw is None:
+                return None
+            self.local.set(key, raw, self.ttl)
+        return self._unpack(raw)
+
+    async def set(self, key: str, body: bytes, headers: dict[str, str] | None = None) -> None:
+        raw = self._pack(body, headers)
+        ids = body_ids(body) if settings.cache_invalidation_enabled else set()
+        if ids:
+            pipe = self.cache.pipeline(transaction=False)
+            pipe.set(key, raw, ex=self.ttl)
+            tag_entry(pipe, key, ids, self.ttl)
+            await pipe.execute()
+        else:
+            await self.cache.set(key, raw, ex=self.ttl)
+        self.local.set(key, raw, self.ttl)
+
+    async def render(
+        self,
+        request: Request,
+        response_model: Any,
+        producer: Callable[[], Awaitable[Any]],
+        content: Callable[[Any], Any] | None = None,
+        headers: Callable[[Any], dict[str, str]] | None = None,
+        cacheable: Callable[[Any], bool] | None = None,
+    ) -> Response | None:
+        """
+        Вернуть закэшированный ответ или построить его через producer.
+
+        Если producer вернул None (например, фильм не найден), ответ
+        не кэшируется и возвращается None — 404 формирует роутер.
+        content достаёт тело ответа из результата producer, headers —
+        заголовки (например, курсор следующей страницы); заголовки
+        кэшируются вместе с телом. cacheable(data) == False — ответ
+        отдаётся, но не кэшируется (например, неполный результат поиска).
+        """
+        key = make_response_key(request) if self.enabled else None
+        if key is not None:
+            cached = await self.get(key)
+            if cached is not None:
+                body, extra = cached
+                return self._to_response(body, extra, hit=True)
+
+        data = await producer()
+        if data is None:
+            return None
+
+        body = self._dump(response_model, content(data) if content else data)
+        extra = {k: v for k, v in (headers(data) if headers else {}).items() if v is not None}
+        if key is not None and (cacheable is None or cacheable(data)):
+            await self.set(key, body, extra)
+        return self._to_response(body, extra)
+
+    @staticmethod
+    def _dump(response_model: Any, data: Any) -> bytes:
+        # та же схема, что и у response_model роутера
+        adapter = _adapter(response_model)
+        return adapter.dump_json(adapter.validate_python(data))
+
+    @staticmethod
+    def _pack(body: bytes, headers: dict[str, str] | None) -> bytes:
+        if not headers:
+            return body
+        return HEADERS_MAGIC + json.dumps(headers).encode() + b"\n" + body
+
+    @staticmethod
+    def _unpack(raw: bytes) -> tuple[bytes, dict[str, str]]:
+        # тело JSON-ответа не начинается с \x00 — старые записи читаются как есть
+        if not raw.startswith(HEADERS_MAGIC):
+            return raw, {}
+        headers, _, body = raw[len(HEADERS_MAGIC) :].partition(b"\n")
+        return body, json.loads(headers)
+
+    @staticmethod
+    def _to_response(body: bytes, headers: dict[str, str], hit: bool = False) -> Response:
+        return Response(
+            content=body,
+            media_type=MEDIA_TYPE,
+            headers={**headers, "X-Cache": "HIT" if hit else "MISS"},
+        )
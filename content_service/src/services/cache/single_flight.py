@@ -0,0 +1,35 @@
+import asyncio
+from collections.abc import Awaitable, Callable
+from typing import Any
+
+
+class SingleFlight:
+    """
+    Схлопывание одновременных промахов кэша внутри воркера.
+
+    Пока по ключу идёт загрузка, остальные вызовы с тем же ключом
+    не запускают свою, а ждут результат уже начатой.
+    """
+
+    def __init__(self):
+        self._inflight: dict[str, asyncio.Task] = {}
+
+    async def do(self, key: str, fn: Callable[[], Awaitable[Any]]) -> Any:
+        task = self._inflight.get(key)
+        if task is None:
+            task = asyncio.ensure_future(fn())
+            self._inflight[key] = task
+            task.add_done_callback(lambda _: self._forget(key, task))
+
+        # shield: отмена одного ожидающего не отменяет загрузку для остальных
+        return await asyncio.shield(task)
+
+    def _forget(self, key: str, task: asyncio.Task) -> None:
+        if self._inflight.get(key) is task:
+            del self._inflight[key]
+
+    def __len__(self) -> int:
+        return len(self._inflight)
+
+
+single_flight = SingleFlight()
@@ -72,26 +72,53 @@ async def build_cache(elastic: AsyncElasticsearch, redis: Redis):
             await asyncio.sleep(5)
 
 
-async def wait_for_elastic(es: AsyncElasticsearch, timeout: int = 60, initial_delay: int = 30):
+async def ping_backends(es: AsyncElasticsearch, redis: Redis, timeout: float = 1.0) -> dict:
+    """Параллельно пингуем Elasticsearch и Redis, не дольше timeout секунд."""
+
+    async def ping(coro) -> bool:
+        try:
+            return bool(await asyncio.wait_for(coro, timeout))
+        except Exception:
+            return False
+
+    es_ok, redis_ok = await asyncio.gather(ping(es.ping()), ping(redis.ping()))
+    return {"elasticsearch": es_ok, "redis": redis_ok}
+
+
+async def wait_for_backends(
+    es: AsyncElasticsearch,
+    redis: Redis,
+    timeout: float = 60,
+    base_delay: float = 0.1,
+    max_delay: float = 5.0,
+) -> dict:
     """
-    Ждём, пока Elasticsearch не станет доступен.
+    Ждём, пока Elasticsearch и Redis не станут доступны.
+
+    Первый пинг — сразу, дальше экспоненциальная задержка между попытками,
+    так что сервис готов ровно тогда, когда готовы зависимости.
 
     :param es: экземпляр AsyncElasticsearch
+    :param redis: экземпляр Redis
     :param timeout: общее время ожидания в секундах
-    :param initial_delay: время ожидания перед первой попыткой пинга
+    :param base_delay: задержка после первой неудачной попытки
+    :param max_delay: верхняя граница задержки между попытками
     """
-    if initial_delay > 0:
-        print(f"⏳ Waiting {initial_delay} seconds before first ping...")
-        await asyncio.sleep(initial_delay)
+    loop = asyncio.get_running_loop()
+    deadline = loop.time() + timeout
+    delay = base_delay
+    attempt = 0
 
-    for i in range(timeout):
-        try:
-            if await es.ping():
-                print("✅ Elasticsearch is up!")
-                return
-        except Exception:
-            pass
-        print(f"⏳ Waiting for Elasticsearch... {i + 1}/{timeout}")
-        await asyncio.sleep(1)
-
-    raise RuntimeError("Elasticsearch не доступен после ожидания")
+    while True:
+        attempt += 1
+        status = await ping_backends(es, redis)
+        if all(status.values()):
+            print(f"✅ Elasticsearch и Redis доступны (попытка {attempt})")
+            return status
+
+        if loop.time() + delay > deadline:
+            raise RuntimeError(f"Зависимости недоступны после ожидания: {status}")
+
+        print(f"⏳ Waiting for backends {status}, retry in {delay:.1f}s...")
+        await asyncio.sleep(delay)
+        delay = min(delay * 2, max_delay)
@@ -1,21 +1,122 @@
+from collections.abc import Callable
 from uuid import UUID
 
+from core.config import settings
+from elasticsearch import NotFoundError
 from models.film import Film
+from models.film_page import FilmsPage
 from models.film_short import FilmShort
 from services.films.film_parsers import parse_film, parse_film_short
 from services.films.film_queries import all_films_query, search_films_query
+from services.utils.batch_loader import BatchLoader
+from services.utils.cursor import Cursor
+
+FILMS_INDEX = "movies"
+
+film_loader = BatchLoader(
+    window=settings.film_batch_window_ms / 1000, max_keys=settings.film_batch_max_keys
+)
 
 
 async def fetch_films_list(service, page: int, size: int, sort: str) -> list[FilmShort]:
-    resp = await service.search_index("movies", all_films_query(page, size, sort))
+    resp = await service.search_index(FILMS_INDEX, all_films_query(page, size, sort))
     return [parse_film_short(doc) for doc in resp["hits"]["hits"]]
 
 
+async def fetch_films_page(
+    service, page: int, size: int, sort: str, cursor: Cursor | None = None
+) -> FilmsPage:
+    return await _fetch_page(
+        service,
+        lambda search_after, pit: all_films_query(page, size, sort, search_after, pit),
+        size,
+        cursor,
+    )
+
+
 async def fetch_film_by_id(service, film_uuid: UUID) -> Film | None:
-    resp = await service.get_by_id("movies", str(film_uuid))
+    if settings.film_batch_loader_enabled:
+        # одновременные запросы разных фильмов уходят в ES одним _mget
+        return await film_loader.load(film_uuid, lambda ids: fetch_films_by_ids(service, ids))
+
+    resp = await service.get_by_id(FILMS_INDEX, str(film_uuid))
     return parse_film(resp)
 
 
+async def fetch_films_by_ids(service, film_uuids: list[UUID]) -> list[Film | None]:
+    docs = await service.mget_by_ids(FILMS_INDEX, [str(film_uuid) for film_uuid in film_uuids])
+    return [parse_film(doc) for doc in docs]
+
+
 async def fetch_short_film_by_name(service, query_str: str, page: int = 1, size: int = 10):
-    resp = await service.search_index("movies", search_films_query(query_str, page, size))
+    resp = await service.search_index(FILMS_INDEX, search_films_query(query_str, page, size))
     return [parse_film_short(doc) for doc in resp["hits"]["hits"]]
+
+
+async def fetch_films_search_page(
+    service, query_str: str, page: int, size: int, cursor: Cursor | None = None
+) -> FilmsPage:
+    return await _fetch_page(
+        service,
+        lambda search_after, pit: search_films_query(query_str, page, size, search_after, pit),
+        size,
+        cursor,
+    )
+
+
+async def _fetch_page(
+    service,
+    build_query: Callable[[list | None, dict | None], dict],
+    size: int,
+    cursor: Cursor | None,
+) -> FilmsPage:
+    """
+    Страница фильмов + курсор на следующую.
+
+    Если включён PIT (ELASTIC_PIT_KEEP_ALIVE), снимок индекса открывается
+    только при переходе по курсору: первые страницы кэшируются и отдаются
+    всем клиентам, и PIT на каждый промах кэша копился бы до keep_alive.
+    Дальше листание идёт по снимку из курсора — без дублей и пропусков при
+    переиндексации, а на последней странице снимок закрывается. Истёкший
+    или закрытый PIT не ломает клиента: запрос повторяется по живому
+    индексу с тем же search_after.
+    """
+    search_after = cursor.search_after if cursor else None
+    keep_alive = settings.elastic_pit_keep_alive
+    pit_id = None
+    if keep_alive and cursor is not None:
+        pit_id = cursor.pit_id or await service.open_pit(FILMS_INDEX, keep_alive)
+
+    try:
+        resp = await service.search_index(
+            FILMS_INDEX, build_query(search_after, _pit(pit_id, keep_alive))
+        )
+    except NotFoundError:
+        if pit_id is None:
+            raise
+        pit_id = None
+        resp = await service.search_index(FILMS_INDEX, build_query(search_after, None))
+    except Exception:
+        if pit_id is not None and cursor.pit_id is None:
+            await service.close_pit(pit_id)
+        raise
+
+    hits = resp["hits"]["hits"]
+    # ES может вернуть обновлённый id снимка — продолжаем по нему
+    pit_id = resp.get("pit_id", pit_id)
+    next_cursor = None
+    if len(hits) == size:
+        search_after = hits[-1]["sort"]
+        if pit_id is not None:
+            # _shard_doc из PIT в курсор не кладём (см. PIT_TIEBREAKER_SORT)
+            search_after = search_after[:-1]
+        next_cursor = Cursor(search_after, pit_id).encode()
+    elif pit_id is not None:
+        # листание закончилось — снимок больше никому не нужен
+        await service.close_pit(pit_id)
+
+    return FilmsPage(items=[parse_film_short(doc) for doc in hits], next_cursor=next_cursor)
+
+
+def _pit(pit_id: str | None, keep_alive: str) -> dict | None:
+    return {"id": pit_id, "keep_alive": keep_alive} if pit_id else None
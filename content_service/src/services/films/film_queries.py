@@ -1,16 +1,26 @@
 from uuid import UUID
 
+from services.utils.pagination import paginate_query
 
-def all_films_query(page: int, size: int, sort: str) -> dict:
+# uuid уникален — последний ключ сортировки даёт стабильный порядок для search_after
+TIEBREAKER_SORT = {"uuid": {"order": "asc"}}
+
+
+def all_films_query(
+    page: int,
+    size: int,
+    sort: str,
+    search_after: list | None = None,
+    pit: dict | None = None,
+) -> dict:
     sort_field = sort.lstrip("-")
     sort_order = "desc" if sort.startswith("-") else "asc"
 
-    return {
-        "from": (page - 1) * size,
-        "size": size,
-        "sort": [{sort_field: {"order": sort_order}}],
+    body = {
+        "sort": [{sort_field: {"order": sort_order}}, TIEBREAKER_SORT],
         "_source": ["uuid", "title", "imdb_rating"],
     }
+    return paginate_query(body, page, size, search_after, pit)
 
 
 def film_by_id_query(film_id: UUID) -> dict:
@@ -20,10 +30,15 @@ def film_by_id_query(film_id: UUID) -> dict:
     }
 
 
-def search_films_query(query_str: str, page: int, size: int) -> dict:
-    return {
-        "from": (page - 1) * size,
-        "size": size,
+def search_films_query(
+    query_str: str,
+    page: int,
+    size: int,
+    search_after: list | None = None,
+    pit: dict | None = None,
+) -> dict:
+    body = {
+        "sort": ["_score", TIEBREAKER_SORT],
         "_source": ["uuid", "title", "imdb_rating"],
         "query": {
             "multi_match": {
@@ -34,3 +49,4 @@ def search_films_query(query_str: str, page: int, size: int) -> dict:
             }
         },
     }
+    return paginate_query(body, page, size, search_after, pit)
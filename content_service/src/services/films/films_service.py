@@ -1,18 +1,30 @@
 from uuid import UUID
 
 from models.film import Film
+from models.film_page import FilmsPage
 from models.film_short import FilmShort
 from services.base import BaseService
 from services.films.film_fetchers import (
     fetch_film_by_id,
+    fetch_films_by_ids,
     fetch_films_list,
+    fetch_films_page,
+    fetch_films_search_page,
     fetch_short_film_by_name,
 )
+from services.utils.cursor import Cursor
 
 
 class FilmService(BaseService):
-    def __init__(self, cache, search, ttl: int = 10):
-        super().__init__(cache, search, ttl)
+    def __init__(
+        self,
+        cache,
+        search,
+        ttl: int = 10,
+        stale_ttl: int = 60,
+        early_refresh_beta: float = 1.0,
+    ):
+        super().__init__(cache, search, ttl, stale_ttl, early_refresh_beta)
 
     async def list_films(
         self, page: int = 1, size: int = 50, sort: str = "-imdb_rating"
@@ -26,6 +38,23 @@ class FilmService(BaseService):
             deserializer=lambda cached: [FilmShort(**f) for f in cached],
         )
 
+    async def list_films_page(
+        self,
+        page: int = 1,
+        size: int = 50,
+        sort: str = "-imdb_rating",
+        cursor: Cursor | None = None,
+    ) -> FilmsPage:
+        cache_key = self.make_cache_key(
+            "list_films_page", page=page, size=size, sort=sort, cursor=_cursor_key(cursor)
+        )
+
+        return await self.get_or_set_cache(
+            cache_key,
+            fetch_fn=lambda: fetch_films_page(self, page, size, sort, cursor),
+            deserializer=lambda cached: FilmsPage(**cached),
+        )
+
     async def search_films(self, query_str: str, page: int = 1, size: int = 50) -> list[FilmShort]:
         cache_key = self.make_cache_key("search_films", query=query_str, page=page, size=size)
 
@@ -36,6 +65,23 @@ class FilmService(BaseService):
             deserializer=lambda cached: [FilmShort(**f) for f in cached],
         )
 
+    async def search_films_page(
+        self,
+        query_str: str,
+        page: int = 1,
+        size: int = 50,
+        cursor: Cursor | None = None,
+    ) -> FilmsPage:
+        cache_key = self.make_cache_key(
+            "search_films_page", query=query_str, page=page, size=size, cursor=_cursor_key(cursor)
+        )
+
+        return await self.get_or_set_cache(
+            cache_key,
+            fetch_fn=lambda: fetch_films_search_page(self, query_str, page, size, cursor),
+            deserializer=lambda cached: FilmsPage(**cached),
+        )
+
     async def get_film_by_id(self, film_uuid: UUID) -> Film | None:
         cache_key = self.make_cache_key("film", uuid=film_uuid)
 
@@ -45,3 +91,21 @@ class FilmService(BaseService):
             serializer=lambda film: film.dict() if film else None,
             deserializer=lambda cached: Film(**cached) if cached else None,
         )
+
+    async def get_films_by_ids(self, film_uuids: list[UUID]) -> list[Film | None]:
+        """Фильмы по списку UUID в том же порядке; None — фильма нет."""
+        keys = [self.make_cache_key("film", uuid=film_uuid) for film_uuid in film_uuids]
+        uuid_by_key = dict(zip(keys, film_uuids, strict=True))
+
+        return await self.get_many_or_set_cache(
+            keys,
+            fetch_many_fn=lambda missed: fetch_films_by_ids(self, [uuid_by_key[k] for k in missed]),
+            serializer=lambda film: film.dict() if film else None,
+            deserializer=lambda cached: Film(**cached) if cached else None,
+        )
+
+
+def _cursor_key(cursor: Cursor | None) -> str | None:
+    # PIT в ключ не входит: в пределах TTL кэша страница после того же
+    # search_after одинакова для всех клиентов
+    return Cursor(cursor.search_after).encode() if cursor else None
@@ -1,31 +1,35 @@
 from uuid import UUID
 
 from models.genre import Genre
-from services.genres.genre_parsers import (
-    parse_genre_from_hit,
-    parse_genres_from_agg,
-    parse_genres_with_filter,
-)
-from services.genres.genre_queries import all_genres_query, genre_by_id_query, search_genres_query
-from services.utils.paginator import Paginator
+from models.genre_page import GenresPage
+from services.genres.genre_parsers import parse_genre, parse_genres
+from services.genres.genre_queries import all_genres_query, search_genres_query
+from services.utils.cursor import Cursor
 
+GENRES_INDEX = "genres"
 
-async def fetch_genres_list(search, size: int = 1000) -> list[Genre]:
-    query = all_genres_query(size=size)
-    resp = await search.search(index="movies", body=query)
-    return parse_genres_from_agg(resp)
 
+async def fetch_genres_page(
+    service, page: int, size: int, cursor: Cursor | None = None
+) -> GenresPage:
+    """
+    Страница справочника жанров + курсор на следующую.
 
-async def fetch_genres_paginated(search, page: int, size: int) -> list[Genre]:
-    all_genres = await fetch_genres_list(search)
-    return Paginator.paginate(all_genres, page, size, Genre)
+    Та же схема, что у фильмов: с курсором — search_after по (name.raw, uuid),
+    без курсора — обычный from/size с той же сортировкой.
+    """
+    query = all_genres_query(page, size, cursor.search_after if cursor else None)
+    resp = await service.search_index(GENRES_INDEX, query)
+    hits = resp["hits"]["hits"]
+    next_cursor = Cursor(hits[-1]["sort"]).encode() if len(hits) == size else None
+    return GenresPage(items=parse_genres(hits), next_cursor=next_cursor)
 
 
 async def fetch_genre_by_id(service, genre_uuid: UUID) -> Genre | None:
-    resp = await service.search_index("movies", genre_by_id_query(genre_uuid))
-    return parse_genre_from_hit(resp["hits"]["hits"], genre_uuid)
+    resp = await service.get_by_id(GENRES_INDEX, str(genre_uuid))
+    return parse_genre(resp)
 
 
-async def fetch_genre_by_name(service, query_str) -> list[Genre]:
-    resp = await service.search_index("movies", search_genres_query(query_str))
-    return parse_genres_with_filter(resp["hits"]["hits"], query_str)
+async def fetch_genre_by_name(service, query_str, size: int = 100) -> list[Genre]:
+    resp = await service.search_index(GENRES_INDEX, search_genres_query(query_str, size))
+    return parse_genres(resp["hits"]["hits"])
@@ -1,51 +1,24 @@
-from uuid import UUID
+from services.utils.pagination import paginate_query
 
-
-def all_genres_query(size: int = 1000) -> dict:
-    return {
-        "size": 0,  # не нужны документы
-        "aggs": {
-            "unique_genres": {
-                "nested": {"path": "genres"},
-                "aggs": {
-                    "by_uuid": {
-                        "terms": {"field": "genres.uuid", "size": size},
-                        "aggs": {"name": {"top_hits": {"_source": ["genres.name"], "size": 1}}},
-                    }
-                },
-            }
-        },
-    }
+# по алфавиту; uuid — уникальный последний ключ для search_after
+GENRES_SORT = [{"name.raw": {"order": "asc"}}, {"uuid": {"order": "asc"}}]
 
 
-def genre_by_id_query(genre_id: UUID) -> dict:
-    return {
-        "size": 1,
-        "query": {
-            "nested": {
-                "path": "genres",
-                "query": {"term": {"genres.uuid": str(genre_id)}},
-            }
-        },
-        "_source": ["genres"],
-    }
+def all_genres_query(page: int, size: int, search_after: list | None = None) -> dict:
+    """Страница жанров из индекса genres, по алфавиту."""
+    body = {"sort": list(GENRES_SORT), "_source": ["uuid", "name"]}
+    return paginate_query(body, page, size, search_after)
 
 
-def search_genres_query(query_str: str) -> dict:
+def search_genres_query(query_str: str, size: int = 100) -> dict:
     return {
-        "_source": ["genres"],
+        "size": size,
         "query": {
-            "nested": {
-                "path": "genres",
-                "query": {
-                    "match": {
-                        "genres.name": {
-                            "query": query_str,
-                            "operator": "and",
-                        }
-                    }
-                },
-                "inner_hits": {},
+            "match": {
+                "name": {
+                    "query": query_str,
+                    "operator": "and",
+                }
             }
         },
     }
@@ -1,33 +1,45 @@
 from uuid import UUID
 
 from models.genre import Genre
+from models.genre_page import GenresPage
 from services.base import BaseService
 from services.genres.genre_fetchers import (
     fetch_genre_by_id,
     fetch_genre_by_name,
-    fetch_genres_paginated,
+    fetch_genres_page,
 )
+from services.utils.cursor import Cursor
 
 
 class GenreService(BaseService):
-    def __init__(self, cache, search, ttl: int = 10):
-        super().__init__(cache, search, ttl)
-
-    async def list_genres(self, page: int = 1, size: int = 50) -> list[Genre]:
-        cache_key = self.make_cache_key("list_genres", page=page, size=size)
+    def __init__(
+        self,
+        cache,
+        search,
+        ttl: int = 10,
+        stale_ttl: int = 60,
+        early_refresh_beta: float = 1.0,
+    ):
+        super().__init__(cache, search, ttl, stale_ttl, early_refresh_beta)
+
+    async def list_genres(
+        self, page: int = 1, size: int = 50, cursor: Cursor | None = None
+    ) -> GenresPage:
+        cache_key = self.make_cache_key(
+            "list_genres", page=page, size=size, cursor=cursor.encode() if cursor else None
+        )
         return await self.get_or_set_cache(
             cache_key,
-            fetch_fn=lambda: fetch_genres_paginated(self.search, page, size),
-            serializer=lambda genres: [g.dict() for g in genres],
-            deserializer=lambda cached: [Genre(**g) for g in cached],
+            fetch_fn=lambda: fetch_genres_page(self, page, size, cursor),
+            deserializer=lambda cached: GenresPage(**cached),
         )
 
-    async def search_genres(self, query_str: str) -> list[Genre]:
-        cache_key = self.make_cache_key("search_genres", query=query_str)
+    async def search_genres(self, query_str: str, size: int = 100) -> list[Genre]:
+        cache_key = self.make_cache_key("search_genres", query=query_str, size=size)
 
         return await self.get_or_set_cache(
             cache_key,
-            fetch_fn=lambda: fetch_genre_by_name(self, query_str),
+            fetch_fn=lambda: fetch_genre_by_name(self, query_str, size),
             serializer=lambda genres: [g.dict() for g in genres],
             deserializer=lambda cached: [Genre(**g) for g in cached],
         )
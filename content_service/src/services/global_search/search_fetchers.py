@@ -1,14 +1,43 @@
+import asyncio
+import logging
 from typing import Any
 
+logger = logging.getLogger("app")
 
-async def fetch_search_all(service, query: str, page: int, size: int) -> dict[str, Any]:
-    """Фетчер для глобального поиска по фильмам, персонам и жанрам"""
-    films = await service.film_service.search_films(query, page=page, size=size)
-    persons = await service.person_service.search_persons(query)
-    genres = await service.genre_service.search_genres(query)
 
-    return {
-        "films": films,
-        "persons": persons,
-        "genres": genres,
+async def fetch_search_all(
+    service, query: str, page: int, size: int, timeout: float
+) -> dict[str, Any]:
+    """
+    Фетчер для глобального поиска по фильмам, персонам и жанрам.
+
+    Секции ищутся параллельно (каждая — через свой кэш), у каждой свой
+    дедлайн timeout. Не успевшая или упавшая секция отдаётся пустой и
+    попадает в partial — остальные результаты клиент получает сразу.
+    """
+    sections = {
+        "films": service.film_service.search_films(query, page=page, size=size),
+        "persons": service.person_service.search_persons(query, size=size),
+        "genres": service.genre_service.search_genres(query, size=size),
     }
+    results = await asyncio.gather(
+        *(asyncio.wait_for(coro, timeout) for coro in sections.values()),
+        return_exceptions=True,
+    )
+
+    data: dict[str, Any] = {"partial": []}
+    for name, result in zip(sections, results, strict=True):
+        if isinstance(result, TimeoutError):
+            logger.warning("⏱️ Глобальный поиск: секция %s не уложилась в %s сек", name, timeout)
+        elif isinstance(result, Exception):
+            logger.error("❌ Глобальный поиск: ошибка в секции %s: %s", name, result)
+        elif isinstance(result, BaseException):
+            raise result
+        else:
+            data[name] = result
+            continue
+
+        data[name] = []
+        data["partial"].append(name)
+
+    return data
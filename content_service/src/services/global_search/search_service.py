@@ -1,8 +1,6 @@
 from typing import Any
 
-from models.film_short import FilmShort
-from models.genre import Genre
-from models.person import Person
+from core.config import settings
 from services.base import BaseService
 from services.films.films_service import FilmService
 from services.genres.genres_service import GenreService
@@ -19,26 +17,19 @@ class SearchService(BaseService):
         person_service: PersonService,
         genre_service: GenreService,
         ttl: int = 10,
+        stale_ttl: int = 60,
+        early_refresh_beta: float = 1.0,
+        section_timeout: float | None = None,
     ):
-        super().__init__(cache, search, ttl)
+        super().__init__(cache, search, ttl, stale_ttl, early_refresh_beta)
         self.film_service = film_service
         self.person_service = person_service
         self.genre_service = genre_service
+        self.section_timeout = (
+            section_timeout if section_timeout is not None else settings.search_section_timeout
+        )
 
     async def search_all(self, query: str, page: int = 1, size: int = 50) -> dict[str, Any]:
-        cache_key = self.make_cache_key("search_all", query=query, page=page, size=size)
-
-        return await self.get_or_set_cache(
-            cache_key,
-            fetch_fn=lambda: fetch_search_all(self, query, page, size),
-            serializer=lambda data: {
-                "films": [f.dict() for f in data["films"]],
-                "persons": [p.dict() for p in data["persons"]],
-                "genres": [g.dict() for g in data["genres"]],
-            },
-            deserializer=lambda cached: {
-                "films": [FilmShort(**f) for f in cached["films"]],
-                "persons": [Person(**p) for p in cached["persons"]],
-                "genres": [Genre(**g) for g in cached["genres"]],
-            },
-        )
+        # общий результат не кэшируем: каждая секция уже в своём кэше,
+        # а неполный ответ (секция не успела) не должен закрепиться в Redis
+        return await fetch_search_all(self, query, page, size, self.section_timeout)
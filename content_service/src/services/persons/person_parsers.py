@@ -1,109 +1,56 @@
 from typing import Any
 from uuid import UUID
 
-from models.film import Film
 from models.film_short import FilmShort
 from models.person import Person
 
 
-def parse_persons_from_agg(response: dict) -> list[Person]:
+def parse_person(doc: dict[str, Any] | None, with_films: bool = True) -> Person | None:
     """
-    Парсим агрегации actors/writers/directors
-    в единый список персон без дублей.
-    """
-    persons_dict: dict[str, str] = {}
-
-    for role in ("actors", "writers", "directors"):
-        buckets = (
-            response.get("aggregations", {}).get(role, {}).get("persons", {}).get("buckets", [])
-        )
-        for bucket in buckets:
-            uuid = bucket["key"]
-            name_buckets = bucket.get("name", {}).get("buckets", [])
-            if name_buckets:
-                full_name = name_buckets[0]["key"]
-                persons_dict[uuid] = full_name
-
-    # преобразуем в список Person
-    return [Person(uuid=uid, full_name=name) for uid, name in persons_dict.items()]
-
+    Персона из документа индекса persons.
 
-def parse_persons_from_hits(hits: list[dict[str, Any]]) -> list[Person]:
-    """Достаёт всех персон с
-    привязкой к фильмам из документов ES."""
-    persons_dict: dict[str, Person] = {}
+    Роль — первая роль персоны в её первом фильме (actor / director / writer).
+    """
+    if not doc or "_source" not in doc:
+        return None
 
-    for doc in hits:
-        source = doc.get("_source", {})
-        film = Film(uuid=source["id"], title=source["title"], imdb_rating=source.get("imdb_rating"))
+    src = doc["_source"]
+    films = src.get("films", [])
+    roles = films[0].get("roles", []) if films else []
 
-        for role in ["actors", "directors", "writers"]:
-            for p in source.get(role, []):
-                person_id = p["uuid"]
-                if person_id not in persons_dict:
-                    persons_dict[person_id] = Person(
-                        uuid=person_id, full_name=p["full_name"], films=[]
-                    )
-                persons_dict[person_id].films.append(film)
+    return Person(
+        uuid=UUID(src["uuid"]),
+        full_name=src["full_name"],
+        role=roles[0] if roles else None,
+        films=[
+            FilmShort(uuid=UUID(f["uuid"]), title=f["title"], imdb_rating=f.get("imdb_rating"))
+            for f in films
+        ]
+        if with_films
+        else [],
+    )
 
-    return list(persons_dict.values())
 
+def parse_persons(hits: list[dict[str, Any]]) -> list[Person]:
+    """Список персон без фильмов (для выдачи списков и поиска)."""
+    return [parse_person(doc, with_films=False) for doc in hits]
 
-def parse_person_with_films(hits: list[dict[str, Any]], person_id: UUID) -> Person | None:
-    """Возвращает персону по UUID + список фильмов, где она участвовала."""
-    if not hits:
-        return None
 
-    films: list[FilmShort] = []
-    person: Person | None = None
+def parse_persons_with_role(hits: list[dict[str, Any]]) -> list[Person]:
+    """
+    Персоны из поиска с ролью из inner_hits.
 
+    docvalue-значения ролей отсортированы: actor < director < writer —
+    тот же приоритет, что и при сборке индекса.
+    """
+    persons = []
     for doc in hits:
         src = doc["_source"]
-
-        # сохраняем фильм
-        films.append(
-            FilmShort(
-                uuid=UUID(src["uuid"]), title=src["title"], imdb_rating=src.get("imdb_rating")
+        inner = doc.get("inner_hits", {}).get("films", {}).get("hits", {}).get("hits", [])
+        roles = inner[0].get("fields", {}).get("films.roles", []) if inner else []
+        persons.append(
+            Person(
+                uuid=UUID(src["uuid"]), full_name=src["full_name"], role=roles[0] if roles else None
             )
         )
-
-        # ищем персону в ролях
-        for role in ["actors", "directors", "writers"]:
-            for p in src.get(role, []):
-                if p["uuid"] == str(person_id):
-                    if not person:
-                        person = Person(
-                            uuid=UUID(p["uuid"]),
-                            full_name=p["full_name"],
-                            role=role[:-1],  # actor / director / writer
-                            films=[],
-                        )
-
-    if person:
-        person.films = films
-
-    return person
-
-
-def parse_persons_with_name(hits: list[dict[str, Any]], query_str: str) -> list[Person]:
-    """Достаёт уникальных персон
-     по имени из документов ES
-    (регистронезависимый поиск)."""
-    result = []
-    seen = set()
-    normalized_query = query_str.strip().lower()
-
-    for doc in hits:
-        src = doc["_source"]
-        for role in ["actors", "directors", "writers"]:
-            for p in src.get(role, []):
-                if p["uuid"] not in seen and p["full_name"].strip().lower() == normalized_query:
-                    seen.add(p["uuid"])
-                    result.append(
-                        Person(
-                            uuid=UUID(p["uuid"]),
-                            full_name=p["full_name"],
-                            role=role[:-1],  # убираем "s"
-                        )
-                    )
-    return result
+    return persons
@@ -1,156 +1,48 @@
-from uuid import UUID
+from services.utils.pagination import paginate_query
 
+# по алфавиту; uuid — уникальный последний ключ для search_after
+PERSONS_SORT = [{"full_name.raw": {"order": "asc"}}, {"uuid": {"order": "asc"}}]
 
-def all_persons_query(size: int = 100) -> dict:
-    query = {
-        "size": 0,
-        "aggs": {
-            "actors": {
-                "nested": {"path": "actors"},
-                "aggs": {
-                    "persons": {
-                        "terms": {"field": "actors.uuid", "size": size},
-                        "aggs": {"name": {"terms": {"field": "actors.full_name.raw", "size": 1}}},
-                    }
-                },
-            },
-            "writers": {
-                "nested": {"path": "writers"},
-                "aggs": {
-                    "persons": {
-                        "terms": {"field": "writers.uuid", "size": size},
-                        "aggs": {"name": {"terms": {"field": "writers.full_name.raw", "size": 1}}},
-                    }
-                },
-            },
-            "directors": {
-                "nested": {"path": "directors"},
-                "aggs": {
-                    "persons": {
-                        "terms": {"field": "directors.uuid", "size": size},
-                        "aggs": {
-                            "name": {"terms": {"field": "directors.full_name.raw", "size": 1}}
-                        },
-                    }
-                },
-            },
-        },
-    }
-    return query
 
+def all_persons_query(page: int, size: int, search_after: list | None = None) -> dict:
+    """Страница персон из индекса persons, по алфавиту."""
+    body = {"sort": list(PERSONS_SORT), "_source": ["uuid", "full_name"]}
+    return paginate_query(body, page, size, search_after)
 
-def person_by_id_query(person_id: UUID) -> dict:
-    """Запрос для поиска персоны по UUID."""
-    return {
-        "query": {
-            "bool": {
-                "should": [
-                    {
-                        "nested": {
-                            "path": "actors",
-                            "query": {"term": {"actors.uuid": str(person_id)}},
-                        }
-                    },
-                    {
-                        "nested": {
-                            "path": "directors",
-                            "query": {"term": {"directors.uuid": str(person_id)}},
-                        }
-                    },
-                    {
-                        "nested": {
-                            "path": "writers",
-                            "query": {"term": {"writers.uuid": str(person_id)}},
-                        }
-                    },
-                ]
-            }
-        },
-        "_source": ["uuid", "id", "title", "imdb_rating", "actors", "directors", "writers"],
-        "size": 1000,
-    }
 
+# из ответа ES берём только персону и роли из inner_hits — без метаданных hits
+SEARCH_PERSON_FILTER_PATH = "hits.hits._source,hits.hits.inner_hits.films.hits.hits.fields"
 
-def search_person_query(query_str: str) -> dict:
-    """Запрос для поиска персоны по имени (во всех ролях)."""
-    return {
-        "query": {
-            "bool": {
-                "should": [
-                    {
-                        "nested": {
-                            "path": "actors",
-                            "query": {
-                                "match": {
-                                    "actors.full_name": {"query": query_str, "fuzziness": "auto"}
-                                }
-                            },
-                        }
-                    },
-                    {
-                        "nested": {
-                            "path": "writers",
-                            "query": {
-                                "match": {
-                                    "writers.full_name": {"query": query_str, "fuzziness": "auto"}
-                                }
-                            },
-                        }
-                    },
-                    {
-                        "nested": {
-                            "path": "directors",
-                            "query": {
-                                "match": {
-                                    "directors.full_name": {"query": query_str, "fuzziness": "auto"}
-                                }
-                            },
-                        }
-                    },
-                ]
-            }
-        },
-        "_source": [
-            "actors.uuid",
-            "actors.full_name",
-            "writers.uuid",
-            "writers.full_name",
-            "directors.uuid",
-            "directors.full_name",
-        ],
-        "size": 100,
-    }
 
+def search_person_query(query_str: str, size: int = 100) -> dict:
+    """
+    Запрос для поиска персоны по имени.
 
-def films_by_person_query(person_id: UUID, size: int = 50) -> dict:
-    """Запрос для поиска фильмов, где участвовала персона."""
+    Фильмы персоны в ответ не попадают: роль берётся из inner_hits
+    одного вложенного фильма (docvalue, без _source), поэтому размер
+    ответа не зависит от фильмографии.
+    """
     return {
-        "_source": ["uuid", "title", "imdb_rating"],
         "query": {
             "bool": {
-                "should": [
-                    {
-                        "nested": {
-                            "path": "actors",
-                            "query": {"term": {"actors.uuid": str(person_id)}},
-                        }
-                    },
-                    {
-                        "nested": {
-                            "path": "writers",
-                            "query": {"term": {"writers.uuid": str(person_id)}},
-                        }
-                    },
-                    {
-                        "nested": {
-                            "path": "directors",
-                            "query": {"term": {"directors.uuid": str(person_id)}},
-                        }
-                    },
-                ],
-                "minimum_should_match": 1,
+                "must": {
+                    "match": {
+                        "full_name": {"query": query_str, "operator": "and", "fuzziness": "auto"}
+                    }
+                },
+                "should": {
+                    "nested": {
+                        "path": "films",
+                        "query": {"match_all": {}},
+                        "inner_hits": {
+                            "size": 1,
+                            "_source": False,
+                            "docvalue_fields": ["films.roles"],
+                        },
+                    }
+                },
             }
         },
+        "_source": ["uuid", "full_name"],
         "size": size,
-        "track_total_hits": True,
     }
@@ -1,38 +1,46 @@
 from uuid import UUID
 
 from models.person import Person
+from models.person_page import PersonsPage
 from services.persons.person_parsers import (
-    parse_person_with_films,
-    parse_persons_from_agg,
-    parse_persons_with_name,
+    parse_person,
+    parse_persons,
+    parse_persons_with_role,
 )
 from services.persons.person_queries import (
+    SEARCH_PERSON_FILTER_PATH,
     all_persons_query,
-    person_by_id_query,
     search_person_query,
 )
-from services.utils.paginator import Paginator
+from services.utils.cursor import Cursor
 
+PERSONS_INDEX = "persons"
 
-async def fetch_persons_list(search, size: int = 1000, page: int = 1) -> list[Person]:
-    """
-    Достаёт всех персон из ES через агрегации actors/writers/directors.
-    """
-    query = all_persons_query(size=size)
-    resp = await search.search(index="movies", body=query)
-    return parse_persons_from_agg(resp)
 
+async def fetch_persons_page(
+    service, page: int, size: int, cursor: Cursor | None = None
+) -> PersonsPage:
+    """
+    Страница справочника персон + курсор на следующую.
 
-async def fetch_persons_paginated(search, page: int, size: int) -> list[Person]:
-    all_persons = await fetch_persons_list(search)
-    return Paginator.paginate(all_persons, page, size, Person)
+    Та же схема, что у фильмов: с курсором — search_after по
+    (full_name.raw, uuid), без курсора — обычный from/size с той же сортировкой.
+    """
+    query = all_persons_query(page, size, cursor.search_after if cursor else None)
+    resp = await service.search_index(PERSONS_INDEX, query)
+    hits = resp["hits"]["hits"]
+    next_cursor = Cursor(hits[-1]["sort"]).encode() if len(hits) == size else None
+    return PersonsPage(items=parse_persons(hits), next_cursor=next_cursor)
 
 
-async def fetch_person_by_id(self, person_uuid: UUID) -> Person | None:
-    resp = await self.search_index("movies", person_by_id_query(person_uuid))
-    return parse_person_with_films(resp["hits"]["hits"], person_uuid)
+async def fetch_person_by_id(service, person_uuid: UUID) -> Person | None:
+    resp = await service.get_by_id(PERSONS_INDEX, str(person_uuid))
+    return parse_person(resp)
 
 
-async def fetch_person_by_name(self, query_str: str) -> list[Person]:
-    resp = await self.search_index("movies", search_person_query(query_str))
-    return parse_persons_with_name(resp["hits"]["hits"], query_str)
+async def fetch_person_by_name(service, query_str: str, size: int = 100) -> list[Person]:
+    resp = await service.search_index(
+        PERSONS_INDEX, search_person_query(query_str, size), filter_path=SEARCH_PERSON_FILTER_PATH
+    )
+    # filter_path убирает пустой hits целиком, если ничего не нашлось
+    return parse_persons_with_role(resp.get("hits", {}).get("hits", []))
@@ -1,27 +1,38 @@
 from uuid import UUID
 
 from models.person import Person
+from models.person_page import PersonsPage
 from services.persons.persons_fetchers import (
     fetch_person_by_id,
     fetch_person_by_name,
-    fetch_persons_paginated,
+    fetch_persons_page,
 )
+from services.utils.cursor import Cursor
 from src.services.base import BaseService
 
 
 class PersonService(BaseService):
-    def __init__(self, cache, search, ttl: int = 300):
-        super().__init__(cache, search, ttl)
-
-    async def list_persons(self, size: int = 100, page: int = 1) -> list[Person]:
-
-        cache_key = self.make_cache_key("list_persons", page=page, size=size)
+    def __init__(
+        self,
+        cache,
+        search,
+        ttl: int = 300,
+        stale_ttl: int = 600,
+        early_refresh_beta: float = 1.0,
+    ):
+        super().__init__(cache, search, ttl, stale_ttl, early_refresh_beta)
+
+    async def list_persons(
+        self, size: int = 100, page: int = 1, cursor: Cursor | None = None
+    ) -> PersonsPage:
+        cache_key = self.make_cache_key(
+            "list_persons", page=page, size=size, cursor=cursor.encode() if cursor else None
+        )
 
         return await self.get_or_set_cache(
             cache_key,
-            fetch_fn=lambda: fetch_persons_paginated(self.search, page, size),
-            serializer=lambda persons: [p.dict() for p in persons],
-            deserializer=lambda cached: [Person(**p) for p in cached],
+            fetch_fn=lambda: fetch_persons_page(self, page, size, cursor),
+            deserializer=lambda cached: PersonsPage(**cached),
         )
 
     async def get_person_by_id(self, person_id: UUID) -> Person | None:
@@ -34,12 +45,12 @@ class PersonService(BaseService):
             deserializer=lambda cached: Person(**cached) if cached else None,
         )
 
-    async def search_persons(self, query_str: str) -> list[Person]:
-        cache_key = self.make_cache_key("search_persons", query=query_str)
+    async def search_persons(self, query_str: str, size: int = 100) -> list[Person]:
+        cache_key = self.make_cache_key("search_persons", query=query_str, size=size)
 
         return await self.get_or_set_cache(
             cache_key,
-            fetch_fn=lambda: fetch_person_by_name(self, query_str),
+            fetch_fn=lambda: fetch_person_by_name(self, query_str, size),
             serializer=lambda persons: [p.dict() for p in persons],
             deserializer=lambda cached: [Person(**p) for p in cached],
         )
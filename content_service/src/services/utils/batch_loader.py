@@ -0,0 +1,76 @@
+import asyncio
+import logging
+from collections.abc import Awaitable, Callable, Hashable
+from typing import Any
+
+logger = logging.getLogger("app")
+
+LoadMany = Callable[[list[Any]], Awaitable[list[Any]]]
+
+
+class BatchLoader:
+    """
+    DataLoader-подобная склейка одиночных запросов в пакетный.
+
+    load(key) не идёт в бэкенд сразу: ключи копятся window секунд (или до
+    max_keys), затем уходят одним load_many, и каждый ждущий получает свой
+    результат. load_many должен вернуть значения в порядке ключей.
+
+    Экземпляр общий для воркера, поэтому load_many берётся у вызова,
+    открывшего пачку, — у всех вызовов он должен ходить в один и тот же
+    бэкенд (общий клиент ES из app.state).
+    """
+
+    def __init__(self, window: float = 0.002, max_keys: int = 50):
+        self.window = window
+        self.max_keys = max_keys
+        self._pending: dict[Hashable, asyncio.Future] = {}
+        self._load_many: LoadMany | None = None
+        self._timer: asyncio.TimerHandle | None = None
+        self._tasks: set[asyncio.Task] = set()
+
+    async def load(self, key: Hashable, load_many: LoadMany) -> Any:
+        future = self._pending.get(key)
+        if future is None:
+            future = asyncio.get_running_loop().create_future()
+            self._pending[key] = future
+            if self._load_many is None:
+                self._load_many = load_many
+                self._timer = asyncio.get_running_loop().call_later(self.window, self._flush)
+            if len(self._pending) >= self.max_keys:
+                self._flush()
+
+        # отмена одного ждущего не должна отменять результат для остальных
+        return await asyncio.shield(future)
+
+    def _flush(self) -> None:
+        if self._timer is not None:
+            self._timer.cancel()
+            self._timer = None
+
+        batch, self._pending = self._pending, {}
+        load_many, self._load_many = self._load_many, None
+        if not batch or load_many is None:
+            return
+
+        task = asyncio.create_task(self._dispatch(batch, load_many))
+        self._tasks.add(task)
+        task.add_done_callback(self._tasks.discard)
+
+    async def _dispatch(self, batch: dict[Hashable, asyncio.Future], load_many: LoadMany) -> None:
+        keys = list(batch)
+        try:
+            values = await load_many(keys)
+            if len(values) != len(keys):
+                raise RuntimeError(f"load_many вернул {len(values)} значений на {len(keys)} ключей")
+        except Exception as e:
+            logger.warning("Пакетная загрузка %s ключей не удалась: %s", len(keys), e)
+            for future in batch.values():
+                if not future.done():
+                    future.set_exception(e)
+            return
+
+        for key, value in zip(keys, values, strict=True):
+            future = batch[key]
+            if not future.done():
+                future.set_result(value)
@@ -0,0 +1,45 @@
+import base64
+import json
+from dataclasses import dataclass
+from typing import Any
+
+
+class InvalidCursorError(ValueError):
+    """Курсор не удалось разобрать (подделан, обрезан или устарел формат)."""
+
+
+@dataclass
+class Cursor:
+    """
+    Непрозрачный курсор keyset-пагинации.
+
+    Attributes:
+        search_after: значения sort последнего документа страницы.
+        pit_id: id point-in-time, если листание идёт по снимку индекса.
+    """
+
+    search_after: list[Any]
+    pit_id: str | None = None
+
+    def encode(self) -> str:
+        data: dict[str, Any] = {"s": self.search_after}
+        if self.pit_id:
+            data["p"] = self.pit_id
+        raw = json.dumps(data, separators=(",", ":")).encode()
+        return base64.urlsafe_b64encode(raw).rstrip(b"=").decode()
+
+    @classmethod
+    def decode(cls, token: str) -> "Cursor":
+        try:
+            raw = base64.urlsafe_b64decode(token + "=" * (-len(token) % 4))
+            data = json.loads(raw)
+            search_after = data["s"]
+            pit_id = data.get("p")
+        except (ValueError, TypeError, KeyError):
+            raise InvalidCursorError(token) from None
+
+        if not isinstance(search_after, list) or not search_after:
+            raise InvalidCursorError(token)
+        if pit_id is not None and not isinstance(pit_id, str):
+            raise InvalidCursorError(token)
+        return cls(search_after=search_after, pit_id=pit_id)
@@ -0,0 +1,34 @@
+# С PIT ES сам дописывает в sort _shard_doc и ждёт его значение в search_after.
+# Дописываем его явно, а в search_after ставим максимум: последний ключ
+# сортировки (uuid) уже однозначно задаёт позицию, так что это ровно
+# «строго после документа курсора».
+# Курсор поэтому всегда хранит только наши ключи и годится и без PIT.
+PIT_TIEBREAKER_SORT = {"_shard_doc": "asc"}
+PIT_TIEBREAKER_AFTER = 2**63 - 1
+
+
+def paginate_query(
+    body: dict,
+    page: int,
+    size: int,
+    search_after: list | None = None,
+    pit: dict | None = None,
+) -> dict:
+    """
+    Добавить к запросу пагинацию.
+
+    С курсором (search_after) ES продолжает с места, где закончилась
+    прошлая страница, и не пересобирает from + size документов на шардах.
+    Без курсора остаётся обычный from — для первых страниц и старых клиентов.
+    """
+    body["size"] = size
+    if search_after is not None:
+        body["search_after"] = search_after
+    else:
+        body["from"] = (page - 1) * size
+    if pit is not None:
+        body["pit"] = pit
+        body["sort"] = [*body["sort"], PIT_TIEBREAKER_SORT]
+        if search_after is not None:
+            body["search_after"] = [*search_after, PIT_TIEBREAKER_AFTER]
+    return body
@@ -1,22 +1,34 @@
+import asyncio
+import hashlib
 import json
 import logging
+import math
+import time
 
 import httpx
 from core.config import settings
 from db.protocols import CacheStorageProtocol
 from fastapi import HTTPException, status
-from jose import ExpiredSignatureError, JWTError, jwt
-from jose.utils import base64url_decode
+from jose import ExpiredSignatureError, JWTError, jwk, jwt
+from jose.backends.base import Key
+from services.cache.local_cache import MISSING, LocalCache
 
 logger = logging.getLogger(__name__)
 JWKS_CACHE_KEY = "auth:jwks"
+SUPPORTED_KEY_TYPES = {"oct", "RSA"}
 
 
-async def get_jwks(cache: CacheStorageProtocol) -> dict:
-    """Получает JWKS из кэша или Auth Service"""
-    cached = await cache.get(JWKS_CACHE_KEY)
-    if cached:
-        return json.loads(cached)
+async def get_jwks(cache: CacheStorageProtocol, force: bool = False) -> dict:
+    """
+    Получает JWKS из кэша или Auth Service.
+
+    force=True всегда идёт в Auth и перезаписывает auth:jwks — иначе после
+    ротации ключа до истечения кэша читалась бы та же устаревшая копия.
+    """
+    if not force:
+        cached = await cache.get(JWKS_CACHE_KEY)
+        if cached:
+            return json.loads(cached)
 
     try:
         async with httpx.AsyncClient(timeout=5) as client:
@@ -24,55 +36,167 @@ async def get_jwks(cache: CacheStorageProtocol) -> dict:
             resp.raise_for_status()
             jwks = resp.json()
     except Exception:
-        raise HTTPException(status_code=503, detail="Auth service unavailable")
+        raise HTTPException(status_code=503, detail="Auth service unavailable") from None
 
     # сохраняем в RedisStorage
     await cache.set(JWKS_CACHE_KEY, json.dumps(jwks), ex=600)
     return jwks
 
 
+class JWKSKeyring:
+    """
+    Разобранные ключи JWKS в памяти процесса, по kid.
+
+    Ключи строятся один раз при обновлении (фоновая задача jwks_refresher),
+    поэтому проверка токена не ходит ни в Redis, ни в сеть. На незнакомый
+    kid JWKS загружается из Auth в обход кэша, но не чаще refetch_interval
+    на весь процесс: поток токенов со случайными kid не превращается
+    в поток запросов к Auth.
+    """
+
+    def __init__(self, refetch_interval: float = 30.0):
+        self.refetch_interval = refetch_interval
+        self._keys: dict[str, tuple[Key, str]] = {}
+        self._last_refetch: float | None = None
+        self._lock = asyncio.Lock()
+
+    @property
+    def kids(self) -> list[str]:
+        return list(self._keys)
+
+    def load(self, jwks: dict) -> None:
+        """Построить ключи из JWKS и атомарно заменить текущий набор."""
+        keys: dict[str, tuple[Key, str]] = {}
+        for raw in jwks.get("keys", []):
+            kid = raw.get("kid")
+            if not kid or raw.get("kty") not in SUPPORTED_KEY_TYPES:
+                continue
+            alg = raw.get("alg") or ("HS256" if raw["kty"] == "oct" else "RS256")
+            try:
+                keys[kid] = (jwk.construct(raw, alg), alg)
+            except Exception as e:
+                logger.error("Bad JWKS key %s: %s", kid, e)
+        self._keys = keys
+
+    async def refresh(self, cache: CacheStorageProtocol, force: bool = False) -> None:
+        self.load(await get_jwks(cache, force=force))
+
+    async def get_key(self, kid: str, cache: CacheStorageProtocol) -> tuple[Key, str] | None:
+        key = self._keys.get(kid)
+        if key is not None:
+            return key
+
+        async with self._lock:
+            # пока ждали лок, ключ мог подгрузить другой запрос
+            key = self._keys.get(kid)
+            if key is not None or not self._may_refetch():
+                return key
+            await self.refresh(cache, force=True)
+
+        return self._keys.get(kid)
+
+    def _may_refetch(self) -> bool:
+        now = time.monotonic()
+        if self._last_refetch is not None and now - self._last_refetch < self.refetch_interval:
+            return False
+        self._last_refetch = now
+        return True
+
+
+class VerifiedTokenCache:
+    """
+    Ограниченный кэш уже проверенных токенов.
+
+    Ключ — sha256 от токена, запись живёт до exp токена. Клиенты шлют один
+    и тот же access-токен подряд, и повторная RSA-проверка подписи не нужна.
+    LRU и сроки жизни — те же, что у L1-кэша сервисов (LocalCache).
+    """
+
+    def __init__(self, max_entries: int = 10_000):
+        self._cache = LocalCache(max_entries=max_entries, ttl=math.inf)
+
+    @staticmethod
+    def _key(token: str) -> str:
+        return hashlib.sha256(token.encode()).hexdigest()
+
+    def get(self, token: str) -> dict | None:
+        payload = self._cache.get(self._key(token))
+        return None if payload is MISSING else dict(payload)
+
+    def set(self, token: str, payload: dict) -> None:
+        exp = payload.get("exp")
+        if not exp:
+            return
+
+        ttl = float(exp) - time.time()
+        if ttl > 0:
+            self._cache.set(self._key(token), dict(payload), ttl)
+
+    def clear(self) -> None:
+        self._cache.clear()
+
+    def __len__(self) -> int:
+        return len(self._cache)
+
+
+keyring = JWKSKeyring()
+verified_tokens = VerifiedTokenCache()
+
+
+async def is_token_revoked(cache: CacheStorageProtocol, payload: dict) -> bool:
+    """Токен отозван в Auth (logout) — blacklist:{jti} в общем Redis."""
+    jti = payload.get("jti")
+    if not jti:
+        return False
+    return await cache.exists(f"blacklist:{jti}") > 0
+
+
 async def decode_token(token: str, cache: CacheStorageProtocol) -> dict:
+    payload = verified_tokens.get(token)
+    if payload is None:
+        payload = await _verify_token(token, cache)
+        verified_tokens.set(token, payload)
+
+    # отзыв проверяем всегда, в том числе для закэшированных токенов
+    if await is_token_revoked(cache, payload):
+        raise HTTPException(status_code=status.HTTP_401_UNAUTHORIZED, detail="Token revoked")
+
+    return payload
+
+
+async def _verify_token(token: str, cache: CacheStorageProtocol) -> dict:
     try:
-        jwks = await get_jwks(cache)
         headers = jwt.get_unverified_header(token)
         kid = headers.get("kid")
 
-        key = next((k for k in jwks["keys"] if k["kid"] == kid), None)
+        key = await keyring.get_key(kid, cache) if kid else None
         if not key:
             raise HTTPException(status_code=status.HTTP_401_UNAUTHORIZED, detail="Unknown key id")
 
-        if key["kty"] == "oct":
-            try:
-                secret = base64url_decode(key["k"].encode())
-            except Exception as e:
-                logger.error("Bad JWKS key encoding: %s", e)
-                raise HTTPException(
-                    status_code=status.HTTP_401_UNAUTHORIZED, detail="Invalid secret encoding"
-                )
-        else:
-            raise HTTPException(
-                status_code=status.HTTP_401_UNAUTHORIZED, detail="Unsupported key type"
-            )
-
-        alg = key.get("alg", "HS256")
-
+        verifier, alg = key
         payload = jwt.decode(
             token,
-            secret,
+            verifier,
             algorithms=[alg],
             options={"verify_aud": False},
         )
 
     except ExpiredSignatureError:
-        raise HTTPException(status_code=status.HTTP_401_UNAUTHORIZED, detail="Token expired")
+        raise HTTPException(
+            status_code=status.HTTP_401_UNAUTHORIZED, detail="Token expired"
+        ) from None
     except JWTError as e:
         logger.warning("JWTError: %s", e)
-        raise HTTPException(status_code=status.HTTP_401_UNAUTHORIZED, detail="Invalid token")
+        raise HTTPException(
+            status_code=status.HTTP_401_UNAUTHORIZED, detail="Invalid token"
+        ) from None
     except HTTPException:
         raise  # пробрасываем как есть
     except Exception as e:
         logger.exception("Unexpected error in decode_token: %s", e)
-        raise HTTPException(status_code=status.HTTP_401_UNAUTHORIZED, detail="Invalid token")
+        raise HTTPException(
+            status_code=status.HTTP_401_UNAUTHORIZED, detail="Invalid token"
+        ) from None
 
     if payload.get("type") != "access":
         raise HTTPException(status_code=status.HTTP_401_UNAUTHORIZED, detail="Not an access token")
@@ -9,6 +9,15 @@ import pytest_asyncio
 import aiohttp
 from elasticsearch import AsyncElasticsearch, helpers
 
+# персоны и жанры строит тот же код, что и ETL (etl/ в PYTHONPATH)
+from catalog_indexes import (
+    GENRES_INDEX,
+    GENRES_MAPPING,
+    PERSONS_INDEX,
+    PERSONS_MAPPING,
+    build_genres,
+    build_persons,
+)
 from functional.testdata.es_mapping import MOVIES_MAPPING
 from functional.settings import settings
 
@@ -58,17 +67,22 @@ async def redis_client(event_loop):
     await client.aclose()
 
 
+async def recreate_index(es_client, index, mapping):
+    if await es_client.indices.exists(index=index):
+        await es_client.indices.delete(index=index)
+    await es_client.indices.create(index=index, body=mapping)
+
+
 # ---------- prepare elasticsearch with data ----------
 @pytest_asyncio.fixture(scope="session", autouse=True)
 async def setup_es(es_client):
-    # пересоздаём индекс
-    if await es_client.indices.exists(index=settings.ELASTIC_INDEX):
-        await es_client.indices.delete(index=settings.ELASTIC_INDEX)
-
-    await es_client.indices.create(
-        index=settings.ELASTIC_INDEX, body=MOVIES_MAPPING)
+    # пересоздаём индексы
+    await recreate_index(es_client, settings.ELASTIC_INDEX, MOVIES_MAPPING)
+    await recreate_index(es_client, PERSONS_INDEX, PERSONS_MAPPING)
+    await recreate_index(es_client, GENRES_INDEX, GENRES_MAPPING)
 
     actions = []
+    movies = []
     with open("functional/testdata/test_data.json",
               "r",
               encoding="utf-8") as f:
@@ -91,6 +105,15 @@ async def setup_es(es_client):
                 "_id": doc_id,
                 "_source": source,
             })
+            movies.append(source)
+
+    # персоны и жанры — в свои индексы, как их строит ETL
+    for index, docs in ((PERSONS_INDEX, build_persons(movies)),
+                        (GENRES_INDEX, build_genres(movies))):
+        actions.extend(
+            {"_index": index, "_id": doc["uuid"], "_source": doc}
+            for doc in docs
+        )
 
     # bulk insert + refresh=wait_for
     if actions:
@@ -1,5 +1,9 @@
+import asyncio
+
+import cache_invalidation
 import pytest
 from aiohttp import ClientSession
+from redis import Redis
 from http import HTTPStatus
 from functional.settings import settings
 
@@ -83,3 +87,138 @@ async def test_film_cache(
     # Assert 2
     assert resp2.status == HTTPStatus.OK
     assert data1 == data2
+
+
+@pytest.mark.asyncio
+async def test_film_not_found_is_cached(
+        http_session: ClientSession,
+        redis_client,
+        es_ready):
+    # Arrange
+    film_id = "00000000-0000-0000-0000-000000000000"
+    await redis_client.flushdb()
+
+    # Act 1 (фильма нет → 404 и негативная запись в кэше)
+    async with http_session.get(
+        f"http://{settings.API_HOST}:"
+        f"{settings.API_PORT}/api/v1/films/{film_id}"
+    ) as resp1:
+        pass
+
+    # Assert 1
+    assert resp1.status == HTTPStatus.NOT_FOUND
+    assert await redis_client.exists(f"film:uuid={film_id}")
+
+    # Act 2 (повторный 404 отдаётся из кэша)
+    async with http_session.get(
+        f"http://{settings.API_HOST}:"
+        f"{settings.API_PORT}/api/v1/films/{film_id}"
+    ) as resp2:
+        pass
+
+    # Assert 2
+    assert resp2.status == HTTPStatus.NOT_FOUND
+
+
+@pytest.mark.asyncio
+async def test_films_cursor_pagination(http_session: ClientSession, es_ready):
+    base_url = f"http://{settings.API_HOST}:{settings.API_PORT}/api/v1/films/"
+
+    # Act 1 (первая страница отдаёт курсор на следующую)
+    async with http_session.get(f"{base_url}?size=1") as resp1:
+        data1 = await resp1.json()
+        cursor = resp1.headers.get("X-Next-Cursor")
+
+    # Assert 1
+    assert resp1.status == HTTPStatus.OK
+    assert len(data1) == 1
+    assert cursor
+
+    # Act 2 (следующая страница по курсору)
+    async with http_session.get(f"{base_url}?size=1&cursor={cursor}") as resp2:
+        data2 = await resp2.json()
+
+    # Assert 2
+    assert resp2.status == HTTPStatus.OK
+    assert data2
+    assert data2[0]["uuid"] != data1[0]["uuid"]
+
+
+@pytest.mark.asyncio
+async def test_films_invalid_cursor(http_session: ClientSession, es_ready):
+    # Act
+    async with http_session.get(
+        f"http://{settings.API_HOST}:"
+        f"{settings.API_PORT}/api/v1/films/?cursor=not-a-cursor"
+    ) as resp:
+        pass
+
+    # Assert
+    assert resp.status == HTTPStatus.BAD_REQUEST
+
+
+@pytest.mark.asyncio
+async def test_films_batch(http_session: ClientSession, es_ready):
+    # Arrange
+    film_id = "900e93d9-21f2-4c62-b8d2-32de32110a16"
+    missing_id = "00000000-0000-0000-0000-000000000000"
+
+    # Act
+    async with http_session.get(
+        f"http://{settings.API_HOST}:"
+        f"{settings.API_PORT}/api/v1/films/batch?ids={missing_id},{film_id}"
+    ) as resp:
+        data = await resp.json()
+
+    # Assert (порядок запроса сохранён, ненайденный помечен)
+    assert resp.status == HTTPStatus.OK
+    assert data["films"][0] is None
+    assert data["films"][1]["uuid"] == film_id
+    assert data["missing"] == [missing_id]
+
+
+@pytest.mark.asyncio
+async def test_film_cache_invalidated_by_event(
+        http_session: ClientSession,
+        redis_client,
+        es_client,
+        es_ready):
+    # Arrange
+    film_id = "900e93d9-21f2-4c62-b8d2-32de32110a16"
+    url = (f"http://{settings.API_HOST}:"
+           f"{settings.API_PORT}/api/v1/films/{film_id}")
+    etl_redis = Redis(host=settings.REDIS_HOST, port=settings.REDIS_PORT)
+
+    def invalidate_film():
+        return cache_invalidation.invalidate([film_id], [], [], client=etl_redis)
+
+    # сбрасываем кэш только этого фильма, а не всю общую тестовую БД
+    await asyncio.to_thread(invalidate_film)
+
+    async with http_session.get(url) as resp:
+        original = await resp.json()
+
+    # записи кэша помечены тегом uuid фильма в формате, который читает ETL
+    tagged = set(await redis_client.zrange(f"ztag:{film_id}", 0, -1))
+    assert set(cache_invalidation.cache_keys([film_id], [], [])) <= tagged
+
+    await es_client.update(index=settings.ELASTIC_INDEX, id=film_id,
+                           doc={"title": "Invalidated"}, refresh="wait_for")
+    try:
+        # Act
+        await asyncio.to_thread(invalidate_film)
+        left = await redis_client.exists(f"ztag:{film_id}", *tagged)
+
+        async with http_session.get(url) as resp:
+            data = await resp.json()
+
+        # Assert (без ожидания TTL)
+        assert left == 0
+        assert resp.status == HTTPStatus.OK
+        assert data["title"] == "Invalidated"
+    finally:
+        await es_client.update(index=settings.ELASTIC_INDEX, id=film_id,
+                               doc={"title": original["title"]},
+                               refresh="wait_for")
+        await asyncio.to_thread(invalidate_film)
+        etl_redis.close()
@@ -0,0 +1,31 @@
+import pytest
+from aiohttp import ClientSession
+from http import HTTPStatus
+from functional.settings import settings
+
+
+@pytest.mark.asyncio
+async def test_health_live(http_session: ClientSession):
+    # Act
+    async with http_session.get(
+        f"http://{settings.API_HOST}:{settings.API_PORT}/health/live"
+    ) as resp:
+        data = await resp.json()
+
+    # Assert
+    assert resp.status == HTTPStatus.OK
+    assert data["status"] == "ok"
+
+
+@pytest.mark.asyncio
+async def test_health_ready(http_session: ClientSession, es_ready):
+    # Act
+    async with http_session.get(
+        f"http://{settings.API_HOST}:{settings.API_PORT}/health/ready"
+    ) as resp:
+        data = await resp.json()
+
+    # Assert
+    assert resp.status == HTTPStatus.OK
+    assert data["elasticsearch"] is True
+    assert data["redis"] is True
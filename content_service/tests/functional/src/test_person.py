@@ -113,3 +113,24 @@ async def test_person_cache(
     # Assert 2
     assert resp2.status == HTTPStatus.OK
     assert data1 == data2
+
+
+@pytest.mark.asyncio
+async def test_persons_cursor_pagination(http_session: ClientSession, es_ready):
+    base_url = f"http://{settings.API_HOST}:{settings.API_PORT}/api/v1/persons/"
+
+    # Act (листаем справочник курсором до конца)
+    seen = []
+    cursor = None
+    while True:
+        url = f"{base_url}?size=5" + (f"&cursor={cursor}" if cursor else "")
+        async with http_session.get(url) as resp:
+            assert resp.status == HTTPStatus.OK
+            seen.extend(p["uuid"] for p in await resp.json())
+            cursor = resp.headers.get("X-Next-Cursor")
+        if not cursor:
+            break
+
+    # Assert (все персоны без повторов)
+    assert len(seen) > 5
+    assert len(seen) == len(set(seen))
@@ -92,3 +92,23 @@ async def test_rate_limiting_with_jwt(http_session, redis_client):
         f"Ожидалось 5 успешных запросов, а было {ok_responses}"
     assert too_many_responses >= 1, \
         "Rate limiting не сработал с JWT → нет 429"
+
+
+@pytest.mark.asyncio
+async def test_rate_limit_headers(http_session, redis_client):
+    url = f"http://{settings.API_HOST}:{settings.API_PORT}/api/v1/ping"
+
+    await redis_client.flushdb()
+
+    async with http_session.get(url) as resp:
+        assert resp.status == HTTPStatus.OK
+        assert resp.headers["X-RateLimit-Limit"] == "5"
+        assert resp.headers["X-RateLimit-Remaining"] == "4"
+
+    for _ in range(5):
+        async with http_session.get(url) as resp:
+            pass
+
+    assert resp.status == HTTPStatus.TOO_MANY_REQUESTS
+    assert resp.headers["X-RateLimit-Remaining"] == "0"
+    assert int(resp.headers["Retry-After"]) >= 1
@@ -18,7 +18,7 @@ logger = logging.getLogger(__name__)
     max_delay=settings.WAIT_MAX_DELAY,
 )
 async def _check_api():
-    url = f"http://{settings.API_HOST}:{settings.API_PORT}/api/openapi"
+    url = f"http://{settings.API_HOST}:{settings.API_PORT}/health/ready"
     timeout = aiohttp.ClientTimeout(total=3)
     async with aiohttp.ClientSession(timeout=timeout) as session:
         async with session.get(url) as resp:
@@ -0,0 +1,106 @@
+import asyncio
+
+import pytest
+from services.utils.batch_loader import BatchLoader
+
+
+class Backend:
+    """load_many, который запоминает пачки ключей."""
+
+    def __init__(self, fail: Exception | None = None):
+        self.batches = []
+        self.fail = fail
+
+    async def __call__(self, keys):
+        self.batches.append(list(keys))
+        if self.fail is not None:
+            raise self.fail
+        return [f"value-{key}" for key in keys]
+
+
+@pytest.mark.asyncio
+async def test_window_collects_concurrent_loads_into_one_batch():
+    loader = BatchLoader(window=0.01, max_keys=50)
+    backend = Backend()
+
+    results = await asyncio.gather(*(loader.load(key, backend) for key in (1, 2, 3)))
+
+    assert results == ["value-1", "value-2", "value-3"]
+    assert backend.batches == [[1, 2, 3]]
+
+
+@pytest.mark.asyncio
+async def test_loads_after_window_go_to_next_batch():
+    loader = BatchLoader(window=0.01, max_keys=50)
+    backend = Backend()
+
+    first = await loader.load(1, backend)
+    second = await loader.load(2, backend)
+
+    assert (first, second) == ("value-1", "value-2")
+    assert backend.batches == [[1], [2]]
+
+
+@pytest.mark.asyncio
+async def test_duplicate_keys_are_loaded_once():
+    loader = BatchLoader(window=0.01, max_keys=50)
+    backend = Backend()
+
+    results = await asyncio.gather(loader.load("a", backend), loader.load("a", backend))
+
+    assert results == ["value-a", "value-a"]
+    assert backend.batches == [["a"]]
+
+
+@pytest.mark.asyncio
+async def test_max_keys_flushes_before_window():
+    loader = BatchLoader(window=10, max_keys=2)
+    backend = Backend()
+
+    results = await asyncio.wait_for(
+        asyncio.gather(*(loader.load(key, backend) for key in (1, 2, 3, 4))), timeout=1
+    )
+
+    assert results == ["value-1", "value-2", "value-3", "value-4"]
+    assert backend.batches == [[1, 2], [3, 4]]
+
+
+@pytest.mark.asyncio
+async def test_backend_error_reaches_every_waiter():
+    loader = BatchLoader(window=0.01, max_keys=50)
+    backend = Backend(fail=ConnectionError("es down"))
+
+    results = await asyncio.gather(
+        loader.load(1, backend), loader.load(2, backend), return_exceptions=True
+    )
+
+    assert all(isinstance(r, ConnectionError) for r in results)
+    assert backend.batches == [[1, 2]]
+
+
+@pytest.mark.asyncio
+async def test_wrong_number_of_values_fails_the_batch():
+    loader = BatchLoader(window=0.01, max_keys=50)
+
+    async def short(keys):
+        return keys[:1]
+
+    results = await asyncio.gather(
+        loader.load(1, short), loader.load(2, short), return_exceptions=True
+    )
+
+    assert all(isinstance(r, RuntimeError) for r in results)
+
+
+@pytest.mark.asyncio
+async def test_cancelled_waiter_does_not_cancel_others():
+    loader = BatchLoader(window=0.01, max_keys=50)
+    backend = Backend()
+
+    cancelled = asyncio.create_task(loader.load(1, backend))
+    other = asyncio.create_task(loader.load(1, backend))
+    await asyncio.sleep(0)
+    cancelled.cancel()
+
+    assert await other == "value-1"
+    assert backend.batches == [[1]]
@@ -0,0 +1,104 @@
+import math
+
+import pytest
+from services.base import BaseService
+from services.cache import entry as entry_module
+from services.cache.codecs import CacheCodec
+from services.cache.entry import NOT_FOUND, CacheEntry
+
+NOW = 1_000_000.0
+
+
+@pytest.fixture
+def clock(monkeypatch):
+    monkeypatch.setattr(entry_module.time, "time", lambda: NOW)
+
+
+def draw(monkeypatch, value: float) -> None:
+    """Подставить результат random.random() для XFetch."""
+    monkeypatch.setattr(entry_module.random, "random", lambda: value)
+
+
+def threshold(ttl_left: float, delta: float, beta: float) -> float:
+    """random(), начиная с которого XFetch решает обновить заранее."""
+    return 1.0 - math.exp(-ttl_left / (delta * beta))
+
+
+def test_fresh_entry_is_not_refreshed_without_beta(clock):
+    entry = CacheEntry(value=1, expires_at=NOW + 0.001, delta=5.0)
+
+    assert not entry.is_stale
+    assert not entry.should_refresh(beta=0.0)
+
+
+@pytest.mark.parametrize("beta", [0.0, 1.0])
+def test_soft_expiry_boundary_is_stale(clock, monkeypatch, beta):
+    draw(monkeypatch, 0.0)
+    entry = CacheEntry(value=1, expires_at=NOW, delta=1.0)
+
+    assert entry.is_stale
+    assert entry.ttl_left == 0
+    assert entry.should_refresh(beta=beta)
+
+
+def test_zero_draw_never_refreshes_early(clock, monkeypatch):
+    draw(monkeypatch, 0.0)
+    entry = CacheEntry(value=1, expires_at=NOW + 0.001, delta=100.0)
+
+    assert not entry.should_refresh(beta=10.0)
+
+
+@pytest.mark.parametrize("ttl_left, delta, beta", [(10, 2, 1.0), (10, 2, 2.0), (1, 0.5, 1.0)])
+def test_early_refresh_starts_at_xfetch_threshold(clock, monkeypatch, ttl_left, delta, beta):
+    entry = CacheEntry(value=1, expires_at=NOW + ttl_left, delta=delta)
+    edge = threshold(ttl_left, delta, beta)
+
+    draw(monkeypatch, edge - 1e-6)
+    assert not entry.should_refresh(beta)
+
+    draw(monkeypatch, edge + 1e-6)
+    assert entry.should_refresh(beta)
+
+
+def test_refresh_probability_grows_towards_expiry():
+    # P(refresh) = 1 - exp(-ttl_left / (delta * beta))
+    far, near = threshold(30, 1, 1.0), threshold(1, 1, 1.0)
+
+    assert 1 - far < 1e-12
+    assert 1 - near == pytest.approx(math.exp(-1))
+    # более дорогой пересчёт обновляется раньше
+    assert threshold(5, 10, 1.0) < threshold(5, 1, 1.0)
+
+
+def test_zero_delta_disables_early_refresh(clock, monkeypatch):
+    draw(monkeypatch, 0.999999)
+    entry = CacheEntry(value=1, expires_at=NOW + 0.001, delta=0.0)
+
+    assert not entry.should_refresh(beta=1.0)
+
+
+def test_envelope_round_trip_and_legacy_value():
+    entry = CacheEntry(value={"uuid": "1"}, expires_at=NOW, delta=0.25)
+
+    assert CacheEntry.load(entry.dump()) == entry
+    legacy = CacheEntry.load({"uuid": "1"})
+    assert legacy.value == {"uuid": "1"}
+    assert legacy.expires_at == math.inf
+    assert not legacy.should_refresh(beta=1.0)
+
+
+def test_hard_expiry_covers_stale_window(clock):
+    service = BaseService(cache=None, search=None, ttl=60, stale_ttl=30, codec=CacheCodec())
+    service.negative_ttl = 5
+
+    data, ex = service._encode_entry({"uuid": "1"}, delta=0.5)
+    entry = CacheEntry.load(service.codec.decode(data))
+    assert ex == 90
+    assert entry.expires_at == NOW + 60
+    assert entry.delta == 0.5
+
+    data, ex = service._encode_entry(None)
+    entry = CacheEntry.load(service.codec.decode(data))
+    assert ex == 5
+    assert entry.value == NOT_FOUND
+    assert entry.expires_at == NOW + 5
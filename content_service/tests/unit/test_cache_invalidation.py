@@ -0,0 +1,147 @@
+import cache_invalidation
+import pytest
+from services.cache import invalidation
+from services.cache.invalidation import CacheInvalidationListener, tag_entry, tag_key
+from services.cache.local_cache import MISSING, LocalCache
+
+STREAM = "catalog:changes"
+L1_KEYS = ("film:uuid=f1", "list_films_page:page=1", "film:uuid=f2")
+
+
+def _seq(entry_id) -> int:
+    if isinstance(entry_id, bytes):
+        entry_id = entry_id.decode()
+    return int(entry_id.split("-")[0])
+
+
+class FakeStreamRedis:
+    """Поток Redis: id вида N-0, поля приходят bytes, как из redis-py."""
+
+    def __init__(self):
+        self.entries = []
+
+    def add(self, fields: dict):
+        entry_id = f"{len(self.entries) + 1}-0".encode()
+        self.entries.append((entry_id, {k.encode(): v.encode() for k, v in fields.items()}))
+
+    async def xrevrange(self, stream, count=None):
+        return list(reversed(self.entries))[:count]
+
+    async def xread(self, streams, block=None, count=None):
+        after = _seq(streams[STREAM])
+        new = [entry for entry in self.entries if _seq(entry[0]) > after][:count]
+        return [(STREAM.encode(), new)] if new else []
+
+
+class FakeEtlRedis:
+    """Синхронный клиент ETL: теги ztag:<uuid> и XADD в тот же поток."""
+
+    def __init__(self, stream: FakeStreamRedis, tags: dict[str, dict[str, float]]):
+        self.stream = stream
+        self.tags = tags
+
+    def pipeline(self, transaction=True):
+        return FakePipeline(self.tags)
+
+    def unlink(self, *keys):
+        return len(keys)
+
+    def xadd(self, stream, fields, **kwargs):
+        self.stream.add(fields)
+
+
+class FakePipeline:
+    def __init__(self, tags):
+        self.tags = tags
+        self.requested = []
+
+    def zrangebyscore(self, tag, low, high):
+        self.requested.append((tag, low))
+
+    def execute(self):
+        return [
+            [key.encode() for key, score in self.tags.get(tag, {}).items() if score >= low]
+            for tag, low in self.requested
+        ]
+
+
+class FakeTagPipeline:
+    """ZADD / ZREMRANGEBYSCORE / EXPIRE тегов на словарях."""
+
+    def __init__(self):
+        self.zsets: dict[str, dict[str, float]] = {}
+        self.ttls: dict[str, int] = {}
+
+    def zadd(self, tag, mapping):
+        self.zsets.setdefault(tag, {}).update(mapping)
+
+    def zremrangebyscore(self, tag, low, high):
+        zset = self.zsets.get(tag, {})
+        for key in [key for key, score in zset.items() if score <= high]:
+            del zset[key]
+
+    def expire(self, tag, ex, nx=False, gt=False):
+        current = self.ttls.get(tag)
+        if (nx and current is None) or (gt and current is not None and ex > current):
+            self.ttls[tag] = ex
+
+
+@pytest.fixture
+def local():
+    cache = LocalCache(max_entries=100, ttl=60)
+    for key in L1_KEYS:
+        cache.set(key, {"cached": key})
+    return cache
+
+
+def _cached(local: LocalCache) -> list[str]:
+    return [key for key in L1_KEYS if local.get(key) is not MISSING]
+
+
+def test_apply_evicts_listed_keys(local):
+    listener = CacheInvalidationListener(FakeStreamRedis(), local=local, stream=STREAM)
+
+    evicted = listener.apply({b"keys": b'["film:uuid=f1", "list_films_page:page=1"]'})
+
+    assert evicted == 2
+    assert _cached(local) == ["film:uuid=f2"]
+
+
+@pytest.mark.asyncio
+async def test_read_once_applies_etl_events_once(local):
+    redis = FakeStreamRedis()
+    # событие до старта воркера не применяется: L1 в этот момент пуст
+    redis.add({"keys": '["film:uuid=f2"]'})
+    listener = CacheInvalidationListener(redis, local=local, stream=STREAM, block_ms=0)
+    assert await listener.read_once() == 0
+
+    # Act: событие в том формате, который публикует ETL
+    etl = FakeEtlRedis(
+        redis,
+        tags={"ztag:f1": {"list_films_page:page=1": float("inf"), "expired_page": 0.0}},
+    )
+    cache_invalidation.invalidate(["f1"], [], [], client=etl)
+    evicted = await listener.read_once()
+
+    # Assert
+    assert evicted == len(cache_invalidation.cache_keys(["f1"], [], [])) + 1
+    assert _cached(local) == ["film:uuid=f2"]
+    assert await listener.read_once() == 0
+
+
+def test_tag_drops_expired_keys_on_write(monkeypatch):
+    now = [1000.0]
+    monkeypatch.setattr(invalidation.time, "time", lambda: now[0])
+    pipe = FakeTagPipeline()
+    tag = tag_key("f1")
+
+    for page in range(100):
+        tag_entry(pipe, f"list_films_page:page={page}", ["f1"], ex=60)
+        now[0] += 1
+
+    # в теге только ключи, записанные за последний TTL
+    assert list(pipe.zsets[tag]) == [f"list_films_page:page={page}" for page in range(40, 100)]
+    assert pipe.ttls[tag] == 60
+
+    tag_entry(pipe, "film:uuid=f1", ["f1"], ex=300)
+    assert pipe.ttls[tag] == 300
@@ -0,0 +1,79 @@
+import json
+
+import pytest
+from services.cache.codecs import CODECS, COMPRESSORS, HEADER_SIZE, MAGIC, CacheCodec
+
+VALUE = {
+    "uuid": "0b5a7c1e-3f5d-4a8c-9e26-0c1f1b1d9a01",
+    "title": "Звёздные войны",
+    "imdb_rating": 8.6,
+    "genres": [{"uuid": "g1", "name": "Sci-Fi"}] * 50,
+    "description": None,
+}
+
+
+@pytest.mark.parametrize("compression", ["none", *COMPRESSORS])
+@pytest.mark.parametrize("codec", list(CODECS))
+def test_round_trip_with_header(codec, compression):
+    cache_codec = CacheCodec(codec=codec, compression=compression, threshold=0)
+
+    data = cache_codec.encode(VALUE)
+
+    assert data[0] == MAGIC
+    assert data[1] == cache_codec.codec.id
+    assert data[2] == (0 if compression == "none" else cache_codec.compressor.id)
+    assert cache_codec.decode(data) == VALUE
+
+
+@pytest.mark.parametrize("compression", list(COMPRESSORS))
+@pytest.mark.parametrize("codec", list(CODECS))
+def test_reader_decodes_other_writers_format(codec, compression):
+    writer = CacheCodec(codec=codec, compression=compression, threshold=0)
+    reader = CacheCodec(codec="json")
+
+    assert reader.decode(writer.encode(VALUE)) == VALUE
+
+
+@pytest.mark.parametrize("raw", [json.dumps(VALUE), json.dumps(VALUE).encode()])
+def test_legacy_untagged_json_is_decoded(raw):
+    assert CacheCodec(codec="msgpack", compression="zstd").decode(raw) == VALUE
+
+
+def test_small_payload_is_not_compressed():
+    cache_codec = CacheCodec(codec="orjson", compression="zstd", threshold=1024)
+
+    small = cache_codec.encode({"uuid": "x"})
+    large = cache_codec.encode(VALUE)
+
+    assert small[2] == 0
+    assert small[HEADER_SIZE:] == cache_codec.codec.dumps({"uuid": "x"})
+    assert large[2] == cache_codec.compressor.id
+    assert len(large) < len(cache_codec.codec.dumps(VALUE)) + HEADER_SIZE
+
+
+def test_payload_at_threshold_is_compressed():
+    cache_codec = CacheCodec(codec="orjson", compression="lz4")
+    cache_codec.threshold = len(cache_codec.codec.dumps(VALUE))
+
+    assert cache_codec.encode(VALUE)[2] == cache_codec.compressor.id
+
+
+@pytest.mark.parametrize(
+    "header, message",
+    [
+        (bytes((MAGIC, 99, 0)), "кодека"),
+        (bytes((MAGIC, 1, 99)), "сжатия"),
+    ],
+)
+def test_unknown_ids_are_rejected(header, message):
+    with pytest.raises(ValueError, match=message):
+        CacheCodec().decode(header + b"{}")
+
+
+@pytest.mark.parametrize(
+    "kwargs",
+    [{"codec": "pickle"}, {"compression": "gzip"}],
+)
+def test_unknown_settings_are_rejected(kwargs):
+    with pytest.raises(ValueError):
+        CacheCodec(**kwargs)
@@ -0,0 +1,62 @@
+from uuid import uuid4
+
+import pytest
+from api.v1.pagination import parse_cursor
+from services.genres.genre_fetchers import fetch_genres_page
+from services.persons.persons_fetchers import fetch_persons_page
+
+
+class FakeService:
+    """Отдаёт заранее заданные страницы и запоминает запросы."""
+
+    def __init__(self, pages):
+        self.pages = list(pages)
+        self.bodies = []
+
+    async def search_index(self, index, body):
+        self.bodies.append(body)
+        return {"hits": {"hits": self.pages.pop(0)}}
+
+
+def _hits(field, count):
+    docs = [{"uuid": str(uuid4()), field: f"{field}-{n}"} for n in range(count)]
+    return [{"_source": doc, "sort": [doc[field], doc["uuid"]]} for doc in docs]
+
+
+DIRECTORIES = [
+    (fetch_genres_page, "name", "name.raw"),
+    (fetch_persons_page, "full_name", "full_name.raw"),
+]
+
+
+@pytest.mark.asyncio
+@pytest.mark.parametrize("fetch, field, sort_field", DIRECTORIES)
+async def test_cursor_pages_use_search_after(fetch, field, sort_field):
+    first_hits = _hits(field, 2)
+    service = FakeService([first_hits, _hits(field, 1)])
+
+    first = await fetch(service, 1, 2)
+    cursor = parse_cursor(first.next_cursor)
+    last = await fetch(service, 1, 2, cursor)
+
+    first_body, second_body = service.bodies
+    assert [next(iter(s)) for s in first_body["sort"]] == [sort_field, "uuid"]
+    assert first_body["from"] == 0
+    assert "aggs" not in first_body
+    assert cursor.search_after == first_hits[-1]["sort"]
+    assert second_body["search_after"] == first_hits[-1]["sort"]
+    assert "from" not in second_body
+    assert last.next_cursor is None
+
+
+@pytest.mark.asyncio
+@pytest.mark.parametrize("fetch, field, sort_field", DIRECTORIES)
+async def test_page_without_cursor_uses_from_and_returns_cursor(fetch, field, sort_field):
+    hits = _hits(field, 3)
+    service = FakeService([hits])
+
+    page = await fetch(service, 3, 3)
+
+    assert service.bodies[0]["from"] == 6
+    assert [getattr(item, field) for item in page.items] == [h["_source"][field] for h in hits]
+    assert parse_cursor(page.next_cursor).search_after == hits[-1]["sort"]
@@ -0,0 +1,117 @@
+from uuid import uuid4
+
+import pytest
+from api.v1.pagination import parse_cursor
+from elasticsearch import NotFoundError
+from services.films import film_fetchers
+from services.utils.cursor import Cursor
+from services.utils.pagination import PIT_TIEBREAKER_AFTER, PIT_TIEBREAKER_SORT
+
+
+class FakeService:
+    """
+    Отдаёт заранее заданные страницы и запоминает операции с PIT.
+
+    Как и ES, при поиске по PIT дописывает к sort каждого хита _shard_doc
+    и проверяет, что search_after совпадает по длине с sort запроса.
+    expired — id снимков, на которые ES ответит 404.
+    """
+
+    def __init__(self, pages, expired=()):
+        self.pages = list(pages)
+        self.expired = set(expired)
+        self.bodies = []
+        self.opened = []
+        self.closed = []
+
+    async def open_pit(self, index, keep_alive):
+        pit_id = f"pit-{len(self.opened) + 1}"
+        self.opened.append(pit_id)
+        return pit_id
+
+    async def close_pit(self, pit_id):
+        self.closed.append(pit_id)
+
+    async def search_index(self, index, body):
+        self.bodies.append(body)
+        if "search_after" in body:
+            assert len(body["search_after"]) == len(body["sort"])
+        pit = body.get("pit")
+        if pit is None:
+            return {"hits": {"hits": self.pages.pop(0)}}
+
+        if pit["id"] in self.expired:
+            raise NotFoundError("search_phase_execution_exception", None, {})
+        assert body["sort"][-1] == PIT_TIEBREAKER_SORT
+        hits = [{**hit, "sort": [*hit["sort"], n]} for n, hit in enumerate(self.pages.pop(0))]
+        return {"pit_id": pit["id"], "hits": {"hits": hits}}
+
+
+def _hits(count):
+    ids = [str(uuid4()) for _ in range(count)]
+    return [{"_source": {"uuid": i, "title": i, "imdb_rating": 5.0}, "sort": [5.0, i]} for i in ids]
+
+
+@pytest.fixture(autouse=True)
+def pit_enabled(monkeypatch):
+    monkeypatch.setattr(film_fetchers.settings, "elastic_pit_keep_alive", "1m")
+
+
+@pytest.mark.asyncio
+async def test_first_page_does_not_open_pit():
+    service = FakeService([_hits(2)])
+
+    page = await film_fetchers.fetch_films_page(service, 1, 2, "-imdb_rating")
+
+    assert service.opened == []
+    assert "pit" not in service.bodies[0]
+    assert Cursor.decode(page.next_cursor).pit_id is None
+
+
+@pytest.mark.asyncio
+async def test_pit_opened_on_cursor_and_closed_on_last_page():
+    service = FakeService([_hits(2), _hits(1)])
+
+    second = await film_fetchers.fetch_films_page(
+        service, 1, 2, "-imdb_rating", Cursor([5.0, str(uuid4())])
+    )
+    last = await film_fetchers.fetch_films_page(
+        service, 1, 2, "-imdb_rating", Cursor.decode(second.next_cursor)
+    )
+
+    assert service.opened == ["pit-1"]
+    assert service.bodies[1]["pit"]["id"] == "pit-1"
+    assert last.next_cursor is None
+    assert service.closed == ["pit-1"]
+
+
+@pytest.mark.asyncio
+async def test_pit_cursor_keeps_only_declared_sort_keys():
+    service = FakeService([_hits(2), _hits(2), _hits(2)])
+    cursor = Cursor([5.0, str(uuid4())])
+
+    for _ in range(3):
+        page = await film_fetchers.fetch_films_page(service, 1, 2, "-imdb_rating", cursor)
+        # тот же разбор, что в роутере: курсор с _shard_doc вернул бы 400
+        cursor = parse_cursor(page.next_cursor)
+        assert cursor.pit_id == "pit-1"
+        assert cursor.search_after == [5.0, str(page.items[-1].uuid)]
+
+    assert service.opened == ["pit-1"]
+    assert service.bodies[2]["search_after"][-1] == PIT_TIEBREAKER_AFTER
+
+
+@pytest.mark.asyncio
+async def test_expired_pit_falls_back_to_live_index():
+    service = FakeService([_hits(2)], expired={"pit-old"})
+    cursor = Cursor([5.0, str(uuid4())], "pit-old")
+
+    page = await film_fetchers.fetch_films_page(service, 1, 2, "-imdb_rating", cursor)
+
+    fallback = service.bodies[1]
+    assert "pit" not in fallback
+    assert fallback["search_after"] == cursor.search_after
+    assert PIT_TIEBREAKER_SORT not in fallback["sort"]
+    next_cursor = parse_cursor(page.next_cursor)
+    assert next_cursor.pit_id is None
+    assert len(next_cursor.search_after) == 2
@@ -0,0 +1,120 @@
+import asyncio
+from uuid import uuid4
+
+import pytest
+from api.v1 import search
+from dependencies import get_response_cache, get_search_service
+from fastapi import FastAPI
+from fastapi.testclient import TestClient
+from models.film_short import FilmShort
+from models.genre import Genre
+from services.cache.local_cache import LocalCache
+from services.cache.response_cache import ResponseCache
+from services.global_search.search_service import SearchService
+
+FILM = FilmShort(uuid=uuid4(), title="Star Wars", imdb_rating=8.6)
+GENRE = Genre(uuid=uuid4(), name="Sci-Fi")
+
+
+class FakeRedis:
+    """GET/SET ответа; пайплайн тегов не нужен — инвалидация выключена."""
+
+    def __init__(self):
+        self.data = {}
+
+    async def get(self, key):
+        return self.data.get(key)
+
+    async def set(self, key, value, ex=None):
+        self.data[key] = value
+
+
+class Section:
+    """Секция поиска: отдаёт результат, падает или не успевает к дедлайну."""
+
+    def __init__(self, result=None, fail: Exception | None = None, delay: float = 0.0):
+        self.result = result if result is not None else []
+        self.fail = fail
+        self.delay = delay
+        self.calls = 0
+
+    async def __call__(self, query, page=1, size=10):
+        self.calls += 1
+        await asyncio.sleep(self.delay)
+        if self.fail is not None:
+            raise self.fail
+        return self.result
+
+
+class Services:
+    def __init__(self, films: Section, persons: Section, genres: Section):
+        self.search_films = films
+        self.search_persons = persons
+        self.search_genres = genres
+
+
+@pytest.fixture(autouse=True)
+def no_invalidation_tags(monkeypatch):
+    monkeypatch.setattr("services.cache.response_cache.settings.cache_invalidation_enabled", False)
+
+
+def make_client(persons: Section, genres: Section | None = None):
+    services = Services(Section([FILM]), persons, genres or Section([GENRE]))
+    redis = FakeRedis()
+    search_service = SearchService(
+        cache=None,
+        search=None,
+        film_service=services,
+        person_service=services,
+        genre_service=services,
+        section_timeout=0.05,
+    )
+
+    app = FastAPI()
+    app.include_router(search.router, prefix="/api/v1/search")
+    app.dependency_overrides[get_search_service] = lambda: search_service
+    app.dependency_overrides[get_response_cache] = lambda: ResponseCache(
+        cache=redis, ttl=10, local=LocalCache(max_entries=100, ttl=10)
+    )
+    return TestClient(app), redis, services
+
+
+def test_failed_section_gives_partial_uncached_response():
+    client, redis, services = make_client(persons=Section(fail=RuntimeError("es down")))
+
+    for _ in range(2):
+        resp = client.get("/api/v1/search/", params={"query": "star"})
+        body = resp.json()
+
+        assert resp.status_code == 200
+        assert resp.headers["X-Cache"] == "MISS"
+        assert body["partial"] == ["persons"]
+        assert body["persons"] == []
+        assert [film["uuid"] for film in body["films"]] == [str(FILM.uuid)]
+        assert [genre["name"] for genre in body["genres"]] == ["Sci-Fi"]
+
+    assert redis.data == {}
+    assert services.search_persons.calls == 2
+
+
+def test_slow_section_is_reported_as_partial():
+    client, redis, _ = make_client(persons=Section(), genres=Section([GENRE], delay=1))
+
+    body = client.get("/api/v1/search/", params={"query": "star"}).json()
+
+    assert body["partial"] == ["genres"]
+    assert body["genres"] == []
+    assert redis.data == {}
+
+
+def test_complete_response_is_cached():
+    client, redis, services = make_client(persons=Section())
+
+    first = client.get("/api/v1/search/", params={"query": "star"})
+    second = client.get("/api/v1/search/", params={"query": "star"})
+
+    assert first.json()["partial"] == []
+    assert (first.headers["X-Cache"], second.headers["X-Cache"]) == ("MISS", "HIT")
+    assert second.content == first.content
+    assert len(redis.data) == 1
+    assert services.search_films.calls == 1
@@ -0,0 +1,79 @@
+import json
+
+import pytest
+from utils import jwt as jwt_utils
+
+OLD_JWKS = {"keys": [{"kty": "oct", "kid": "old", "k": "b2xkLXNlY3JldA", "alg": "HS256"}]}
+NEW_JWKS = {"keys": [{"kty": "oct", "kid": "new", "k": "bmV3LXNlY3JldA", "alg": "HS256"}]}
+
+
+class FakeCache:
+    def __init__(self, data=None):
+        self.data = dict(data or {})
+
+    async def get(self, key):
+        return self.data.get(key)
+
+    async def set(self, key, value, ex=None):
+        self.data[key] = value
+
+
+@pytest.fixture
+def auth_jwks(monkeypatch):
+    """Auth отдаёт NEW_JWKS; считаем обращения к нему."""
+    calls = []
+
+    class Response:
+        def raise_for_status(self):
+            pass
+
+        def json(self):
+            return NEW_JWKS
+
+    class Client:
+        def __init__(self, *args, **kwargs):
+            pass
+
+        async def __aenter__(self):
+            return self
+
+        async def __aexit__(self, *exc):
+            return False
+
+        async def get(self, url):
+            calls.append(url)
+            return Response()
+
+    monkeypatch.setattr(jwt_utils.httpx, "AsyncClient", Client)
+    return calls
+
+
+@pytest.mark.asyncio
+async def test_unknown_kid_bypasses_stale_redis_copy(auth_jwks):
+    # Arrange: в Redis JWKS до ротации ключа
+    cache = FakeCache({jwt_utils.JWKS_CACHE_KEY: json.dumps(OLD_JWKS)})
+    keyring = jwt_utils.JWKSKeyring()
+    await keyring.refresh(cache)
+    assert keyring.kids == ["old"]
+
+    # Act
+    key = await keyring.get_key("new", cache)
+
+    # Assert
+    assert key is not None
+    assert len(auth_jwks) == 1
+    assert json.loads(cache.data[jwt_utils.JWKS_CACHE_KEY]) == NEW_JWKS
+
+
+@pytest.mark.asyncio
+async def test_unknown_kids_refetch_globally_throttled(auth_jwks):
+    # Arrange
+    cache = FakeCache()
+    keyring = jwt_utils.JWKSKeyring(refetch_interval=60)
+
+    # Act: разные случайные kid подряд
+    for kid in ("random-1", "random-2", "random-3"):
+        assert await keyring.get_key(kid, cache) is None
+
+    # Assert
+    assert len(auth_jwks) == 1
@@ -0,0 +1,184 @@
+import json
+from contextlib import nullcontext
+
+import loader
+import pytest
+
+
+class FakeCheckpoint:
+    def __init__(self):
+        self.saved = []
+
+    def save(self, index_name, offset, loaded):
+        self.saved.append((offset, loaded))
+
+
+class Bulk:
+    """
+    helpers.streaming_bulk поверх индекса-словаря: _id из reject отклоняются
+    с 400, повторный _id даёт updated, после fail_after пачек — обрыв.
+    """
+
+    def __init__(self, reject=(), fail_after=None):
+        self.reject = set(reject)
+        self.fail_after = fail_after
+        self.sent = []
+        self.docs = {}
+
+    def __call__(self, client, actions, **kwargs):
+        if self.fail_after is not None and len(self.sent) >= self.fail_after:
+            raise RuntimeError("killed")
+        actions = list(actions)
+        self.sent.append([a["_id"] for a in actions])
+        for a in actions:
+            if a["_id"] in self.reject:
+                # ES-клиент 8.x с raise_on_error=False не кладёт "data" в элемент ошибки
+                yield False, {"index": {"_id": a["_id"], "status": 400, "error": "mapper"}}
+                continue
+            result = "updated" if a["_id"] in self.docs else "created"
+            self.docs[a["_id"]] = a["_source"]
+            yield True, {"index": {"_id": a["_id"], "result": result}}
+
+
+@pytest.fixture
+def bulk_file(tmp_path, monkeypatch):
+    path = tmp_path / "bulk.json"
+    with open(path, "w", encoding="utf-8") as f:
+        for i in range(6):
+            f.write(json.dumps({"index": {"_index": "movies", "_id": f"id-{i}"}}) + "\n")
+            f.write(json.dumps({"uuid": f"id-{i}", "title": f"Film {i}"}) + "\n")
+
+    # чекпоинты и dead-letter по умолчанию лежат в data/ рабочего каталога
+    (tmp_path / "data").mkdir()
+    monkeypatch.chdir(tmp_path)
+    monkeypatch.setattr(loader, "BULK_CHUNK_SIZE", 2)
+    monkeypatch.setattr(loader, "bulk_indexing_settings", lambda index_name: nullcontext())
+    return str(path)
+
+
+def _dead_letters(tmp_path):
+    path = tmp_path / loader.DEAD_LETTER_FILE
+    if not path.exists():
+        return []
+    return [json.loads(line) for line in path.read_text(encoding="utf-8").splitlines()]
+
+
+def test_progress_saves_only_contiguous_prefix(tmp_path):
+    (tmp_path / "data").mkdir()
+    checkpoint = FakeCheckpoint()
+    dead_letter = loader.DeadLetter(str(tmp_path / loader.DEAD_LETTER_FILE))
+    progress = loader._Progress(checkpoint, "movies", 0, 0, dead_letter)
+    rejected = [{"index": {"_id": "x", "status": 400}}]
+
+    progress.complete(1, 200, 2, rejected, [{"_id": "x", "_source": {"uuid": "x"}}])
+    progress.complete(2, 300, 2, [], [])
+    assert checkpoint.saved == []
+    assert _dead_letters(tmp_path) == []
+
+    progress.complete(0, 100, 2, [], [])
+    assert checkpoint.saved == [(300, 6)]
+    assert [r["_id"] for r in _dead_letters(tmp_path)] == ["x"]
+
+
+def test_dead_letter_keeps_source_document(tmp_path, bulk_file, monkeypatch):
+    monkeypatch.setattr(loader.helpers, "streaming_bulk", Bulk(reject={"id-3"}))
+
+    loaded = loader.load_bulk(bulk_file, "movies_v1", threads=2)
+
+    assert loaded == 5
+    [record] = _dead_letters(tmp_path)
+    assert record["_id"] == "id-3"
+    assert record["status"] == 400
+    assert record["doc"] == {"uuid": "id-3", "title": "Film 3"}
+
+
+def test_resume_continues_after_checkpoint(tmp_path, bulk_file, monkeypatch):
+    first = Bulk(reject={"id-1"}, fail_after=2)
+    monkeypatch.setattr(loader.helpers, "streaming_bulk", first)
+    with pytest.raises(RuntimeError):
+        loader.load_bulk(bulk_file, "movies_v1", threads=1)
+    assert loader.LoadCheckpoint(bulk_file).get()["loaded"] == 3
+
+    second = Bulk(reject={"id-1"})
+    monkeypatch.setattr(loader.helpers, "streaming_bulk", second)
+    loaded = loader.load_bulk(bulk_file, "movies_v1", threads=1)
+
+    assert first.sent == [["id-0", "id-1"], ["id-2", "id-3"]]
+    assert second.sent == [["id-4", "id-5"]]
+    assert loaded == 5
+    assert [r["_id"] for r in _dead_letters(tmp_path)] == ["id-1"]
+    assert loader.LoadCheckpoint(bulk_file).get() is None
+
+
+def test_docs_from_memory_use_dead_letter_and_retries(tmp_path, monkeypatch):
+    (tmp_path / "data").mkdir()
+    monkeypatch.chdir(tmp_path)
+    monkeypatch.setattr(loader, "BULK_CHUNK_SIZE", 2)
+    monkeypatch.setattr(loader, "bulk_indexing_settings", lambda index_name: nullcontext())
+    monkeypatch.setattr(loader.time, "sleep", lambda seconds: None)
+    bulk = Bulk(reject={"p-2"})
+    calls = []
+
+    def flaky(client, actions, **kwargs):
+        # первый запрос обрывается сетью, повтор проходит
+        calls.append(len(actions))
+        if len(calls) == 1:
+            raise loader.TransportError("connection reset")
+        return bulk(client, actions, **kwargs)
+
+    monkeypatch.setattr(loader.helpers, "streaming_bulk", flaky)
+    docs = [{"uuid": f"p-{i}", "full_name": f"Person {i}"} for i in range(5)]
+
+    loaded = loader.load_docs(docs, "persons_v1", threads=2)
+
+    assert loaded == 4
+    assert sorted(i for chunk in bulk.sent for i in chunk) == [f"p-{i}" for i in range(5)]
+    [record] = _dead_letters(tmp_path)
+    assert record["index"] == "persons_v1"
+    assert record["doc"] == {"uuid": "p-2", "full_name": "Person 2"}
+    assert not (tmp_path / loader.CHECKPOINT_FILE).exists()
+
+
+class FakeIndices:
+    def refresh(self, index):
+        pass
+
+
+class FakeEs:
+    """Хватает warm_index: count отдаёт число документов в Bulk-индексе."""
+
+    def __init__(self, bulk: Bulk):
+        self.bulk = bulk
+        self.indices = FakeIndices()
+
+    def search(self, **kwargs):
+        return {}
+
+    def count(self, index):
+        return {"count": len(self.bulk.docs)}
+
+
+def test_duplicate_id_counts_once_and_passes_warm_check(tmp_path, bulk_file, monkeypatch):
+    with open(bulk_file, "a", encoding="utf-8") as f:
+        f.write(json.dumps({"index": {"_index": "movies", "_id": "id-0"}}) + "\n")
+        f.write(json.dumps({"uuid": "id-0", "title": "Film 0, edited"}) + "\n")
+    bulk = Bulk()
+    monkeypatch.setattr(loader.helpers, "streaming_bulk", bulk)
+    monkeypatch.setattr(loader, "es", FakeEs(bulk))
+    monkeypatch.setattr(loader, "forcemerge", lambda index_name: True)
+
+    loaded = loader.load_bulk(bulk_file, "movies_v1", threads=1)
+
+    assert sum(len(chunk) for chunk in bulk.sent) == 7
+    assert loaded == 6
+    loader.warm_index("movies_v1", loaded)
+
+
+def test_warm_check_rejects_incomplete_index(monkeypatch):
+    bulk = Bulk()
+    bulk.docs = {"id-0": {}}
+    monkeypatch.setattr(loader, "es", FakeEs(bulk))
+    monkeypatch.setattr(loader, "forcemerge", lambda index_name: True)
+
+    with pytest.raises(RuntimeError, match="expected 2"):
+        loader.warm_index("movies_v1", 2)
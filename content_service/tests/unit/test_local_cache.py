@@ -0,0 +1,99 @@
+import pytest
+from services.cache import local_cache as local_cache_module
+from services.cache.local_cache import MISSING, LocalCache
+
+
+class Clock:
+    """Управляемый time.monotonic."""
+
+    def __init__(self):
+        self.now = 1000.0
+
+    def __call__(self) -> float:
+        return self.now
+
+
+@pytest.fixture
+def clock(monkeypatch):
+    clock = Clock()
+    monkeypatch.setattr(local_cache_module.time, "monotonic", clock)
+    return clock
+
+
+def test_evicts_least_recently_set_entry():
+    cache = LocalCache(max_entries=2, ttl=60)
+
+    cache.set("a", 1)
+    cache.set("b", 2)
+    cache.set("c", 3)
+
+    assert cache.get("a") is MISSING
+    assert (cache.get("b"), cache.get("c")) == (2, 3)
+    assert len(cache) == 2
+
+
+def test_get_refreshes_recency():
+    cache = LocalCache(max_entries=2, ttl=60)
+
+    cache.set("a", 1)
+    cache.set("b", 2)
+    cache.get("a")
+    cache.set("c", 3)
+
+    assert cache.get("b") is MISSING
+    assert (cache.get("a"), cache.get("c")) == (1, 3)
+
+
+def test_overwrite_refreshes_recency():
+    cache = LocalCache(max_entries=2, ttl=60)
+
+    cache.set("a", 1)
+    cache.set("b", 2)
+    cache.set("a", 10)
+    cache.set("c", 3)
+
+    assert cache.get("b") is MISSING
+    assert cache.get("a") == 10
+
+
+def test_entry_expires_after_ttl(clock):
+    cache = LocalCache(max_entries=10, ttl=5)
+    cache.set("a", 1)
+
+    clock.now += 4.9
+    assert cache.get("a") == 1
+
+    clock.now += 0.1
+    assert cache.get("a") is MISSING
+    assert len(cache) == 0
+
+
+def test_per_entry_ttl_is_capped_by_global_ttl(clock):
+    cache = LocalCache(max_entries=10, ttl=5)
+    cache.set("short", 1, ttl=1)
+    cache.set("long", 2, ttl=60)
+
+    clock.now += 1
+    assert cache.get("short") is MISSING
+    assert cache.get("long") == 2
+
+    clock.now += 4
+    assert cache.get("long") is MISSING
+
+
+def test_none_is_a_cached_value():
+    cache = LocalCache(max_entries=10, ttl=5)
+    cache.set("a", None)
+
+    assert cache.get("a") is None
+    assert cache.get("b") is MISSING
+
+
+@pytest.mark.parametrize("max_entries, ttl", [(0, 5), (10, 0)])
+def test_disabled_cache_stores_nothing(max_entries, ttl):
+    cache = LocalCache(max_entries=max_entries, ttl=ttl)
+    cache.set("a", 1)
+
+    assert not cache.enabled
+    assert cache.get("a") is MISSING
+    assert len(cache) == 0
@@ -0,0 +1,86 @@
+import json
+
+import outbox_consumer
+import postgres_to_es
+import pytest
+from loader import DeadLetter
+
+
+class FakeConn:
+    """psycopg2-соединение: with conn коммитит или откатывает, курсор отдаёт события."""
+
+    def __init__(self, events):
+        self.events = events
+        self.committed = False
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, *exc):
+        self.committed = exc_type is None
+        return False
+
+    def cursor(self, cursor_factory=None):
+        return FakeCursor(self.events)
+
+
+class FakeCursor:
+    def __init__(self, events):
+        self.events = events
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        return False
+
+    def execute(self, sql, params):
+        pass
+
+    def fetchall(self):
+        return self.events
+
+
+@pytest.fixture
+def catalog(monkeypatch, tmp_path):
+    """Два фильма в БД; ES отклоняет film-bad с ошибкой маппинга."""
+    sent = []
+
+    def bulk(client, actions, raise_on_error=True, **kwargs):
+        sent.extend(a["_id"] for a in actions)
+        errors = [
+            {"index": {"_id": a["_id"], "status": 400, "error": {"type": "mapper_parsing"}}}
+            for a in actions
+            if a["_id"] == "film-bad"
+        ]
+        assert not (errors and raise_on_error)
+        return len(actions) - len(errors), errors
+
+    monkeypatch.setattr(postgres_to_es.helpers, "bulk", bulk)
+    monkeypatch.setattr(
+        postgres_to_es,
+        "fetch_movies",
+        lambda cur, ids: [{"uuid": i, "title": i} for i in ids],
+    )
+    monkeypatch.setattr(
+        outbox_consumer, "affected_ids", lambda cur, source, ids: (set(ids), set(), set())
+    )
+    monkeypatch.setattr(outbox_consumer, "invalidate", lambda *ids: None)
+    monkeypatch.setattr(outbox_consumer, "dead_letter", DeadLetter(str(tmp_path / "dead.ndjson")))
+    return sent
+
+
+def test_rejected_document_does_not_block_batch(catalog, tmp_path):
+    events = [
+        {"entity": "filmwork", "entity_id": "film-bad"},
+        {"entity": "filmwork", "entity_id": "film-ok"},
+    ]
+    conn = FakeConn(events)
+
+    assert outbox_consumer.drain(conn) == 2
+
+    assert conn.committed
+    assert sorted(catalog) == ["film-bad", "film-ok"]
+    [record] = [json.loads(line) for line in open(tmp_path / "dead.ndjson", encoding="utf-8")]
+    assert record["_id"] == "film-bad"
+    assert record["doc"] == {"uuid": "film-bad", "title": "film-bad"}
@@ -0,0 +1,149 @@
+from datetime import UTC, datetime, timedelta
+
+import postgres_to_es
+import pytest
+
+START = datetime(2026, 1, 1, tzinfo=UTC)
+
+
+def ts(seconds: float) -> datetime:
+    return START + timedelta(seconds=seconds)
+
+
+class FakeCursor:
+    """Таблица {id: ts} с теми же условиями, что CHANGES_SQL и LATE_SQL."""
+
+    def __init__(self, rows: dict):
+        self.rows = rows
+
+    def execute(self, sql, params):
+        self.sql, self.params = sql, params
+
+    def fetchall(self):
+        ordered = sorted(((t, i) for i, t in self.rows.items()))
+        cp = datetime.fromisoformat(self.params[0])
+        if "make_interval" in self.sql:
+            window_start = cp - timedelta(seconds=self.params[1])
+            found = [
+                (t, i) for t, i in ordered if t > window_start and (t, i) <= (cp, self.params[3])
+            ]
+        else:
+            found = [(t, i) for t, i in ordered if (t, i) > (cp, self.params[1])]
+            found = found[: self.params[2]]
+        return [{"id": i, "ts": t} for t, i in found]
+
+
+@pytest.fixture
+def indexed(monkeypatch):
+    """id фильмов, отправленных на переиндексацию, по порядку."""
+    films = []
+    monkeypatch.setattr(
+        postgres_to_es, "affected_ids", lambda cur, source, ids: (set(ids), set(), set())
+    )
+    monkeypatch.setattr(
+        postgres_to_es, "reindex", lambda cur, f, p, g: films.extend(sorted(f)) or len(f)
+    )
+    monkeypatch.setattr(postgres_to_es, "invalidate", lambda *ids: None)
+    return films
+
+
+def test_late_commit_behind_checkpoint_is_indexed_once(tmp_path, indexed):
+    state = postgres_to_es.State(str(tmp_path / "state.json"))
+    source = postgres_to_es.SOURCES[0]
+    rows = {"b": ts(10)}
+    postgres_to_es.poll_source(FakeCursor(rows), state, source)
+
+    # транзакция со временем save() раньше чекпоинта закоммитилась позже
+    rows["a"] = ts(5)
+    postgres_to_es.poll_source(FakeCursor(rows), state, source)
+    postgres_to_es.poll_source(FakeCursor(rows), state, source)
+
+    assert indexed == ["b", "a"]
+    assert state.get(source.table)["id"] == "b"
+
+
+class CatalogCursor:
+    """Таблицы {table: {id: ts}} для IDS_SQL и LAST_CHANGE_SQL."""
+
+    def __init__(self, tables: dict):
+        self.tables = tables
+
+    def execute(self, sql, params=()):
+        self.sql, self.params = sql, params
+
+    def fetchall(self):
+        rows = next((r for t, r in self.tables.items() if f"FROM {t} " in self.sql), {})
+        if "DESC" in self.sql:
+            last = max(((t, i) for i, t in rows.items()), default=None)
+            return [{"id": last[1], "ts": last[0]}] if last else []
+        after, limit = self.params
+        return [{"id": i} for i in sorted(rows) if i > after][:limit]
+
+
+@pytest.fixture
+def rebuilds(monkeypatch):
+    """Перестройки алиасов: alias → документы, залитые в новую версию."""
+    targets = {"movies": ["movies_v1"], "persons": ["persons_v1"], "genres": []}
+    built = []
+
+    def rebuild_index(alias, mapping, load):
+        index_name = f"{alias}_v{len(built) + 10}"
+        built.append((alias, load(index_name)))
+        targets[alias] = [index_name]
+        return index_name
+
+    def fetch(cur, ids):
+        return [{"uuid": i} for i in ids]
+
+    monkeypatch.setattr(postgres_to_es, "BATCH_SIZE", 2)
+    monkeypatch.setattr(postgres_to_es, "alias_targets", lambda alias: list(targets[alias]))
+    monkeypatch.setattr(postgres_to_es, "rebuild_index", rebuild_index)
+    monkeypatch.setattr(
+        postgres_to_es, "load_docs", lambda docs, index_name: sorted(d["uuid"] for d in docs)
+    )
+    monkeypatch.setattr(
+        postgres_to_es,
+        "ALIAS_SOURCES",
+        tuple((alias, table, dict, fetch) for alias, table, _, _ in postgres_to_es.ALIAS_SOURCES),
+    )
+    return targets, built
+
+
+def test_foreign_aliases_are_rebuilt_from_postgres(tmp_path, rebuilds):
+    targets, built = rebuilds
+    state = postgres_to_es.State(str(tmp_path / "state.json"))
+    films = {f"f{i}": ts(i) for i in range(5)}
+    cur = CatalogCursor({"content_filmwork": films, "content_person": {"p1": ts(1)}})
+
+    postgres_to_es.sync_index_targets(cur, state)
+
+    assert built == [
+        ("movies", ["f0", "f1", "f2", "f3", "f4"]),
+        ("persons", ["p1"]),
+        ("genres", []),
+    ]
+    # каталог уже в новых версиях — опрос продолжит с последнего изменения
+    assert state.get("content_filmwork")["id"] == "f4"
+    assert state.get("content_person")["id"] == "p1"
+    assert state.get("content_genre") == postgres_to_es.EPOCH
+
+    postgres_to_es.sync_index_targets(cur, state)
+    assert len(built) == 3
+
+
+def test_rebuild_from_dump_does_not_reset_checkpoints(tmp_path, rebuilds):
+    targets, built = rebuilds
+    state = postgres_to_es.State(str(tmp_path / "state.json"))
+    tables = {}
+    postgres_to_es.sync_index_targets(CatalogCursor(tables), state)
+    state.set("content_filmwork", ts(10).isoformat(), "b", {})
+
+    # loader.py переключил movies на версию из JSON-дампа
+    targets["movies"] = ["movies_v20"]
+    tables["content_filmwork"] = {"b": ts(10)}
+    postgres_to_es.sync_index_targets(CatalogCursor(tables), state)
+
+    assert built[-1] == ("movies", ["b"])
+    assert len(built) == 4
+    assert state.get("content_filmwork")["id"] == "b"
+    assert state.owns("movies", targets["movies"])
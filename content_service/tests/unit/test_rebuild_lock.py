@@ -0,0 +1,90 @@
+import pytest
+from services.cache.rebuild_lock import RELEASE_SCRIPT, RebuildLock
+
+
+class FakeRedis:
+    """SET NX EX и скрипт освобождения лока поверх словаря с часами."""
+
+    def __init__(self):
+        self.now = 0.0
+        self.data: dict[str, tuple[str, float]] = {}
+
+    def _get(self, key):
+        item = self.data.get(key)
+        if item is None or item[1] <= self.now:
+            self.data.pop(key, None)
+            return None
+        return item[0]
+
+    async def get(self, key):
+        return self._get(key)
+
+    async def set(self, key, value, nx=False, ex=None):
+        if nx and self._get(key) is not None:
+            return None
+        self.data[key] = (value, self.now + ex)
+        return True
+
+    async def eval(self, script, numkeys, key, token):
+        assert script == RELEASE_SCRIPT
+        if self._get(key) == token:
+            del self.data[key]
+            return 1
+        return 0
+
+
+@pytest.mark.asyncio
+async def test_only_one_holder_at_a_time():
+    redis = FakeRedis()
+    first = RebuildLock(redis, "film:1", ttl=10)
+    second = RebuildLock(redis, "film:1", ttl=10)
+
+    assert await first.acquire()
+    assert not await second.acquire()
+
+    await first.release()
+    assert await second.acquire()
+
+
+@pytest.mark.asyncio
+async def test_expired_lock_can_be_taken_over():
+    redis = FakeRedis()
+    first = RebuildLock(redis, "film:1", ttl=10)
+    second = RebuildLock(redis, "film:1", ttl=10)
+
+    assert await first.acquire()
+    redis.now += 9.9
+    assert not await second.acquire()
+
+    redis.now += 0.1
+    assert await second.acquire()
+    assert await redis.get("lock:film:1") == second.token
+
+
+@pytest.mark.asyncio
+async def test_stale_holder_does_not_release_takeover_lock():
+    redis = FakeRedis()
+    first = RebuildLock(redis, "film:1", ttl=10)
+    second = RebuildLock(redis, "film:1", ttl=10)
+
+    await first.acquire()
+    redis.now += 10
+    await second.acquire()
+
+    await first.release()
+
+    assert await redis.get("lock:film:1") == second.token
+    assert not first.acquired
+
+
+@pytest.mark.asyncio
+async def test_release_without_acquire_is_noop():
+    redis = FakeRedis()
+    holder = RebuildLock(redis, "film:1", ttl=10)
+    other = RebuildLock(redis, "film:1", ttl=10)
+
+    await holder.acquire()
+    assert not await other.acquire()
+    await other.release()
+
+    assert await redis.get("lock:film:1") == holder.token
@@ -0,0 +1,77 @@
+import json
+
+import pytest
+from fastapi import APIRouter, Depends, FastAPI, Query, Request
+from fastapi.testclient import TestClient
+from services.cache.response_cache import HEADERS_MAGIC, ResponseCache, make_response_key
+
+
+def pagination(page: int = Query(1), size: int = Query(10)) -> dict:
+    return {"page": page, "size": size}
+
+
+@pytest.fixture
+def client() -> TestClient:
+    router = APIRouter()
+
+    @router.get("/films/search")
+    async def search(request: Request, query: str, paging: dict = Depends(pagination)):
+        return {"key": make_response_key(request)}
+
+    @router.get("/films/{film_id}")
+    async def details(film_id: str, request: Request):
+        return {"key": make_response_key(request)}
+
+    app = FastAPI()
+    app.include_router(router, prefix="/api/v1")
+    return TestClient(app)
+
+
+def key(client: TestClient, url: str) -> str:
+    return client.get(url).json()["key"]
+
+
+def test_key_uses_sorted_declared_params(client):
+    assert key(client, "/api/v1/films/search?size=5&query=star&page=2") == (
+        "response:/api/v1/films/search?page=2&query=star&size=5"
+    )
+
+
+def test_unknown_params_do_not_change_key(client):
+    plain = key(client, "/api/v1/films/search?query=star")
+
+    assert key(client, "/api/v1/films/search?query=star&x=1") == plain
+    assert key(client, "/api/v1/films/search?x=2&query=star&_=3") == plain
+    assert key(client, "/api/v1/films/f1?utm_source=mail") == "response:/api/v1/films/f1?"
+
+
+def test_dependency_params_are_part_of_key(client):
+    first = key(client, "/api/v1/films/search?query=star&page=1")
+    second = key(client, "/api/v1/films/search?query=star&page=2")
+
+    assert first != second
+
+
+def test_body_without_headers_is_stored_as_is():
+    body = b'[{"uuid":"1"}]'
+
+    assert ResponseCache._pack(body, None) == body
+    assert ResponseCache._pack(body, {}) == body
+    assert ResponseCache._unpack(body) == (body, {})
+
+
+def test_headers_round_trip_with_body():
+    body = b'[{"uuid":"1","title":"a\\nb"}]'
+    headers = {"X-Next-Cursor": "abc"}
+
+    raw = ResponseCache._pack(body, headers)
+
+    assert raw.startswith(HEADERS_MAGIC)
+    assert ResponseCache._unpack(raw) == (body, headers)
+
+
+def test_pre_rendered_json_never_looks_packed():
+    body = json.dumps({"films": []}).encode()
+
+    assert not body.startswith(HEADERS_MAGIC)
+    assert ResponseCache._unpack(body) == (body, {})
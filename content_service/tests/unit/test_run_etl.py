@@ -0,0 +1,71 @@
+import json
+from contextlib import nullcontext
+
+import loader
+import pytest
+import run_etl
+from catalog_indexes import CatalogAggregates
+from transform_old_to_new_data import stable_uuid
+
+
+def _film_id(n: int) -> str:
+    return stable_uuid("film", f"tt{n:07d}")
+
+
+@pytest.fixture
+def source_file(tmp_path, monkeypatch):
+    path = tmp_path / "movies.json"
+    with open(path, "w", encoding="utf-8") as f:
+        for n in range(6):
+            source = {"title": f"Film {n}", "genres": ["Drama"], "actors_names": ["Ann Lee"]}
+            f.write(json.dumps({"_id": f"tt{n:07d}", "_source": source}) + "\n")
+
+    (tmp_path / "data").mkdir()
+    monkeypatch.chdir(tmp_path)
+    monkeypatch.setattr(run_etl, "TRANSFORM_WORKERS", 1)
+    monkeypatch.setattr(loader, "BULK_CHUNK_SIZE", 2)
+    monkeypatch.setattr(loader, "bulk_indexing_settings", lambda index_name: nullcontext())
+    monkeypatch.setattr(loader.time, "sleep", lambda seconds: None)
+    return str(path)
+
+
+def _bulk(monkeypatch, reject=(), fail_first=False):
+    """streaming_bulk: отклоняет _id из reject, первый запрос может оборваться сетью."""
+    sent = []
+
+    def streaming_bulk(client, actions, **kwargs):
+        if fail_first and not sent:
+            sent.append(None)
+            raise loader.TransportError("connection reset")
+        actions = list(actions)
+        sent.append([a["_id"] for a in actions])
+        for a in actions:
+            if a["_id"] in reject:
+                yield False, {"index": {"_id": a["_id"], "status": 400, "error": "mapper"}}
+            else:
+                yield True, {"index": {"_id": a["_id"], "result": "created"}}
+
+    monkeypatch.setattr(loader.helpers, "streaming_bulk", streaming_bulk)
+    return sent
+
+
+def test_index_stage_retries_failed_request_and_dead_letters(tmp_path, source_file, monkeypatch):
+    sent = _bulk(monkeypatch, reject={_film_id(4)}, fail_first=True)
+    monkeypatch.setattr(run_etl, "MAX_REJECTED_RATIO", 0.5)
+
+    loaded = run_etl.run_pipeline("movies_v1", CatalogAggregates(), source_file)
+
+    assert loaded == 5
+    assert sent[0] is None
+    assert sorted(i for chunk in sent[1:] for i in chunk) == sorted(_film_id(n) for n in range(6))
+    [line] = (tmp_path / loader.DEAD_LETTER_FILE).read_text(encoding="utf-8").splitlines()
+    record = json.loads(line)
+    assert record["_id"] == _film_id(4)
+    assert record["doc"]["title"] == "Film 4"
+
+
+def test_too_many_rejected_docs_fail_rebuild(source_file, monkeypatch):
+    _bulk(monkeypatch, reject={_film_id(0)})
+
+    with pytest.raises(RuntimeError, match="1 of 6 docs rejected"):
+        run_etl.run_pipeline("movies_v1", CatalogAggregates(), source_file)
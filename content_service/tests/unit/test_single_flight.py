@@ -0,0 +1,88 @@
+import asyncio
+
+import pytest
+from services.cache.single_flight import SingleFlight
+
+
+class Loader:
+    """Загрузка, которую тест отпускает вручную."""
+
+    def __init__(self, fail: Exception | None = None):
+        self.calls = 0
+        self.fail = fail
+        self.release = asyncio.Event()
+
+    async def __call__(self):
+        self.calls += 1
+        await self.release.wait()
+        if self.fail is not None:
+            raise self.fail
+        return f"value-{self.calls}"
+
+
+@pytest.mark.asyncio
+async def test_concurrent_callers_share_one_call():
+    flight = SingleFlight()
+    loader = Loader()
+
+    waiters = [asyncio.create_task(flight.do("k", loader)) for _ in range(5)]
+    await asyncio.sleep(0)
+    assert len(flight) == 1
+
+    loader.release.set()
+    results = await asyncio.gather(*waiters)
+
+    assert results == ["value-1"] * 5
+    assert loader.calls == 1
+    assert len(flight) == 0
+
+
+@pytest.mark.asyncio
+async def test_different_keys_load_independently():
+    flight = SingleFlight()
+    loader = Loader()
+    loader.release.set()
+
+    results = await asyncio.gather(flight.do("a", loader), flight.do("b", loader))
+
+    assert sorted(results) == ["value-1", "value-2"]
+    assert loader.calls == 2
+
+
+@pytest.mark.asyncio
+async def test_exception_reaches_every_waiter_and_releases_key():
+    flight = SingleFlight()
+    failing = Loader(fail=RuntimeError("es down"))
+
+    waiters = [asyncio.create_task(flight.do("k", failing)) for _ in range(3)]
+    await asyncio.sleep(0)
+    failing.release.set()
+    results = await asyncio.gather(*waiters, return_exceptions=True)
+
+    assert [str(r) for r in results] == ["es down"] * 3
+    assert all(isinstance(r, RuntimeError) for r in results)
+    assert failing.calls == 1
+    assert len(flight) == 0
+
+    # ключ свободен: следующий вызов запускает новую загрузку
+    loader = Loader()
+    loader.release.set()
+    assert await flight.do("k", loader) == "value-1"
+
+
+@pytest.mark.asyncio
+async def test_cancelled_waiter_does_not_cancel_load():
+    flight = SingleFlight()
+    loader = Loader()
+
+    first = asyncio.create_task(flight.do("k", loader))
+    second = asyncio.create_task(flight.do("k", loader))
+    await asyncio.sleep(0)
+
+    first.cancel()
+    with pytest.raises(asyncio.CancelledError):
+        await first
+
+    loader.release.set()
+    assert await second == "value-1"
+    assert loader.calls == 1
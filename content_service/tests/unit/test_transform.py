@@ -0,0 +1,87 @@
+import json
+import uuid
+
+import pytest
+import transform_old_to_new_data as transform
+
+
+def _old_movie(n: int) -> dict:
+    return {
+        "_id": f"tt{n:07d}",
+        "_source": {
+            "title": f"Film {n}",
+            "imdb_rating": 7.0,
+            "genres": ["Drama"],
+            "actors_names": ["Ann Lee", f"Actor {n}"],
+            "directors_names": ["Ann Lee"],
+            "writers_names": [],
+        },
+    }
+
+
+@pytest.fixture
+def source_file(tmp_path):
+    path = tmp_path / "movies.json"
+    lines = [json.dumps(_old_movie(n)) for n in range(40)]
+    lines.insert(10, "")  # пустые строки пропускаются
+    path.write_text("\n".join(lines) + "\n", encoding="utf-8")
+    return str(path)
+
+
+def test_stable_uuid_is_uuid5_of_kind_and_key():
+    expected = uuid.uuid5(transform.CATALOG_NAMESPACE, "person:Ann Lee")
+
+    assert transform.get_person_uuid("Ann Lee") == str(expected)
+    assert transform.get_person_uuid("Ann Lee") == transform.get_person_uuid("Ann Lee")
+    # одно и то же имя у жанра и персоны — разные сущности
+    assert transform.stable_uuid("genre", "Ann Lee") != transform.get_person_uuid("Ann Lee")
+
+
+def test_transform_movie_ids_are_deterministic():
+    raw = _old_movie(1)
+    first = transform.transform_movie(raw["_source"], raw["_id"])
+    second = transform.transform_movie(raw["_source"], raw["_id"])
+
+    assert first == second
+    assert first["uuid"] == transform.stable_uuid("film", "tt0000001")
+    assert first["actors"][0]["uuid"] == first["directors"][0]["uuid"]
+    # без старого id ключом служит название
+    untitled = transform.transform_movie(raw["_source"])
+    assert untitled["uuid"] == transform.stable_uuid("film", "Film 1")
+
+
+@pytest.mark.parametrize("parts", [1, 2, 3, 7, 100])
+def test_split_file_ranges_cover_whole_lines(source_file, parts):
+    data = open(source_file, "rb").read()
+
+    ranges = transform.split_file(source_file, parts)
+
+    assert ranges[0][0] == 0
+    assert ranges[-1][1] == len(data)
+    assert all(end == start for (_, end), (start, _) in zip(ranges, ranges[1:], strict=False))
+    assert all(start < end for start, end in ranges)
+    assert len(ranges) <= parts
+    for start, end in ranges:
+        assert start == 0 or data[start - 1 : start] == b"\n"
+        assert data[end - 1 : end] == b"\n"
+
+
+def test_split_file_without_trailing_newline(tmp_path):
+    path = tmp_path / "movies.json"
+    path.write_bytes(b"a\nbb\nccc")
+
+    parts = [path.read_bytes()[s:e] for s, e in transform.split_file(str(path), 3)]
+
+    assert b"".join(parts) == b"a\nbb\nccc"
+    assert parts[-1].endswith(b"ccc")
+    assert all(part.endswith(b"\n") for part in parts[:-1])
+
+
+@pytest.mark.parametrize("workers, part_bytes", [(1, 1 << 20), (2, 1 << 20), (3, 500)])
+def test_transform_file_streams_movies_in_source_order(source_file, workers, part_bytes):
+    movies = transform.transform_file(source_file, workers=workers, part_bytes=part_bytes)
+
+    assert not isinstance(movies, list)
+    assert [m["uuid"] for m in movies] == [
+        transform.stable_uuid("film", f"tt{n:07d}") for n in range(40)
+    ]
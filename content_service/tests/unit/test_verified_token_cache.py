@@ -0,0 +1,57 @@
+import time
+
+import pytest
+from services.cache import local_cache as local_cache_module
+from utils.jwt import VerifiedTokenCache
+
+# LRU-вытеснение и истечение проверяет test_local_cache.py;
+# здесь — только то, что добавляет обёртка для токенов.
+
+
+def _payload(ttl: float = 60, **extra) -> dict:
+    return {"sub": "user", "exp": time.time() + ttl, **extra}
+
+
+@pytest.mark.unit
+def test_token_is_stored_by_hash():
+    cache = VerifiedTokenCache()
+    cache.set("secret-token", _payload())
+
+    assert "secret-token" not in cache._cache._data
+    assert cache.get("secret-token")["sub"] == "user"
+    assert cache.get("other-token") is None
+
+
+@pytest.mark.unit
+def test_returns_copy_of_cached_payload():
+    cache = VerifiedTokenCache()
+    cache.set("token", _payload(jti="1"))
+
+    payload = cache.get("token")
+    payload["sub"] = "changed"
+
+    assert cache.get("token")["sub"] == "user"
+
+
+@pytest.mark.unit
+@pytest.mark.parametrize("payload", [{"sub": "user"}, _payload(ttl=-1)])
+def test_payload_without_future_exp_is_not_cached(payload):
+    cache = VerifiedTokenCache()
+    cache.set("token", payload)
+
+    assert cache.get("token") is None
+    assert len(cache) == 0
+
+
+@pytest.mark.unit
+def test_entry_lives_until_token_exp(monkeypatch):
+    now = [1000.0]
+    monkeypatch.setattr(local_cache_module.time, "monotonic", lambda: now[0])
+    cache = VerifiedTokenCache()
+    cache.set("token", _payload(ttl=30))
+
+    now[0] += 29
+    assert cache.get("token") is not None
+
+    now[0] += 1
+    assert cache.get("token") is None